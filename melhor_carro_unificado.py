@@ -16,11 +16,15 @@ import sys
 import threading
 import json
 import os
+import atexit
 import time
 import re
+import struct
+import zlib
 import unicodedata
 from typing import List, Dict, Any, Optional
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
 
 # Selenium imports
 from selenium import webdriver
@@ -42,6 +46,28 @@ try:
 except Exception:
     requests = None
 
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+try:
+    import openpyxl
+except Exception:
+    openpyxl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = None
+    pq = None
+
 
 # ============================================================================
 # CONSTANTES E CONFIGURAÇÃO
@@ -105,8 +131,31 @@ dados_carros = []
 SEMINOVOS_VERBOSE = False
 # Reference to currently active Selenium driver (if any) so external stop signal can attempt to close it
 current_driver = None
+# All live drivers: portals run concurrently, each one with its own driver
+drivers_ativos = []
+_drivers_lock = threading.Lock()
+# Serializes stdout so EVENT_JSON lines from concurrent portals never interleave
+_saida_lock = threading.RLock()
 STOP_SIGNAL_PATH = os.path.join(os.getcwd(), "STOP_SIGNAL.txt")
 
+def registrar_driver(driver):
+    """Track a live driver so should_stop() can quit it."""
+    global current_driver
+    with _drivers_lock:
+        if driver not in drivers_ativos:
+            drivers_ativos.append(driver)
+        current_driver = driver
+    return driver
+
+def desregistrar_driver(driver):
+    """Drop a driver from the live-driver registry (without quitting it)."""
+    global current_driver
+    with _drivers_lock:
+        if driver in drivers_ativos:
+            drivers_ativos.remove(driver)
+        if current_driver is driver:
+            current_driver = drivers_ativos[-1] if drivers_ativos else None
+
 def should_stop():
     global parar_scraping, current_driver
     # External file-based stop signal (written by Node server)
@@ -122,20 +171,17 @@ def should_stop():
         pass
 
     if parar_scraping:
-        # Attempt to quit any active Selenium driver immediately
-        try:
-            if current_driver:
-                try:
-                    logar("[STOP SIGNAL] Attempting to quit Selenium driver immediately.")
-                    current_driver.quit()
-                except Exception as e:
-                    logar(f"[STOP SIGNAL] Error quitting driver: {e}")
-                try:
-                    current_driver = None
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        # Attempt to quit every active Selenium driver immediately
+        with _drivers_lock:
+            ativos = list(drivers_ativos)
+            drivers_ativos.clear()
+            current_driver = None
+        for driver in ativos:
+            try:
+                logar("[STOP SIGNAL] Attempting to quit Selenium driver immediately.")
+                driver.quit()
+            except Exception as e:
+                logar(f"[STOP SIGNAL] Error quitting driver: {e}")
 
     return parar_scraping
 
@@ -146,7 +192,71 @@ def log_seminovos(msg):
     except Exception:
         pass
 
-def criar_driver_headless():
+# Lean browsing: the scrapers only read DOM text, attributes and src URLs, so images,
+# web fonts and third-party trackers are skipped. Toggle with filtros['lean_browsing'].
+LEAN_BROWSING = True
+LEAN_BLOCKLIST_FILE = os.path.join(os.getcwd(), "lean_blocklist.txt")
+LEAN_BLOCKED_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'googletagservices.com',
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com', 'adservice.google.com',
+    'fonts.googleapis.com', 'fonts.gstatic.com',
+    'connect.facebook.net', 'facebook.net', 'analytics.tiktok.com', 'snap.licdn.com',
+    'hotjar.com', 'clarity.ms', 'criteo.com', 'criteo.net', 'taboola.com', 'outbrain.com',
+    'newrelic.com', 'nr-data.net', 'scorecardresearch.com', 'branch.io', 'onesignal.com',
+)
+LEAN_PERFIL_PADRAO = {
+    'imagens': False,
+    'fontes': False,
+    'bloquear_hosts': True,
+    'page_load_strategy': 'eager',
+}
+# Per-portal overrides for sites that misbehave under the lean profile
+LEAN_OVERRIDES = {
+    # Anti-bot checks are served from third-party hosts; blocking them gets the page challenged
+    'Webmotors': {'bloquear_hosts': False},
+    # The location modal is injected after the load event
+    'Unidas': {'page_load_strategy': 'normal'},
+}
+
+
+def carregar_blocklist() -> list:
+    """Default blocked hosts plus one host per line from LEAN_BLOCKLIST_FILE (# comments allowed)."""
+    hosts = list(LEAN_BLOCKED_HOSTS)
+    try:
+        if os.path.exists(LEAN_BLOCKLIST_FILE):
+            with open(LEAN_BLOCKLIST_FILE, 'r', encoding='utf-8') as f:
+                for linha in f:
+                    host = linha.split('#', 1)[0].strip().lower()
+                    if host and host not in hosts:
+                        hosts.append(host)
+    except Exception as e:
+        logar(f"[DRIVERS] Nao foi possivel ler {LEAN_BLOCKLIST_FILE}: {e}")
+    return hosts
+
+
+def perfil_navegacao(portal: str = None):
+    """Browser profile for a portal: the lean profile plus its overrides, or None for a full profile."""
+    if not LEAN_BROWSING:
+        return None
+    perfil = dict(LEAN_PERFIL_PADRAO)
+    perfil.update(LEAN_OVERRIDES.get(portal or '', {}))
+    return perfil
+
+
+def _pac_bloqueio(hosts) -> str:
+    # Blocked hosts go to a dead local proxy and fail immediately; everything else is DIRECT
+    script = (
+        "function FindProxyForURL(url, host) {"
+        f" var b = {json.dumps(list(hosts))};"
+        " for (var i = 0; i < b.length; i++) {"
+        " if (host == b[i] || dnsDomainIs(host, '.' + b[i])) return 'PROXY 127.0.0.1:9';"
+        " }"
+        " return 'DIRECT'; }"
+    )
+    return "data:application/x-ns-proxy-autoconfig," + quote(script)
+
+
+def criar_driver_headless(perfil: dict = None):
     options = Options()
     options.headless = True  # Modo invisível
 
@@ -160,25 +270,685 @@ def criar_driver_headless():
     options.set_preference("dom.webdriver.enabled", False)
     options.set_preference('useAutomationExtension', False)
 
+    if perfil:
+        if not perfil.get('imagens', True):
+            options.set_preference('permissions.default.image', 2)
+        if not perfil.get('fontes', True):
+            options.set_preference('gfx.downloadable_fonts.enabled', False)
+            options.set_preference('browser.display.use_document_fonts', 0)
+        if perfil.get('bloquear_hosts'):
+            options.set_preference('network.proxy.type', 2)
+            options.set_preference('network.proxy.autoconfig_url', _pac_bloqueio(carregar_blocklist()))
+        if perfil.get('page_load_strategy'):
+            options.page_load_strategy = perfil['page_load_strategy']
+
     try:
         service = Service()  # Deixa o Selenium encontrar o geckodriver automaticamente
-        global current_driver
         driver = webdriver.Firefox(service=service, options=options)
-        try:
-            current_driver = driver
-        except Exception:
-            pass
         return driver
     except Exception as e:
         logar(f"❌ Erro ao criar driver Firefox: {e}")
         logar("💡 Verifique se Firefox e GeckoDriver estão instalados")
         raise
 
+
+# Page loads a pooled driver may serve before it is quit and replaced (keeps Firefox memory bounded)
+DRIVER_POOL_MAX_CARGAS = 60
+# Warm drivers kept idle between checkouts; extras are quit on release
+DRIVER_POOL_MAX_OCIOSOS = 3
+
+
+class DriverPool:
+    """Hands out warm Firefox drivers instead of cold-starting one per portal.
+
+    obter() reuses an idle driver built with the same browser profile when
+    possible and registers it as live, so
+    should_stop() still quits every driver in use. devolver() closes extra tabs,
+    clears cookies/storage and parks the driver on about:blank; drivers that
+    reached max_cargas page loads, fail the reset or come back after a stop are
+    quit instead. Drivers a thread forgot to return are released by
+    liberar_da_thread() once its portal finishes.
+    """
+
+    def __init__(self, fabrica, max_cargas: int = DRIVER_POOL_MAX_CARGAS, max_ociosos: int = DRIVER_POOL_MAX_OCIOSOS):
+        self.fabrica = fabrica
+        self.max_cargas = max_cargas
+        self.max_ociosos = max_ociosos
+        self._lock = threading.Lock()
+        self._ociosos = []
+        self._em_uso = {}
+
+    @staticmethod
+    def _instrumentar(driver):
+        # Count page loads per driver by shadowing get() on the instance
+        get_original = driver.get
+        driver._pool_cargas = 0
+        driver._pool_get_original = get_original
+
+        def get(url):
+            driver._pool_cargas += 1
+            return get_original(url)
+
+        driver.get = get
+        return driver
+
+    @staticmethod
+    def _vivo(driver) -> bool:
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _chave(perfil) -> str:
+        return json.dumps(perfil, sort_keys=True)
+
+    def obter(self, perfil: dict = None):
+        chave = self._chave(perfil)
+        driver = None
+        while True:
+            with self._lock:
+                candidatos = [d for d in self._ociosos if d._pool_chave == chave]
+                if not candidatos:
+                    break
+                candidato = candidatos[-1]
+                self._ociosos.remove(candidato)
+            if self._vivo(candidato):
+                driver = candidato
+                break
+            self._quit(candidato)
+        if driver is None:
+            driver = self._instrumentar(self.fabrica(perfil))
+            driver._pool_chave = chave
+        else:
+            logar(f"[DRIVERS] Reutilizando driver aquecido ({driver._pool_cargas} cargas)")
+        with self._lock:
+            self._em_uso[driver] = threading.get_ident()
+        return registrar_driver(driver)
+
+    def _resetar(self, driver):
+        handles = driver.window_handles
+        for h in handles[1:]:
+            driver.switch_to.window(h)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        except Exception:
+            pass
+        driver._pool_get_original('about:blank')
+
+    def devolver(self, driver):
+        with self._lock:
+            self._em_uso.pop(driver, None)
+        desregistrar_driver(driver)
+        if parar_scraping or getattr(driver, '_pool_cargas', self.max_cargas) >= self.max_cargas:
+            self._quit(driver)
+            return
+        try:
+            self._resetar(driver)
+        except Exception as e:
+            logar(f"[DRIVERS] Falha ao resetar driver, descartando: {e}")
+            self._quit(driver)
+            return
+        with self._lock:
+            if len(self._ociosos) < self.max_ociosos:
+                self._ociosos.append(driver)
+                return
+        self._quit(driver)
+
+    def liberar_da_thread(self):
+        ident = threading.get_ident()
+        with self._lock:
+            pendentes = [d for d, t in self._em_uso.items() if t == ident]
+        for driver in pendentes:
+            self.devolver(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def encerrar(self):
+        with self._lock:
+            ociosos, self._ociosos = self._ociosos, []
+        for driver in ociosos:
+            self._quit(driver)
+
+
+DRIVER_POOL = DriverPool(criar_driver_headless)
+atexit.register(DRIVER_POOL.encerrar)
+
+
+def obter_driver(portal: str = None):
+    """Check a warm driver with the portal's browser profile out of DRIVER_POOL."""
+    return DRIVER_POOL.obter(perfil_navegacao(portal))
+
+
+def liberar_driver(driver):
+    """Return a driver to DRIVER_POOL (reset, recycled or quit as needed)."""
+    DRIVER_POOL.devolver(driver)
+
+
+WAIT_STATS_FILE = os.path.join(os.getcwd(), "wait_stats.json")
+# Upper bound (seconds) for condition waits per portal; the conditions usually hold much sooner
+WAIT_TIMEOUTS = {
+    'OLX': 8.0,
+    'Webmotors': 10.0,
+    'Mercado Livre': 8.0,
+    'Seminovos': 8.0,
+    'Localiza': 10.0,
+    'Unidas': 10.0,
+}
+WAIT_TIMEOUT_PADRAO = 8.0
+
+# scraping_speed presets (GUI "Velocidade do Scraping"). Explicit filtros keys
+# (parallel_portals, zenrows_concurrency, detail_tabs, http_workers, zenrows_hedge) still win over the preset.
+#   parallel_portals     portals scraped at the same time (None = all selected)
+#   zenrows_concurrency  ZenRows detail pages in flight per portal
+#   detail_tabs          browser tabs loading detail pages in parallel per portal
+#   http_workers         detail pages fetched over HTTP at once with the browser session
+#   zenrows_hedge        hedged ZenRows requests
+#   zenrows_waits        default ZenRows wait ladder (ms)
+#   fator_paginas        multiplier on each portal's page limit
+#   fator_espera         multiplier on condition-wait timeouts
+#   pausa_paginas        pause (s) before moving to the next results page
+SPEED_PROFILES = {
+    'baixo': {
+        'parallel_portals': 2,
+        'zenrows_concurrency': 2,
+        'detail_tabs': 2,
+        'http_workers': 4,
+        'zenrows_hedge': False,
+        'zenrows_waits': (3000, 6000, 9000, 12000),
+        'fator_paginas': 1.0,
+        'fator_espera': 1.3,
+        'pausa_paginas': 1.0,
+    },
+    'medio': {
+        'parallel_portals': 3,
+        'zenrows_concurrency': 4,
+        'detail_tabs': 4,
+        'http_workers': 8,
+        'zenrows_hedge': False,
+        'zenrows_waits': (3000, 6000, 9000, 12000),
+        'fator_paginas': 1.0,
+        'fator_espera': 1.0,
+        'pausa_paginas': 0.3,
+    },
+    'rapido': {
+        'parallel_portals': None,
+        'zenrows_concurrency': 8,
+        'detail_tabs': 6,
+        'http_workers': 12,
+        'zenrows_hedge': True,
+        'zenrows_waits': (2000, 4000, 8000, 12000),
+        'fator_paginas': 0.6,
+        'fator_espera': 0.7,
+        'pausa_paginas': 0.0,
+    },
+}
+VELOCIDADE_PADRAO = 'baixo'
+PERFIL_VELOCIDADE = dict(SPEED_PROFILES[VELOCIDADE_PADRAO], nome=VELOCIDADE_PADRAO)
+
+
+def aplicar_perfil_velocidade(filtros: dict) -> dict:
+    """Select the scraping_speed preset for this run and fill the matching filtros defaults."""
+    global PERFIL_VELOCIDADE
+    nome = str(filtros.get('scraping_speed') or VELOCIDADE_PADRAO).strip().lower()
+    if nome not in SPEED_PROFILES:
+        logar(f"[VELOCIDADE] Valor desconhecido '{nome}', usando '{VELOCIDADE_PADRAO}'")
+        nome = VELOCIDADE_PADRAO
+    perfil = SPEED_PROFILES[nome]
+    PERFIL_VELOCIDADE = dict(perfil, nome=nome)
+    for chave in ('parallel_portals', 'zenrows_concurrency', 'detail_tabs', 'http_workers', 'zenrows_hedge'):
+        if perfil[chave] is not None:
+            filtros.setdefault(chave, perfil[chave])
+    logar(f"[VELOCIDADE] Perfil '{nome}': {PERFIL_VELOCIDADE}")
+    return PERFIL_VELOCIDADE
+
+
+def limite_paginas(padrao: int) -> int:
+    """Page limit for a portal scaled by the active speed profile."""
+    return max(1, int(round(padrao * PERFIL_VELOCIDADE.get('fator_paginas', 1.0))))
+
+
+def pausa_entre_paginas():
+    """Polite pause between results pages (speed profile), cut short by a stop request."""
+    fim = time.time() + PERFIL_VELOCIDADE.get('pausa_paginas', 0.0)
+    while time.time() < fim and not should_stop():
+        time.sleep(min(0.2, max(0.0, fim - time.time())))
+
+
+class WaitStats:
+    """Time actually spent in each (portal, etapa) wait, accumulated across runs in WAIT_STATS_FILE."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {}
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._stats = json.load(f) or {}
+        except Exception as e:
+            logar(f"[ESPERA] Nao foi possivel carregar {path}: {e}")
+            self._stats = {}
+
+    def registrar(self, portal: str, etapa: str, segundos: float, ok: bool):
+        with self._lock:
+            st = self._stats.setdefault(portal or '-', {}).setdefault(etapa, {'n': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0})
+            st['n'] += 1
+            st['total'] = round(st['total'] + segundos, 3)
+            st['max'] = round(max(st['max'], segundos), 3)
+            if not ok:
+                st['timeouts'] += 1
+
+    def salvar(self):
+        with self._lock:
+            if not self._stats:
+                return
+            dados = json.dumps(self._stats, ensure_ascii=False, indent=2)
+        try:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(dados)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logar(f"[ESPERA] Nao foi possivel salvar {self.path}: {e}")
+
+
+WAIT_STATS = WaitStats(WAIT_STATS_FILE)
+atexit.register(WAIT_STATS.salvar)
+
+
+def esperar_condicao(condicao, portal: str, etapa: str, timeout: float = None, intervalo: float = 0.1):
+    """Poll condicao() until it returns something truthy, the timeout expires or a stop is requested.
+
+    timeout defaults to WAIT_TIMEOUTS[portal] and is scaled by the speed profile. Returns the last value of condicao()
+    (falsy on timeout) and records the time actually waited in WAIT_STATS.
+    """
+    limite = WAIT_TIMEOUTS.get(portal, WAIT_TIMEOUT_PADRAO) if timeout is None else timeout
+    limite *= PERFIL_VELOCIDADE.get('fator_espera', 1.0)
+    inicio = time.time()
+    resultado = None
+    while True:
+        try:
+            resultado = condicao()
+        except Exception:
+            resultado = None
+        if resultado or time.time() - inicio >= limite or should_stop():
+            break
+        time.sleep(intervalo)
+    WAIT_STATS.registrar(portal, etapa, time.time() - inicio, bool(resultado))
+    return resultado
+
+
+def esperar_elemento(driver, seletor: str, portal: str, etapa: str, timeout: float = None):
+    """Wait until at least one element matches the CSS selector; returns the matches."""
+    return esperar_condicao(lambda: driver.find_elements(By.CSS_SELECTOR, seletor), portal, etapa, timeout)
+
+
+# An empty results page (usually the last one) is accepted once the document has loaded
+# and the count stayed at 0 this long; script-rendered lists get a little more time than estabilidade.
+CARDS_VAZIO_ESTAVEL = 2.0
+
+
+def esperar_cards_estaveis(driver, seletor: str, portal: str, etapa: str, timeout: float = None,
+                           minimo: int = 1, estabilidade: float = 0.5) -> int:
+    """Wait until the number of cards matching seletor is >= minimo and unchanged for estabilidade seconds,
+    or the loaded page has had no cards for CARDS_VAZIO_ESTAVEL seconds."""
+    estado = {'n': -1, 'desde': time.time()}
+
+    def _estavel():
+        pronto, n = driver.execute_script(
+            "return [document.readyState, document.querySelectorAll(arguments[0]).length];", seletor
+        )
+        if n != estado['n'] or (n == 0 and pronto != 'complete'):
+            estado['n'], estado['desde'] = n, time.time()
+            return False
+        parado = time.time() - estado['desde']
+        if n < minimo:
+            return n == 0 and parado >= max(estabilidade, CARDS_VAZIO_ESTAVEL)
+        return parado >= estabilidade
+
+    esperar_condicao(_estavel, portal, etapa, timeout)
+    return max(0, estado['n'])
+
+
+def esperar_rede_ociosa(driver, portal: str, etapa: str, timeout: float = None, ociosidade: float = 0.5):
+    """Wait until the DOM is parsed and no new resource finished loading for ociosidade seconds.
+
+    Uses the Resource Timing entries as a cheap proxy for network activity.
+    """
+    estado = {'n': -1, 'desde': time.time()}
+
+    def _ociosa():
+        pronto, n = driver.execute_script(
+            "return [document.readyState, performance.getEntriesByType('resource').length];"
+        )
+        if pronto == 'loading' or n != estado['n']:
+            estado['n'], estado['desde'] = n, time.time()
+            return False
+        return time.time() - estado['desde'] >= ociosidade
+
+    return esperar_condicao(_ociosa, portal, etapa, timeout)
+
+
+DETAIL_TABS_PADRAO = 4
+
+
+def detail_tabs(filtros) -> int:
+    """Detail tabs loaded in parallel per driver (filtros['detail_tabs'])."""
+    try:
+        return max(1, int(filtros.get('detail_tabs') or DETAIL_TABS_PADRAO))
+    except Exception:
+        return DETAIL_TABS_PADRAO
+
+
+class AgendadorAbas:
+    """Bounded tab scheduler: loads up to max_abas detail pages at once in one Firefox.
+
+    Each tab is pointed at a link with location.href, which returns without waiting
+    for the load, so the pages download in parallel. The tabs are polled in turn; a
+    tab whose new document matches pronto_seletor is handed to extrator(driver) as
+    the current window, then reused for the next link. processar() yields
+    (link, resultado) in completion order; resultado is None when the page could
+    not be scraped.
+
+    A tab that stops responding to switch_to (crashed or closed) is discarded and
+    replaced, and its link is retried up to MAX_TENTATIVAS times. A tab still
+    loading after the timeout is stopped (window.stop) and harvested as is. The
+    listing tab is never navigated or closed, and processar() always ends on it.
+    """
+
+    MAX_TENTATIVAS = 2
+
+    # Marks the outgoing document so a tab still showing the previous page is never taken as ready
+    _NAVEGAR_JS = "document.documentElement.setAttribute('data-aba-antiga', '1'); window.location.href = arguments[0];"
+    _PRONTA_JS = (
+        "return document.readyState !== 'loading'"
+        " && !document.documentElement.hasAttribute('data-aba-antiga')"
+        " && location.href !== 'about:blank'"
+        " && (!arguments[0] || !!document.querySelector(arguments[0]));"
+    )
+
+    def __init__(self, driver, max_abas: int, portal: str, pronto_seletor: str = None, timeout: float = None):
+        self.driver = driver
+        self.max_abas = max(1, max_abas)
+        self.portal = portal
+        self.pronto_seletor = pronto_seletor
+        base = WAIT_TIMEOUTS.get(portal, WAIT_TIMEOUT_PADRAO) * 2 if timeout is None else timeout
+        self.timeout = base * PERFIL_VELOCIDADE.get('fator_espera', 1.0)
+        self._original = None
+
+    def _nova_aba(self) -> str:
+        driver = self.driver
+        driver.switch_to.window(self._original)
+        existentes = set(driver.window_handles)
+        driver.execute_script("window.open('about:blank', '_blank');")
+        novas = esperar_condicao(lambda: [h for h in driver.window_handles if h not in existentes],
+                                 self.portal, 'abrir_aba', timeout=5)
+        if not novas:
+            raise RuntimeError("nova aba nao abriu")
+        return novas[0]
+
+    def _descartar_aba(self, handle: str):
+        try:
+            if handle in self.driver.window_handles:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        except Exception:
+            pass
+
+    def _carregar(self, handle: str, link: str):
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script(self._NAVEGAR_JS, link)
+
+    def _estado(self, info: dict) -> str:
+        """'pronta', 'carregando' or 'expirada' for the current tab."""
+        try:
+            if self.driver.execute_script(self._PRONTA_JS, self.pronto_seletor):
+                return 'pronta'
+        except Exception:
+            # script errors while the document is being swapped; the timeout covers real hangs
+            pass
+        return 'expirada' if time.time() - info['inicio'] >= self.timeout else 'carregando'
+
+    def processar(self, links, extrator):
+        driver = self.driver
+        self._original = driver.current_window_handle
+        pendentes = list(links)
+        tentativas = {}
+        livres = []
+        carregando = {}
+        criadas = []
+        try:
+            for _ in range(min(self.max_abas, len(pendentes))):
+                try:
+                    h = self._nova_aba()
+                except Exception as e:
+                    logar(f"[ABAS] {self.portal}: nao foi possivel abrir aba: {e}")
+                    break
+                criadas.append(h)
+                livres.append(h)
+            if pendentes and not livres:
+                raise RuntimeError("nenhuma aba de detalhe disponivel")
+
+            while (pendentes or carregando) and not should_stop():
+                while livres and pendentes:
+                    h = livres.pop()
+                    link = pendentes.pop(0)
+                    try:
+                        self._carregar(h, link)
+                    except Exception as e:
+                        logar(f"[ABAS] {self.portal}: falha ao carregar {link}: {e}")
+                        pendentes.insert(0, link)
+                        criadas.remove(h)
+                        self._descartar_aba(h)
+                        continue
+                    carregando[h] = {'link': link, 'inicio': time.time()}
+
+                if not livres and not carregando:
+                    # every tab died and none could be reopened: give up on what is left
+                    logar(f"[ABAS] {self.portal}: sem abas disponiveis, {len(pendentes)} links sem detalhe")
+                    for link in pendentes:
+                        yield link, None
+                    return
+
+                concluidas = 0
+                for h, info in list(carregando.items()):
+                    link = info['link']
+                    try:
+                        driver.switch_to.window(h)
+                    except Exception as e:
+                        # crashed/closed tab: replace it and retry the link
+                        del carregando[h]
+                        if h in criadas:
+                            criadas.remove(h)
+                        self._descartar_aba(h)
+                        try:
+                            novo = self._nova_aba()
+                            criadas.append(novo)
+                            livres.append(novo)
+                        except Exception:
+                            pass
+                        tentativas[link] = tentativas.get(link, 0) + 1
+                        logar(f"[ABAS] {self.portal}: aba perdida em {link} ({e}), tentativa {tentativas[link]}")
+                        if tentativas[link] < self.MAX_TENTATIVAS:
+                            pendentes.insert(0, link)
+                        else:
+                            concluidas += 1
+                            yield link, None
+                        continue
+                    estado = self._estado(info)
+                    if estado == 'carregando':
+                        continue
+                    espera = time.time() - info['inicio']
+                    WAIT_STATS.registrar(self.portal, 'aba_detalhe', espera, estado == 'pronta')
+                    if estado == 'expirada':
+                        logar(f"[ABAS] {self.portal}: {link} excedeu {self.timeout:.0f}s, interrompendo carregamento")
+                        try:
+                            driver.execute_script("window.stop();")
+                        except Exception:
+                            pass
+                    try:
+                        resultado = extrator(driver)
+                    except Exception as e:
+                        logar(f"[ABAS] {self.portal}: erro extraindo {link}: {e}")
+                        resultado = None
+                    del carregando[h]
+                    livres.append(h)
+                    concluidas += 1
+                    yield link, resultado
+                if not concluidas:
+                    time.sleep(0.1)
+        finally:
+            for h in criadas:
+                if h != self._original:
+                    self._descartar_aba(h)
+            try:
+                driver.switch_to.window(self._original)
+            except Exception as e:
+                logar(f"[ABAS] {self.portal}: aba da listagem indisponivel: {e}")
+
+
+
+# ============================================================================
+# CANAL IPC COM A INTERFACE
+# ============================================================================
+# Started by the GUI with --ipc, the scraper writes length-prefixed frames to the
+# stdout pipe: 1 byte channel + 4 bytes big-endian length + UTF-8 payload. Logs,
+# events (one record per frame) and the final summary use separate channels, so
+# the GUI never scans text for prefixes and no frame is split by line size. Plain
+# prints (logar, portal code) become log frames; writes straight to fd 1 (driver
+# processes) go to stderr. A GUI that falls behind fills the pipe and the
+# emitting thread waits on it, which is the backpressure. Without --ipc the
+# legacy EVENT_JSON / RESULTADO_JSON text lines are kept for the command line.
+
+IPC_CANAL_LOG = 1
+IPC_CANAL_EVENTO = 2
+IPC_CANAL_RESULTADO = 3
+IPC_CABECALHO = struct.Struct('>BI')
+IPC_MAX_FRAME = 256 * 1024 * 1024
+EVENTO_PREFIXOS = {'dado': 'EVENT_JSON', 'duplicado': 'EVENT_DUPLICADO_JSON', 'planilha': 'EVENT_EXCEL_SAVED'}
+IPC_FILA_GUI = 2000  # frames read but not yet applied by the GUI; when full it stops reading the pipe
+IPC_LOTE_GUI = 200   # frames applied per SQLite transaction
+IPC_REDESENHO_SEGUNDOS = 1.0  # minimum interval between result list updates during a run
+
+
+class _SaidaLog:
+    """sys.stdout replacement in IPC mode: every complete printed line is one log frame."""
+
+    encoding = 'utf-8'
+
+    def __init__(self, canal: 'CanalIPC'):
+        self._canal = canal
+        self._pendente = ''
+        self._lock = threading.Lock()
+
+    def write(self, texto: str) -> int:
+        with self._lock:
+            linhas = (self._pendente + texto).split('\n')
+            self._pendente = linhas.pop()
+        for linha in linhas:
+            self._canal.enviar(IPC_CANAL_LOG, linha.encode('utf-8', errors='replace'))
+        return len(texto)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+class CanalIPC:
+    def __init__(self):
+        self._saida = None
+        self._lock = threading.Lock()
+
+    @property
+    def ativo(self) -> bool:
+        return self._saida is not None
+
+    def iniciar(self):
+        """Keep a private copy of stdout for frames and route everything else away from it."""
+        sys.stdout.flush()
+        self._saida = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        sys.stdout = _SaidaLog(self)
+
+    def enviar(self, canal: int, payload: bytes):
+        with self._lock:
+            if self._saida is None:
+                return
+            try:
+                self._saida.write(IPC_CABECALHO.pack(canal, len(payload)))
+                self._saida.write(payload)
+                self._saida.flush()
+            except (BrokenPipeError, OSError, ValueError) as e:
+                # GUI went away: drop further frames instead of failing every thread
+                self._saida = None
+                sys.stderr.write(f"[IPC] Canal fechado: {e}\n")
+
+    @staticmethod
+    def ler_frame(entrada):
+        """(channel, payload) of the next frame from a binary stream, or None at end of stream."""
+        cabecalho = entrada.read(IPC_CABECALHO.size)
+        if len(cabecalho) < IPC_CABECALHO.size:
+            return None
+        canal, tamanho = IPC_CABECALHO.unpack(cabecalho)
+        if tamanho > IPC_MAX_FRAME:
+            raise ValueError(f"frame de {tamanho} bytes")
+        payload = entrada.read(tamanho)
+        if len(payload) < tamanho:
+            return None
+        return canal, payload
+
+
+CANAL_IPC = CanalIPC()
+
+
+def emitir_evento(tipo: str, conteudo):
+    """One event for the GUI ('dado', 'duplicado' or 'planilha'): a frame over IPC, else a prefixed line."""
+    try:
+        if CANAL_IPC.ativo:
+            corpo = json.dumps({'tipo': tipo, 'dado': conteudo}, ensure_ascii=False, default=json_listing)
+            CANAL_IPC.enviar(IPC_CANAL_EVENTO, corpo.encode('utf-8'))
+        else:
+            texto = conteudo if tipo == 'planilha' else json.dumps(conteudo, ensure_ascii=False, default=json_listing)
+            with _saida_lock:
+                print(f"{EVENTO_PREFIXOS[tipo]}:{texto}")
+                sys.stdout.flush()
+    except Exception:
+        pass
+
+
+def resultado_json(dados: list) -> str:
+    """Final payload: over IPC the records were already streamed as events, so only the count goes."""
+    if CANAL_IPC.ativo:
+        return json.dumps({'total': len(dados)})
+    return json.dumps(dados, ensure_ascii=False, default=json_listing)
+
+
+def emitir_resultado(payload: str):
+    if CANAL_IPC.ativo:
+        CANAL_IPC.enviar(IPC_CANAL_RESULTADO, payload.encode('utf-8'))
+    else:
+        print("RESULTADO_JSON:" + payload)
+        sys.stdout.flush()
+
+
 def logar(mensagem):
     # Remover emojis para compatibilidade Windows CP1252
     mensagem_limpa = mensagem.encode('ascii', 'ignore').decode('ascii')
     timestamp = time.strftime('%H:%M:%S')
-    print(f"[{timestamp}] [SCRAPER] {mensagem_limpa}")
+    with _saida_lock:
+        print(f"[{timestamp}] [SCRAPER] {mensagem_limpa}")
 
 def add_dado(dado):
     # Normalize commonly used fields to improve downstream exports and ranking
@@ -260,148 +1030,2039 @@ def add_dado(dado):
         # best-effort normalization — do not block adding the record
         logar(f"[WARN] Erro ao normalizar dado: {e}")
 
-    dados_carros.append(dado)
-    try:
-        portal = dado.get('Portal', 'Portal')
-        nome = dado.get('Nome do Carro', 'Carro')
-        logar(f"[OK] {portal} - {nome}")
-        print("EVENT_JSON:" + json.dumps(dado, ensure_ascii=False))
-        sys.stdout.flush()
-    except Exception:
-        pass
+    with _saida_lock:
+        dados_carros.append(dado)
+        try:
+            portal = dado.get('Portal', 'Portal')
+            nome = dado.get('Nome do Carro', 'Carro')
+            logar(f"[OK] {portal} - {nome}")
+            print("EVENT_JSON:" + json.dumps(dado, ensure_ascii=False))
+            sys.stdout.flush()
+        except Exception:
+            pass
+
+# ============================================================================
+# REGISTRO DE ANÚNCIO
+# ============================================================================
+# Each ad lives in a Listing: one slot per field, so nothing is stored (or
+# serialized) twice. Portal code still reads and writes records like dicts with
+# the old key names ("quilometragem", "potenciaMotor", ...); LISTING_CAMPOS maps
+# every such alias to its slot. JSON output, the journal and the exports only
+# see the canonical key of each field.
+
+def preco_centavos(valor) -> Optional[int]:
+    """Price in BRL cents: 'R$ 52.900,00' -> 5290000, 'R$ 52.900' -> 5290000, 52900.5 -> 5290050."""
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return int(round(valor * 100)) if valor == valor and valor > 0 else None
+    m = re.search(r'\d[\d.]*(?:,\d+)?', str(valor))
+    if not m:
+        return None
+    inteiro, _, centavos = m.group(0).partition(',')
+    if not centavos and re.fullmatch(r'\d+\.\d{1,2}', inteiro):
+        inteiro, centavos = inteiro.split('.')  # '52900.50': dot used as decimal point
+    inteiro = inteiro.replace('.', '')
+    return int(inteiro) * 100 + int((centavos + '00')[:2]) if inteiro else None
+
+
+def km_inteiro(valor) -> Optional[int]:
+    """'41.000 km' -> 41000, '41,5 mil km' -> 41500."""
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return int(valor) if valor == valor and valor >= 0 else None
+    m = re.search(r'(\d[\d.]*)(?:,(\d+))?\s*(mil\b)?', str(valor), flags=re.I)
+    if not m:
+        return None
+    base = m.group(1).replace('.', '')
+    if not base:
+        return None
+    if m.group(3):
+        return int(float(f"{base}.{m.group(2) or 0}") * 1000)
+    return int(base)
+
+
+def ano_inteiro(valor) -> Optional[int]:
+    """Model year; for '2019/2020' the first (manufacture) year."""
+    m = re.search(r'\b(19[5-9]\d|20\d{2})\b', str(valor or ''))
+    return int(m.group(1)) if m else None
+
+
+def potencia_hp(valor) -> Optional[int]:
+    """Horsepower from '116 cv' / '150hp', or a bare whole number in the hp range."""
+    texto = str(valor or '')
+    m = re.search(r'(\d+(?:[.,]\d+)?)\s*(?:hp|cv)\b', texto, flags=re.I)
+    if m:
+        return int(round(float(m.group(1).replace(',', '.'))))
+    m = re.fullmatch(r'\s*(\d{2,4})\s*', texto)
+    return int(m.group(1)) if m and 40 <= int(m.group(1)) <= 1500 else None
+
+
+def cilindrada_litros(*textos) -> Optional[float]:
+    """Engine displacement in litres from the first text that has one ('1.0', '2,0 turbo', '1600cc')."""
+    for texto in textos:
+        texto = str(texto or '')
+        m = re.search(r'(?<![\d.,])(\d)[.,](\d)(?![\d.,])', texto)
+        if m:
+            return float(f"{m.group(1)}.{m.group(2)}")
+        m = re.search(r'\b(\d{3,4})\s*cc\b', texto, flags=re.I)
+        if m:
+            return round(int(m.group(1)) / 1000, 1)
+    return None
+
+
+def portas_inteiro(valor) -> Optional[int]:
+    m = re.search(r'\d', str(valor or ''))
+    return int(m.group(0)) if m and 1 <= int(m.group(0)) <= 9 else None
+
+
+LISTING_CAMPOS = (
+    # (slot, canonical key, legacy aliases)
+    ('nome', 'Nome do Carro', ('nome', 'Nome')),
+    ('valor', 'Valor', ('valor', 'preco')),
+    ('km', 'KM', ('Quilometragem', 'quilometragem', 'km')),
+    ('ano', 'Ano', ('ano',)),
+    ('motor', 'Motor', ('motor',)),
+    ('potencia', 'Potência do Motor', ('Potência', 'Potência (hp)', 'Potencia', 'Potencia do Motor',
+                                       'potenciaMotor', 'potencia', 'potencia_motor')),
+    ('portas', 'Portas', ('portas',)),
+    ('cambio', 'Câmbio', ('Cambio', 'cambio', 'Transmissão', 'transmissao')),
+    ('combustivel', 'Combustível', ('Combustivel', 'combustivel')),
+    ('direcao', 'Direção', ('direcao', 'tipoDirecao', 'Tipo de Direção', 'tipo de direcao')),
+    ('cor', 'Cor', ('cor',)),
+    ('local', 'Localização', ('Localizacao', 'local')),
+    ('portal', 'Portal', ('portal',)),
+    ('portais', 'Portais', ()),
+    ('link', 'Link', ('link',)),
+    ('links', 'Links', ()),
+    ('imagem', 'Imagem', ('imagem', 'Image', 'foto')),
+    ('descricao', 'Descrição', ('Descricao', 'descricao')),
+    ('palavras_proibidas', 'Palavras Proibidas', ('palavrasProibidas',)),
+    ('fotos_repetidas', 'Fotos Repetidas', ()),
+    ('hash_imagem', 'Hash Imagem', ()),
+    # numbers parsed once at ingestion (normalizar_numeros); sorting and scoring read only these
+    ('preco_centavos', 'preco_centavos', ()),
+    ('km_num', 'km_num', ()),
+    ('ano_num', 'ano_num', ()),
+    ('potencia_hp', 'potencia_hp', ()),
+    ('cilindrada', 'cilindrada', ()),
+    ('portas_num', 'portas_num', ()),
+)
+
+
+class Listing:
+    """One ad. Attribute access by slot, dict-style access by canonical key or any legacy alias."""
+
+    __slots__ = tuple(slot for slot, _, _ in LISTING_CAMPOS) + ('extras',)
+
+    _SLOT = {}
+    _CANONICA = {}
+    for _slot, _chave, _aliases in LISTING_CAMPOS:
+        _CANONICA[_slot] = _chave
+        for _nome in (_chave,) + _aliases:
+            _SLOT[_nome] = _slot
+    del _slot, _chave, _aliases, _nome
+
+    def __init__(self):
+        for slot in self.__slots__:
+            setattr(self, slot, None)
+
+    @classmethod
+    def de_dict(cls, dado) -> 'Listing':
+        """Listing from a legacy dict; a canonical key wins over its aliases, empty values are dropped."""
+        if isinstance(dado, Listing):
+            return dado
+        registro = cls()
+        for chave, valor in dado.items():
+            if valor is None or valor == '' or valor == [] or (isinstance(valor, float) and valor != valor):
+                continue
+            slot = cls._SLOT.get(chave)
+            if slot is None:
+                registro[chave] = valor
+            elif cls._CANONICA[slot] == chave or getattr(registro, slot) is None:
+                setattr(registro, slot, valor)
+        return registro
+
+    def normalizar_numeros(self) -> 'Listing':
+        """Fill the numeric slots from the text fields; numbers already present are kept."""
+        if self.preco_centavos is None:
+            self.preco_centavos = preco_centavos(self.valor)
+        if self.km_num is None:
+            self.km_num = km_inteiro(self.km)
+        if self.ano_num is None:
+            self.ano_num = ano_inteiro(self.ano)
+        if self.potencia_hp is None:
+            self.potencia_hp = potencia_hp(self.potencia)
+        if self.cilindrada is None:
+            self.cilindrada = cilindrada_litros(self.motor, self.potencia, self.nome)
+        if self.portas_num is None:
+            self.portas_num = portas_inteiro(self.portas)
+        return self
+
+    def para_dict(self) -> dict:
+        dado = {chave: getattr(self, slot) for slot, chave in self._CANONICA.items()
+                if getattr(self, slot) is not None}
+        if self.extras:
+            dado.update(self.extras)
+        return dado
+
+    def get(self, chave, padrao=None):
+        slot = self._SLOT.get(chave)
+        if slot is None:
+            return self.extras.get(chave, padrao) if self.extras else padrao
+        valor = getattr(self, slot)
+        return padrao if valor is None else valor
+
+    def __getitem__(self, chave):
+        valor = self.get(chave)
+        if valor is None:
+            raise KeyError(chave)
+        return valor
+
+    def __setitem__(self, chave, valor):
+        slot = self._SLOT.get(chave)
+        if slot is not None:
+            setattr(self, slot, valor)
+        else:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[chave] = valor
+
+    def __contains__(self, chave) -> bool:
+        return self.get(chave) is not None
+
+    def setdefault(self, chave, padrao=None):
+        if chave not in self:
+            self[chave] = padrao
+        return self[chave]
+
+    def items(self):
+        return self.para_dict().items()
+
+    def keys(self):
+        return self.para_dict().keys()
+
+    def __iter__(self):
+        return iter(self.para_dict())
+
+    def __repr__(self) -> str:
+        return f"Listing({self.para_dict()!r})"
+
+
+def registro_canonico(dado: dict) -> dict:
+    """Plain dict of a record with one canonical key per field and its numbers (legacy state, imported sheets)."""
+    return Listing.de_dict(dado).normalizar_numeros().para_dict()
+
+
+def json_listing(obj):
+    """json.dumps default= hook: Listings are written with their canonical keys only."""
+    if isinstance(obj, Listing):
+        return obj.para_dict()
+    return str(obj)
+
 
 def add_dado_improved(dado):
     # Normalize commonly used fields to improve downstream exports and ranking
+    dado = Listing.de_dict(dado)
     try:
         # PORTAS: prefer numeric only; ignore boolean answers like 'Sim'/'Não'
-        portas_val = None
-        for k in ("Portas", "portas"):
-            if k in dado and dado[k] is not None and str(dado[k]).strip() != "":
-                s = str(dado[k]).strip()
-                m = re.search(r"(\d+)", s)
-                if m:
-                    portas_val = m.group(1)
-                break
-        if portas_val:
-            dado["Portas"] = portas_val
-            dado["portas"] = portas_val
+        if dado.portas is not None and str(dado.portas).strip() != "":
+            m = re.search(r"(\d+)", str(dado.portas).strip())
+            if m:
+                dado.portas = m.group(1)
 
-        # QUILOMETRAGEM: normalize to '<number> km'
-        km_val = None
-        for k in ("Quilometragem", "quilometragem", "KM", "km"):
-            if k in dado and dado[k]:
-                s = str(dado[k])
-                m = re.search(r"([\d\.]+)\s*km", s, flags=re.I)
-                if m:
-                    km_val = m.group(1).replace('.', '') + " km"
-                else:
-                    m2 = re.search(r"([\d\.]+)", s)
-                    if m2:
-                        km_val = m2.group(1).replace('.', '') + " km"
-                    else:
-                        km_val = s.strip()
-                break
-        if km_val:
-            dado["Quilometragem"] = km_val
-            dado["quilometragem"] = km_val
-            dado["KM"] = km_val
-            dado["km"] = km_val
+        # QUILOMETRAGEM: parse the raw text ('41.000 km', '41,5 mil km'), then normalize to '<number> km'
+        if dado.km:
+            dado.km_num = km_inteiro(dado.km)
+            dado.km = f"{dado.km_num} km" if dado.km_num is not None else str(dado.km).strip()
 
         # POTÊNCIA / MOTOR: handle horsepower (hp/cv) and displacement (e.g., '1.3') consistently
-        potencia = None
-        for k in ("Potência do Motor", "potenciaMotor", "potencia", "Potencia"):
-            if k in dado and dado[k]:
-                potencia = str(dado[k]).strip()
-                break
-        # if not present, try the Motor field
-        if not potencia:
-            for k in ("Motor", "motor"):
-                if k in dado and dado[k]:
-                    potencia = str(dado[k]).strip()
-                    break
-
+        potencia = str(dado.potencia or dado.motor or '').strip()
         if potencia:
-            # horsepower explicit
             if re.search(r"\b(hp|cv)\b", potencia, flags=re.I):
-                dado["Potência do Motor"] = potencia
-                dado["potenciaMotor"] = potencia
-                dado["Potencia"] = potencia
+                dado.potencia = potencia
             else:
                 # numeric-like value -> treat as displacement (motor)
                 m_disp = re.search(r"(\d+[\.,]?\d*)", potencia)
                 if m_disp:
-                    disp = m_disp.group(1).replace(',', '.')
-                    dado["motor"] = disp
-                    dado["Motor"] = disp
-                    # also store in potencia fields for compatibility
-                    dado["potenciaMotor"] = disp
-                    dado["Potência do Motor"] = disp
-                    dado["Potencia"] = disp
+                    dado.motor = m_disp.group(1).replace(',', '.')
                 else:
-                    # fallback: store raw
-                    dado["Potência do Motor"] = potencia
-                    dado["potenciaMotor"] = potencia
-                    dado["Potencia"] = potencia
+                    dado.potencia = potencia
 
-        # DIREÇÃO / TIPO DE DIREÇÃO normalization
-        direc = None
-        for k in ("Direção", "direcao", "tipoDirecao", "tipo de direcao", "Tipo de Direção"):
-            if k in dado and dado[k]:
-                direc = str(dado[k]).strip()
-                break
-        if direc:
-            dado["Direção"] = direc
-            dado["direcao"] = direc
-            dado["tipoDirecao"] = direc
+        # DIREÇÃO and CÂMBIO (Manual / Automático): trimmed text
+        if dado.direcao:
+            dado.direcao = str(dado.direcao).strip()
+        if dado.cambio:
+            dado.cambio = str(dado.cambio).strip()
 
-        # CÂMBIO normalization (Manual / Automático)
-        camb = None
-        for k in ("Câmbio", "cambio", "Transmissão", "transmissao"):
-            if k in dado and dado[k]:
-                camb = str(dado[k]).strip()
-                break
-        if camb:
-            dado["Câmbio"] = camb
-            dado["cambio"] = camb
+        dado.normalizar_numeros()
 
     except Exception as e:
         logar(f"[WARN] Erro ao normalizar dado: {e}")
 
-    # append to global list and emit event like original add_dado
-    dados_carros.append(dado)
-    try:
-        portal = dado.get('Portal', 'Portal')
-        nome = dado.get('Nome do Carro', 'Carro')
-        logar(f"[OK] {portal} - {nome}")
-        print("EVENT_JSON:" + json.dumps(dado, ensure_ascii=False))
-        sys.stdout.flush()
-    except Exception:
-        pass
+    if dado.get('Link') and dado['Link'] in JOURNAL.links_coletados:
+        # resumed run: this ad was already collected before the stop
+        return
+
+    # append to global list and emit event like original add_dado; a copy of a car
+    # already listed by another portal is merged into it instead
+    with _saida_lock:
+        principal = INDICE_DUPLICADOS.registrar(dado)
+        if principal is not None:
+            try:
+                logar(f"[DUPLICADO] {dado.get('Portal', 'Portal')} - {dado.get('Nome do Carro', 'Carro')} "
+                      f"mesclado com {principal.get('Portal', '')}")
+            except Exception:
+                pass
+            emitir_evento('duplicado', principal)
+            JOURNAL.registrar(principal)
+            if EXPORTADOR is not None:
+                EXPORTADOR.adicionar(linha_copia(dado, principal))
+            return
+        dados_carros.append(dado)
+        JOURNAL.registrar(dado)
+        if EXPORTADOR is not None:
+            EXPORTADOR.adicionar(dado)
+        try:
+            portal = dado.get('Portal', 'Portal')
+            nome = dado.get('Nome do Carro', 'Carro')
+            logar(f"[OK] {portal} - {nome}")
+        except Exception:
+            pass
+        emitir_evento('dado', dado)
+    HASH_IMAGENS.enviar(dado)
 
 # keep the old add_dado name but point to improved function so other code continues to call add_dado
 add_dado = add_dado_improved
 
-def fetch_via_zenrows(page_url: str, api_key: str, waits=(3000,6000,9000,12000)) -> str:
-    """Fetch page via ZenRows and return HTML text. Returns empty string on failure."""
+# ============================================================================
+# CLIENTE HTTP COMPARTILHADO
+# ============================================================================
+# Every plain HTTP fetch (ZenRows API, detail pages with the browser session)
+# goes through HTTP_CLIENTE: keep-alive connections pooled per host, gzip/deflate
+# (and brotli when the module is installed) transfer, bodies read in chunks and
+# capped at max_bytes, and a per-host limit on requests in flight.
+
+HTTP_MAX_POR_HOST = 6
+HTTP_LIMITES_HOST = {'api.zenrows.com': 16}
+HTTP_MAX_BYTES = 8 * 1024 * 1024
+HTTP_MAX_OCIOSAS = 8
+HTTP_MAX_REDIRECTS = 5
+
+
+class RespostaHTTP:
+    __slots__ = ('status', 'url', 'headers', 'corpo', 'truncada')
+
+    def __init__(self, status, url, headers, corpo, truncada):
+        self.status = status
+        self.url = url
+        self.headers = headers
+        self.corpo = corpo
+        self.truncada = truncada
+
+    @property
+    def text(self) -> str:
+        m = re.search(r'charset=([\w-]+)', self.headers.get('content-type', ''), flags=re.I)
+        try:
+            return self.corpo.decode(m.group(1) if m else 'utf-8', errors='ignore')
+        except LookupError:
+            return self.corpo.decode('utf-8', errors='ignore')
+
+
+class SessaoHTTP:
+    """Default headers plus a simple cookie jar on top of the shared client."""
+
+    def __init__(self, cliente, headers=None):
+        self.cliente = cliente
+        self.headers = dict(headers or {})
+        self._cookies = []  # (dominio, caminho, nome, valor)
+        self._lock = threading.Lock()
+
+    def definir_cookie(self, nome: str, valor: str, dominio: str, caminho: str = '/'):
+        dominio = (dominio or '').lstrip('.').lower()
+        with self._lock:
+            self._cookies = [c for c in self._cookies if (c[0], c[1], c[2]) != (dominio, caminho, nome)]
+            self._cookies.append((dominio, caminho or '/', nome, valor))
+
+    def _cabecalho_cookie(self, host: str, caminho: str) -> str:
+        host = host.lower()
+        with self._lock:
+            pares = [f"{n}={v}" for d, p, n, v in self._cookies
+                     if (host == d or host.endswith('.' + d)) and caminho.startswith(p)]
+        return '; '.join(pares)
+
+    def get(self, url: str, **kwargs) -> RespostaHTTP:
+        from urllib.parse import urlsplit, urljoin
+        from http.cookies import SimpleCookie
+        extras = kwargs.pop('headers', None) or {}
+        # redirects are followed here so cookies set along the way are kept
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            partes = urlsplit(url)
+            headers = dict(self.headers)
+            headers.update(extras)
+            cookie = self._cabecalho_cookie(partes.hostname or '', partes.path or '/')
+            if cookie:
+                headers['Cookie'] = cookie
+            resp = self.cliente.get(url, headers=headers, seguir_redirects=False, **kwargs)
+            for valor in resp.headers.get_all('set-cookie') or []:
+                try:
+                    jar = SimpleCookie()
+                    jar.load(valor)
+                    for nome, morsel in jar.items():
+                        self.definir_cookie(nome, morsel.value, morsel['domain'] or partes.hostname, morsel['path'] or '/')
+                except Exception:
+                    continue
+            if resp.status in (301, 302, 303, 307, 308) and resp.headers.get('location'):
+                url = urljoin(url, resp.headers.get('location'))
+                continue
+            return resp
+        raise RuntimeError(f"redirecionamentos demais para {url}")
+
+
+class ClienteHTTP:
+    """Stdlib HTTP client with per-host keep-alive pools and concurrency limits."""
+
+    def __init__(self, max_por_host: int = HTTP_MAX_POR_HOST, limites_host=None):
+        self.max_por_host = max_por_host
+        self.limites_host = dict(limites_host or {})
+        self._lock = threading.Lock()
+        self._ociosas = {}    # (scheme, netloc) -> [conexao]
+        self._semaforos = {}  # netloc -> BoundedSemaphore
+
+    def _semaforo(self, netloc: str):
+        with self._lock:
+            sem = self._semaforos.get(netloc)
+            if sem is None:
+                host = netloc.split(':')[0].lower()
+                sem = threading.BoundedSemaphore(self.limites_host.get(host, self.max_por_host))
+                self._semaforos[netloc] = sem
+            return sem
+
+    def _conexao(self, chave, timeout):
+        import http.client
+        with self._lock:
+            livres = self._ociosas.get(chave)
+            if livres:
+                conn = livres.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        scheme, netloc = chave
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(netloc, timeout=timeout), False
+
+    def _devolver(self, chave, conn):
+        with self._lock:
+            livres = self._ociosas.setdefault(chave, [])
+            if len(livres) < HTTP_MAX_OCIOSAS:
+                livres.append(conn)
+                return
+        conn.close()
+
+    def _ler(self, resp, max_bytes: int):
+        """Read and decompress the body in chunks; stops at max_bytes of decoded data."""
+        codificacao = (resp.getheader('content-encoding') or '').strip().lower()
+        if codificacao in ('gzip', 'x-gzip'):
+            descomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif codificacao == 'deflate':
+            descomp = zlib.decompressobj()
+        elif codificacao == 'br' and brotli is not None:
+            descomp = brotli.Decompressor()
+        else:
+            descomp = None
+        partes = []
+        total = 0
+        while True:
+            bloco = resp.read(64 * 1024)
+            if not bloco:
+                break
+            if descomp is not None:
+                # zlib output is capped one byte past the limit so an overflow is detected without inflating the rest
+                bloco = descomp.process(bloco) if hasattr(descomp, 'process') else descomp.decompress(bloco, max_bytes - total + 1)
+            partes.append(bloco)
+            total += len(bloco)
+            if total > max_bytes:
+                return b''.join(partes)[:max_bytes], True
+        if descomp is not None and hasattr(descomp, 'flush'):
+            partes.append(descomp.flush())
+        return b''.join(partes), False
+
+    def get(self, url: str, headers=None, timeout: float = 30, max_bytes: int = HTTP_MAX_BYTES,
+            ao_conectar=None, seguir_redirects: bool = True, ao_liberar=None) -> RespostaHTTP:
+        """GET url following redirects. ao_conectar(conexao) lets the caller abort a slow request
+        by shutting the socket down from another thread; ao_liberar(conexao) is called once the
+        response is read and returns False when that may have happened, so the connection is
+        closed instead of pooled."""
+        from urllib.parse import urlsplit, urljoin
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            partes = urlsplit(url)
+            chave = (partes.scheme or 'http', partes.netloc)
+            alvo = (partes.path or '/') + (f"?{partes.query}" if partes.query else '')
+            cabecalhos = {'Accept-Encoding': 'gzip, deflate, br' if brotli is not None else 'gzip, deflate',
+                          'Connection': 'keep-alive'}
+            cabecalhos.update(headers or {})
+            with self._semaforo(partes.netloc):
+                for tentativa in range(2):
+                    conn, reusada = self._conexao(chave, timeout)
+                    if ao_conectar is not None:
+                        ao_conectar(conn)
+                    try:
+                        conn.request('GET', alvo, headers=cabecalhos)
+                        resp = conn.getresponse()
+                    except (ConnectionError, OSError) as e:
+                        conn.close()
+                        # a pooled connection the server already dropped: retry once on a fresh one
+                        if reusada and tentativa == 0 and not isinstance(e, TimeoutError):
+                            continue
+                        raise
+                    try:
+                        corpo, truncada = self._ler(resp, max_bytes)
+                    except Exception:
+                        conn.close()
+                        raise
+                    reutilizavel = ao_liberar(conn) if ao_liberar is not None else True
+                    if truncada or resp.will_close or not reutilizavel:
+                        conn.close()
+                    else:
+                        self._devolver(chave, conn)
+                    break
+            if seguir_redirects and resp.status in (301, 302, 303, 307, 308) and resp.getheader('location'):
+                url = urljoin(url, resp.getheader('location'))
+                continue
+            return RespostaHTTP(resp.status, url, resp.headers, corpo, truncada)
+        raise RuntimeError(f"redirecionamentos demais para {url}")
+
+    def sessao(self, headers=None) -> SessaoHTTP:
+        return SessaoHTTP(self, headers)
+
+    def fechar(self):
+        with self._lock:
+            ociosas, self._ociosas = self._ociosas, {}
+        for livres in ociosas.values():
+            for conn in livres:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+HTTP_CLIENTE = ClienteHTTP(HTTP_MAX_POR_HOST, HTTP_LIMITES_HOST)
+atexit.register(HTTP_CLIENTE.fechar)
+
+
+# ============================================================================
+# CACHE DE PÁGINAS EM DISCO
+# ============================================================================
+# Fetched HTML is kept under PAGE_CACHE_DIR, zlib-compressed, keyed by canonical
+# URL plus fetch mode ('zenrows', 'http', ...). Entries expire by page type
+# (listing vs detail) and the least recently used ones are evicted once the
+# total compressed size passes PAGE_CACHE_MAX_BYTES. Only pages that passed
+# validation are stored.
+
+PAGE_CACHE_DIR = os.path.join(os.getcwd(), "page_cache")
+PAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# TTL in seconds per page type; override with filtros['cache_ttl_listagem'] / ['cache_ttl_detalhe']
+PAGE_CACHE_TTL = {'listagem': 15 * 60, 'detalhe': 24 * 3600}
+# Query parameters that never change the page content
+PAGE_CACHE_PARAMS_IGNORADOS = re.compile(r'^(utm_.*|gclid|fbclid|ref|source|from)$', re.I)
+
+
+def url_canonica(url: str) -> str:
+    """Lower-case scheme/host, no fragment, no tracking params, query sorted."""
+    from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
     try:
-        from urllib.request import urlopen
+        partes = urlsplit((url or '').strip())
+        query = sorted((k, v) for k, v in parse_qsl(partes.query, keep_blank_values=True)
+                       if not PAGE_CACHE_PARAMS_IGNORADOS.match(k))
+        caminho = partes.path.rstrip('/') or '/'
+        return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), caminho, urlencode(query), ''))
     except Exception:
-        return ''
-    for w in waits:
+        return url or ''
+
+
+class PageCache:
+    """Compressed on-disk page cache with per-type TTL, LRU eviction by size and hit stats."""
+
+    SALVAR_A_CADA = 20
+
+    def __init__(self, diretorio: str, max_bytes: int = PAGE_CACHE_MAX_BYTES, ttl=None):
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        self.ttl = dict(ttl or PAGE_CACHE_TTL)
+        self.ativo = True
+        self._lock = threading.Lock()
+        self._indice = None  # chave -> {url, modo, tipo, criado, acesso, tamanho}
+        self._total = 0      # sum of tamanho over the index
+        self._alteracoes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'expirados': 0, 'gravados': 0, 'removidos': 0}
+
+    @property
+    def _arquivo_indice(self) -> str:
+        return os.path.join(self.diretorio, 'index.json')
+
+    def _carregar(self):
+        if self._indice is not None:
+            return
+        self._indice = {}
         try:
-            zen_url = (
-                "https://api.zenrows.com/v1/?" +
-                f"url={quote(page_url, safe='')}&apikey={quote(api_key)}&js_render=true&premium_proxy=true&antibot=true&wait={w}"
-            )
-            with urlopen(zen_url, timeout=90) as resp:
-                html_text = resp.read().decode('utf-8', errors='ignore')
+            if os.path.exists(self._arquivo_indice):
+                with open(self._arquivo_indice, 'r', encoding='utf-8') as f:
+                    self._indice = json.load(f) or {}
+        except Exception as e:
+            logar(f"[CACHE] Indice ilegivel, recomecando: {e}")
+        self._reindexar()
+        self._total = sum(m.get('tamanho', 0) for m in self._indice.values())
+
+    def _reindexar(self):
+        """Match the index to the files: a killed process leaves pages written after the last
+        index save, which would otherwise never be evicted."""
+        # caller holds the lock
+        no_disco = set()
+        try:
+            subdirs = [d for d in os.listdir(self.diretorio) if len(d) == 2]
+        except OSError:
+            subdirs = []
+        for sub in subdirs:
+            pasta = os.path.join(self.diretorio, sub)
+            try:
+                nomes = os.listdir(pasta)
+            except OSError:
+                continue
+            for nome in nomes:
+                caminho = os.path.join(pasta, nome)
+                try:
+                    if nome.endswith('.tmp'):
+                        os.remove(caminho)
+                        continue
+                    if not nome.endswith('.z'):
+                        continue
+                    chave = nome[:-2]
+                    no_disco.add(chave)
+                    if chave not in self._indice:
+                        info = os.stat(caminho)
+                        self._indice[chave] = {'url': '', 'modo': '', 'tipo': '', 'criado': info.st_mtime,
+                                               'acesso': info.st_mtime, 'tamanho': info.st_size}
+                        self._alteracoes += 1
+                except OSError:
+                    continue
+        for chave in [c for c in self._indice if c not in no_disco]:
+            del self._indice[chave]
+            self._alteracoes += 1
+
+    def configurar(self, ativo: bool = True, ttl=None):
+        self.ativo = ativo
+        for tipo, segundos in (ttl or {}).items():
+            if segundos is not None:
+                self.ttl[tipo] = float(segundos)
+
+    def _chave(self, url: str, modo: str) -> str:
+        import hashlib
+        return hashlib.sha1(f"{modo}|{url_canonica(url)}".encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave[:2], chave + '.z')
+
+    def obter(self, url: str, modo: str, tipo: str = 'detalhe'):
+        """Cached HTML for (url, modo) or None when missing or older than the TTL of tipo."""
+        if not self.ativo or not url:
+            return None
+        chave = self._chave(url, modo)
+        with self._lock:
+            self._carregar()
+            meta = self._indice.get(chave)
+            if meta is None:
+                self.stats['misses'] += 1
+                return None
+            if time.time() - meta['criado'] > self.ttl.get(tipo, self.ttl['detalhe']):
+                self.stats['expirados'] += 1
+                self._remover(chave)
+                return None
+        try:
+            with open(self._caminho(chave), 'rb') as f:
+                html_text = zlib.decompress(f.read()).decode('utf-8', errors='ignore')
+        except Exception:
+            with self._lock:
+                self.stats['misses'] += 1
+                self._remover(chave)
+            return None
+        with self._lock:
+            meta['acesso'] = time.time()
+            self.stats['hits'] += 1
+        return html_text
+
+    def guardar(self, url: str, modo: str, html_text: str, tipo: str = 'detalhe'):
+        if not self.ativo or not url or not html_text:
+            return
+        chave = self._chave(url, modo)
+        dados = zlib.compress(html_text.encode('utf-8', errors='ignore'), 6)
+        caminho = self._caminho(chave)
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            tmp = caminho + f".{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(dados)
+            os.replace(tmp, caminho)
+        except Exception as e:
+            logar(f"[CACHE] Falha ao gravar {url}: {e}")
+            return
+        agora = time.time()
+        with self._lock:
+            self._carregar()
+            anterior = self._indice.get(chave)
+            if anterior is not None:
+                self._total -= anterior.get('tamanho', 0)
+            self._indice[chave] = {'url': url_canonica(url), 'modo': modo, 'tipo': tipo,
+                                   'criado': agora, 'acesso': agora, 'tamanho': len(dados)}
+            self._total += len(dados)
+            self.stats['gravados'] += 1
+            self._despejar()
+            self._alteracoes += 1
+            if self._alteracoes >= self.SALVAR_A_CADA:
+                self._salvar_indice()
+
+    def _remover(self, chave: str):
+        # caller holds the lock
+        meta = self._indice.pop(chave, None)
+        if meta is not None:
+            self._total -= meta.get('tamanho', 0)
+        self._alteracoes += 1
+        try:
+            os.remove(self._caminho(chave))
+        except Exception:
+            pass
+
+    def _despejar(self):
+        # caller holds the lock
+        if self._total <= self.max_bytes:
+            return
+        for chave, _ in sorted(self._indice.items(), key=lambda kv: kv[1].get('acesso', 0)):
+            if self._total <= self.max_bytes * 0.9:
+                break
+            self._remover(chave)
+            self.stats['removidos'] += 1
+
+    def _salvar_indice(self):
+        # caller holds the lock
+        if self._indice is None:
+            return
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            tmp = self._arquivo_indice + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._indice, f)
+            os.replace(tmp, self._arquivo_indice)
+            self._alteracoes = 0
+        except Exception as e:
+            logar(f"[CACHE] Nao foi possivel salvar o indice: {e}")
+
+    def salvar(self):
+        with self._lock:
+            if self._alteracoes:
+                self._salvar_indice()
+
+    def relatorio(self) -> dict:
+        with self._lock:
+            self._carregar()
+            consultas = self.stats['hits'] + self.stats['misses'] + self.stats['expirados']
+            return dict(self.stats,
+                        entradas=len(self._indice),
+                        bytes=self._total,
+                        taxa_acerto=round(self.stats['hits'] / consultas, 3) if consultas else 0.0)
+
+
+PAGE_CACHE = PageCache(PAGE_CACHE_DIR)
+atexit.register(PAGE_CACHE.salvar)
+
+
+# ============================================================================
+# ANÚNCIOS JÁ VISTOS (SCRAPING INCREMENTAL)
+# ============================================================================
+# Remembers, per portal and ad ID, the list-view fields and the details parsed
+# for each ad. On the next run an ad whose list-view name, price and km are
+# unchanged reuses those details instead of paying for a detail fetch.
+
+SEEN_LISTINGS_FILE = os.path.join(os.getcwd(), "seen_listings.json")
+SEEN_VALIDADE_DIAS = 14
+
+
+class SeenListings:
+    """Persistent portal + ad ID -> (list-view hash, price, details) store."""
+
+    SALVAR_A_CADA = 25  # new entries between saves; the GUI stops a run by killing the process
+
+    def __init__(self, path: str):
+        self.path = path
+        self.ativo = True
+        self._lock = threading.Lock()
+        self._dados = None
+        self._alterado = False
+        self._novos = 0
+        self.stats = {'reaproveitados': 0, 'novos': 0, 'alterados': 0}
+
+    def _carregar(self):
+        if self._dados is not None:
+            return
+        self._dados = {}
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._dados = json.load(f) or {}
+        except Exception as e:
+            logar(f"[VISTOS] Nao foi possivel carregar anuncios vistos: {e}")
+
+    @staticmethod
+    def id_anuncio(portal: str, link: str) -> str:
+        """Stable ad ID: Mercado Livre MLB code, else the last long number in the path, else the canonical URL."""
+        link = link or ''
+        m = re.search(r'MLB-?(\d+)', link, flags=re.I)
+        if m:
+            return f"{portal}:MLB{m.group(1)}"
+        from urllib.parse import urlsplit
+        numeros = re.findall(r'\d{6,}', urlsplit(link).path)
+        if numeros:
+            return f"{portal}:{numeros[-1]}"
+        return f"{portal}:{url_canonica(link)}"
+
+    @staticmethod
+    def _assinatura(car_data: dict, forbidden_words) -> str:
+        import hashlib
+        campos = [normalize_text(str(car_data.get(k) or '')) for k in ('Nome do Carro', 'Valor', 'KM')]
+        campos.append('|'.join(sorted(normalize_text(w.strip()) for w in forbidden_words or [] if w and w.strip())))
+        return hashlib.sha1('\x1f'.join(campos).encode('utf-8')).hexdigest()
+
+    def detalhes(self, portal: str, car_data: dict, forbidden_words=None):
+        """Stored details when this ad was seen before with the same list-view fields, else None."""
+        if not self.ativo or not car_data.get('Link'):
+            return None
+        chave = self.id_anuncio(portal, car_data['Link'])
+        with self._lock:
+            self._carregar()
+            item = self._dados.get(chave)
+            if not item or item.get('detalhes') is None:
+                self.stats['novos'] += 1
+                return None
+            if item.get('hash') != self._assinatura(car_data, forbidden_words) or \
+                    time.time() - item.get('detalhado_em', 0) > SEEN_VALIDADE_DIAS * 86400:
+                self.stats['alterados'] += 1
+                return None
+            item['visto_em'] = time.time()
+            self._alterado = True
+            self.stats['reaproveitados'] += 1
+            return item['detalhes']
+
+    def registrar(self, portal: str, car_data: dict, details, forbidden_words=None):
+        # only details that look complete are worth reusing
+        if not self.ativo or not car_data.get('Link') or not detalhes_http_validos(details):
+            return
+        chave = self.id_anuncio(portal, car_data['Link'])
+        agora = time.time()
+        with self._lock:
+            self._carregar()
+            anterior = self._dados.get(chave) or {}
+            self._dados[chave] = {
+                'preco': car_data.get('Valor', ''),
+                'hash': self._assinatura(car_data, forbidden_words),
+                'detalhes': details,
+                'primeiro_visto': anterior.get('primeiro_visto', agora),
+                'visto_em': agora,
+                'detalhado_em': agora,
+            }
+            self._alterado = True
+            self._novos += 1
+            salvar = self._novos >= self.SALVAR_A_CADA
+        if salvar:
+            self.salvar()
+
+    def salvar(self):
+        with self._lock:
+            if not self._alterado or self._dados is None:
+                return
+            limite = time.time() - 2 * SEEN_VALIDADE_DIAS * 86400
+            dados = {k: v for k, v in self._dados.items() if v.get('visto_em', 0) >= limite}
+            try:
+                tmp = self.path + '.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(dados, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+                self._dados = dados
+                self._alterado = False
+                self._novos = 0
+            except Exception as e:
+                logar(f"[VISTOS] Nao foi possivel salvar anuncios vistos: {e}")
+
+
+SEEN_LISTINGS = SeenListings(SEEN_LISTINGS_FILE)
+atexit.register(SEEN_LISTINGS.salvar)
+
+
+def reaproveitar_detalhes(portal: str, por_link: dict, forbidden_words, aplicar) -> int:
+    """Add the cars of por_link ({link: [car_data]}) that need no detail fetch; their links leave por_link.
+
+    Cars unchanged since a previous run get their stored details through
+    aplicar(car_data, details). Copies of a car another portal already delivered
+    with details are added as is and merged by add_dado.
+    """
+    reaproveitados = 0
+    duplicados = 0
+    for link in list(por_link):
+        if link in JOURNAL.links_coletados:
+            del por_link[link]
+            continue
+        carros = por_link[link]
+        details = SEEN_LISTINGS.detalhes(portal, carros[0], forbidden_words)
+        if details is None:
+            with _saida_lock:
+                completa = INDICE_DUPLICADOS.duplicata_completa(carros[0])
+            if completa:
+                del por_link[link]
+                for car_data in carros:
+                    add_dado(car_data)
+                    duplicados += 1
+            continue
+        del por_link[link]
+        for car_data in carros:
+            aplicar(car_data, details)
+            add_dado(car_data)
+            reaproveitados += 1
+    if reaproveitados:
+        logar(f"[VISTOS] {portal}: {reaproveitados} anuncios sem alteracao, detalhes reaproveitados")
+    if duplicados:
+        logar(f"[DUPLICADO] {portal}: {duplicados} anuncios ja detalhados em outro portal, sem buscar detalhes")
+    return reaproveitados + duplicados
+
+
+# ============================================================================
+# DUPLICADOS ENTRE PORTAIS
+# ============================================================================
+# Every record is fingerprinted on arrival: name tokens (MinHash signature,
+# indexed with LSH bands), year, km and price. A record from another portal
+# whose name lands in a shared LSH bucket, states no different displacement or
+# trim, and whose price plus km or year agree within the tolerances is merged
+# into the first copy instead of being added again.
+
+DEDUP_STOPWORDS = {'de', 'da', 'do', 'com', 'e', 'p', 'para', 'carro', 'flex', 'gasolina', 'completo'}
+# Trim levels: two names that carry different ones are different cars, however similar the rest
+DEDUP_VERSOES = {
+    'ls', 'lt', 'ltz', 'premier', 'activ', 'joy', 'sense', 'vision', 'comfort', 'evolution', 'platinum',
+    'diamond', 'trendline', 'comfortline', 'highline', 'gts', 'gti', 'track', 'cross', 'sport', 'sportline',
+    'se', 'sel', 'titanium', 'freestyle', 'storm', 'lx', 'lxs', 'lxr', 'ex', 'exl', 'exr', 'touring',
+    'gl', 'gls', 'glx', 'xei', 'gli', 'xli', 'altis', 'xs', 'xl', 'xls', 'xlt', 'limited', 'longitude',
+    'trailhawk', 'laredo', 'freedom', 'volcano', 'ultra', 'ranch', 'endurance', 'attractive',
+    'essence', 'drive', 'trekking', 'way', 'like', 'life', 'zen', 'intense', 'iconic', 'expression',
+    'dynamique', 'privilege', 'active', 'allure', 'feline', 'griffe', 'shine', 'live', 'feel', 'tendance',
+}
+
+
+class IndiceDuplicados:
+    """MinHash/LSH index over name tokens for near-duplicate records across portals."""
+
+    NUM_HASHES = 32
+    LINHAS_POR_BANDA = 4  # 8 bands: candidate pairs start around 0.6 name similarity
+    LIMIAR_NOME = 0.65
+    TOLERANCIA_PRECO = 0.03
+    MINIMO_PRECO = 50000  # centavos (R$ 500)
+    TOLERANCIA_KM = 0.05
+    _PRIMO = (1 << 61) - 1
+
+    def __init__(self):
+        import random
+        rnd = random.Random(1729)
+        self._coefs = [(rnd.randrange(1, self._PRIMO), rnd.randrange(0, self._PRIMO)) for _ in range(self.NUM_HASHES)]
+        self.ativo = True
+        self.limpar()
+
+    def limpar(self):
+        self._bandas = {}     # (banda, valores) -> {portal: [idx]}
+        self._registros = []  # (assinatura, impressao, dado)
+        self.copias = []      # (copia, principal) for every merge, to export the copy rows again
+        self.mesclados = 0
+
+    @staticmethod
+    def _tokens(nome: str) -> set:
+        tokens = re.findall(r'[a-z0-9]+(?:\.[0-9]+)?', normalize_text(nome))
+        return {t for t in tokens if t not in DEDUP_STOPWORDS}
+
+    def _assinatura(self, tokens: set) -> tuple:
+        hashes = [zlib.crc32(t.encode('utf-8')) for t in tokens]
+        return tuple(min((a * h + b) % self._PRIMO for h in hashes) for a, b in self._coefs)
+
+    def _chaves_lsh(self, assinatura: tuple):
+        r = self.LINHAS_POR_BANDA
+        return [(i, assinatura[i * r:(i + 1) * r]) for i in range(len(assinatura) // r)]
+
+    @staticmethod
+    def _impressao(dado: dict) -> dict:
+        # numbers parsed at ingestion (Listing.normalizar_numeros)
+        tokens = IndiceDuplicados._tokens(dado.get('Nome do Carro', ''))
+        return {
+            'portal': dado.get('Portal', ''),
+            'preco': dado.get('preco_centavos'),
+            'km': dado.get('km_num'),
+            'ano': dado.get('ano_num'),
+            'motor': {t for t in tokens if re.fullmatch(r'\d\.\d', t)},
+            'versao': tokens & DEDUP_VERSOES,
+        }
+
+    def _mesmo_carro(self, a: tuple, b: tuple) -> bool:
+        (sig_a, fp_a), (sig_b, fp_b) = a, b
+        if fp_a['portal'] == fp_b['portal']:
+            return False
+        if sum(x == y for x, y in zip(sig_a, sig_b)) / self.NUM_HASHES < self.LIMIAR_NOME:
+            return False
+        # displacement and trim must agree whenever both names state them
+        for campo in ('motor', 'versao'):
+            if fp_a[campo] and fp_b[campo] and fp_a[campo] != fp_b[campo]:
+                return False
+        # price is required on both sides, plus km or year on both sides
+        if not fp_a['preco'] or not fp_b['preco']:
+            return False
+        if abs(fp_a['preco'] - fp_b['preco']) > max(self.MINIMO_PRECO, self.TOLERANCIA_PRECO * max(fp_a['preco'], fp_b['preco'])):
+            return False
+        km_ambos = fp_a['km'] is not None and fp_b['km'] is not None
+        ano_ambos = bool(fp_a['ano'] and fp_b['ano'])
+        if not km_ambos and not ano_ambos:
+            return False
+        if km_ambos and abs(fp_a['km'] - fp_b['km']) > max(1000, self.TOLERANCIA_KM * max(fp_a['km'], fp_b['km'])):
+            return False
+        if ano_ambos and fp_a['ano'] != fp_b['ano']:
+            return False
+        return True
+
+    def _procurar(self, dado: dict):
+        tokens = self._tokens(dado.get('Nome do Carro', ''))
+        if not tokens:
+            return None, None
+        chave = (self._assinatura(tokens), self._impressao(dado))
+        portal = chave[1]['portal']
+        vistos = set()
+        for banda in self._chaves_lsh(chave[0]):
+            for outro, indices in self._bandas.get(banda, {}).items():
+                if outro == portal:
+                    continue
+                for idx in indices:
+                    if idx in vistos:
+                        continue
+                    vistos.add(idx)
+                    sig, fp, existente = self._registros[idx]
+                    if self._mesmo_carro(chave, (sig, fp)):
+                        return chave, existente
+        return chave, None
+
+    def registrar(self, dado: dict):
+        """Index dado, or merge it into an earlier copy from another portal and return that copy."""
+        if not self.ativo:
+            return None
+        chave, existente = self._procurar(dado)
+        if existente is not None:
+            self._mesclar(existente, dado)
+            self.copias.append((dado, existente))
+            self.mesclados += 1
+            return existente
+        if chave is not None:
+            idx = len(self._registros)
+            self._registros.append((chave[0], chave[1], dado))
+            for banda in self._chaves_lsh(chave[0]):
+                self._bandas.setdefault(banda, {}).setdefault(chave[1]['portal'], []).append(idx)
+        return None
+
+    @staticmethod
+    def _mesclar(principal: dict, copia: dict):
+        if 'Links' not in principal:
+            principal['Links'] = [{'Portal': principal.get('Portal', ''), 'Link': principal.get('Link', ''),
+                                   'Valor': principal.get('Valor', '')}]
+        if not any(l.get('Link') == copia.get('Link', '') for l in principal['Links']):
+            # a resumed run merges the same copy again
+            principal['Links'].append({'Portal': copia.get('Portal', ''), 'Link': copia.get('Link', ''),
+                                       'Valor': copia.get('Valor', '')})
+        principal['Portais'] = sorted({l['Portal'] for l in principal['Links'] if l['Portal']})
+        for chave, valor in copia.items():
+            if valor and not principal.get(chave) and chave not in ('Portal', 'Link'):
+                principal[chave] = valor
+
+    def duplicata_completa(self, car_data: dict) -> bool:
+        """True when car_data matches a record from another portal that already has its details."""
+        if not self.ativo:
+            return False
+        _, existente = self._procurar(car_data)
+        return existente is not None and detalhes_http_validos({
+            'quilometragem': existente.get('Quilometragem'), 'cambio': existente.get('Câmbio') or existente.get('Cambio'),
+            'ano': existente.get('Ano'), 'descricao': existente.get('Descrição') or existente.get('Descricao'),
+            'combustivel': existente.get('Combustível') or existente.get('Combustivel'), 'portas': existente.get('Portas'),
+        })
+
+
+INDICE_DUPLICADOS = IndiceDuplicados()
+
+
+# ============================================================================
+# HASH PERCEPTUAL DE IMAGENS (OPCIONAL)
+# ============================================================================
+# Dealers re-post the same vehicle with new text, so the thumbnail is the best
+# signal left. With filtros['image_hash'] and Pillow installed, each record's
+# Imagem is downloaded by a small background pool (or read from IMAGE_CACHE_DIR,
+# which also allows an offline pass), reduced to a 64-bit dHash and looked up
+# in a BK-tree. Records whose photos are within IMAGE_HASH_DISTANCIA bits are
+# flagged with "Fotos Repetidas" and re-emitted so the GUI can mark them.
+# Flat thumbnails (placeholders) are skipped, and a photo shared by more than
+# IMAGE_MAX_REPETIDOS records is treated as a stock image and never flags.
+# add_dado only enqueues; nothing here ever blocks a scraper thread.
+
+IMAGE_CACHE_DIR = os.path.join(os.getcwd(), "image_cache")
+IMAGE_HASH_WORKERS = 3
+IMAGE_HASH_DISTANCIA = 6
+IMAGE_MAX_BYTES = 2 * 1024 * 1024
+IMAGE_VARIANCIA_MIN = 20.0   # blank, uniform and lazy-load placeholder thumbnails hash to ~0; skip them
+IMAGE_MAX_REPETIDOS = 10     # a photo matching more listings than this is a stock/placeholder image
+IMAGE_HASH_DEGENERADOS = (0, (1 << 64) - 1)
+
+
+def _dhash_pixels(pixels, largura: int = 9) -> int:
+    """dHash of a largura x (largura-1) grayscale grid: one bit per left/right brightness step."""
+    valor = 0
+    for y in range(largura - 1):
+        linha = pixels[y * largura:(y + 1) * largura]
+        for x in range(largura - 1):
+            valor = (valor << 1) | (1 if linha[x] > linha[x + 1] else 0)
+    return valor
+
+
+def dhash_imagem(dados: bytes) -> Optional[int]:
+    if Image is None or not dados:
+        return None
+    import io
+    try:
+        with Image.open(io.BytesIO(dados)) as img:
+            pequena = img.convert('L').resize((9, 8), Image.LANCZOS)
+            pixels = list(pequena.getdata())
+    except Exception:
+        return None
+    media = sum(pixels) / len(pixels)
+    if sum((p - media) ** 2 for p in pixels) / len(pixels) < IMAGE_VARIANCIA_MIN:
+        return None
+    return _dhash_pixels(pixels)
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes with Hamming distance."""
+
+    def __init__(self):
+        self._raiz = None  # [hash, itens, {distancia: no}]
+
+    def adicionar(self, valor: int, item):
+        if self._raiz is None:
+            self._raiz = [valor, [item], {}]
+            return
+        no = self._raiz
+        while True:
+            d = bin(no[0] ^ valor).count('1')
+            if d == 0:
+                no[1].append(item)
+                return
+            filho = no[2].get(d)
+            if filho is None:
+                no[2][d] = [valor, [item], {}]
+                return
+            no = filho
+
+    def buscar(self, valor: int, raio: int) -> list:
+        """[(distancia, item)] within raio of valor."""
+        achados = []
+        pilha = [self._raiz] if self._raiz else []
+        while pilha:
+            no = pilha.pop()
+            d = bin(no[0] ^ valor).count('1')
+            if d <= raio:
+                achados.extend((d, item) for item in no[1])
+            for dist, filho in no[2].items():
+                if d - raio <= dist <= d + raio:
+                    pilha.append(filho)
+        return achados
+
+
+class HashImagens:
+    """Background perceptual hashing of record thumbnails with near-duplicate flagging."""
+
+    def __init__(self, diretorio: str, max_workers: int = IMAGE_HASH_WORKERS):
+        self.diretorio = diretorio
+        self.max_workers = max_workers
+        self.ativo = False
+        self.offline = False
+        self._executor = None
+        self._pendentes = set()
+        self._lock = threading.Lock()
+        self._arvore = BKTree()
+        self.repetidos = 0
+
+    def configurar(self, ativo: bool, offline: bool = False):
+        if ativo and Image is None:
+            logar("[IMAGENS] Pillow nao instalado, hash de imagens desativado")
+            ativo = False
+        with self._lock:
+            self.ativo = ativo
+            self.offline = offline
+            self._arvore = BKTree()
+            self.repetidos = 0
+
+    def _arquivo(self, url: str) -> str:
+        import hashlib
+        return os.path.join(self.diretorio, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.img')
+
+    def _bytes_imagem(self, url: str):
+        caminho = self._arquivo(url)
+        try:
+            with open(caminho, 'rb') as f:
+                return f.read()
+        except OSError:
+            pass
+        if self.offline or not url.startswith('http'):
+            return None
+        resp = HTTP_CLIENTE.get(url, timeout=15, max_bytes=IMAGE_MAX_BYTES)
+        if resp.status != 200 or resp.truncada:
+            return None
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            tmp = caminho + f".{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(resp.corpo)
+            os.replace(tmp, caminho)
+        except Exception:
+            pass
+        return resp.corpo
+
+    def enviar(self, dado: dict):
+        """Queue dado for hashing; returns immediately."""
+        url = (dado.get('Imagem') or '').strip()
+        if not self.ativo or not url:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='imagens')
+            fut = self._executor.submit(self._processar, dado, url)
+            self._pendentes.add(fut)
+        fut.add_done_callback(self._concluido)
+
+    def _concluido(self, fut):
+        with self._lock:
+            self._pendentes.discard(fut)
+
+    def _processar(self, dado: dict, url: str):
+        if not self.ativo or should_stop():
+            return
+        try:
+            valor = dhash_imagem(self._bytes_imagem(url))
+        except Exception as e:
+            logar(f"[IMAGENS] Falha ao processar {url}: {e}")
+            return
+        if valor is None or valor in IMAGE_HASH_DEGENERADOS:
+            return
+        link = dado.get('Link', '')
+        with self._lock:
+            parecidos = [item for _, item in self._arvore.buscar(valor, IMAGE_HASH_DISTANCIA)
+                         if item.get('Link', '') != link]
+            if len(parecidos) >= IMAGE_MAX_REPETIDOS:
+                return  # stock photo: not a re-post, and flagging it would grow every list
+            self._arvore.adicionar(valor, dado)
+        if not parecidos:
+            return
+        with _saida_lock:
+            if not self.ativo:
+                return  # finalizar already ran; the result is out
+            dado['Hash Imagem'] = f"{valor:016x}"
+            alterados = [dado]
+            for outro in parecidos:
+                for a, b in ((dado, outro), (outro, dado)):
+                    repetidas = a.setdefault('Fotos Repetidas', [])
+                    if b.get('Link') and b['Link'] not in repetidas:
+                        repetidas.append(b['Link'])
+                alterados.append(outro)
+            self.repetidos += 1
+            logar(f"[IMAGENS] Foto repetida: {dado.get('Nome do Carro', '')} ({dado.get('Portal', '')}) "
+                  f"~ {len(parecidos)} anuncio(s)")
+            for item in alterados:
+                emitir_evento('duplicado', item)
+
+    def finalizar(self, timeout: float = 15.0):
+        """Wait up to timeout for queued images so the final result carries the flags, then drop
+        the rest: nothing is downloaded or emitted after the run's result."""
+        with self._lock:
+            pendentes = list(self._pendentes)
+        if pendentes and not should_stop():
+            wait(pendentes, timeout=timeout)
+        with self._lock:
+            self.ativo = False
+            executor, self._executor = self._executor, None
+            pendentes = list(self._pendentes)
+        # cancel_futures needs Python 3.9
+        for fut in pendentes:
+            fut.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+HASH_IMAGENS = HashImagens(IMAGE_CACHE_DIR)
+
+
+# ============================================================================
+# JOURNAL DA EXECUÇÃO
+# ============================================================================
+# Each run appends its records to journal/run_<timestamp>.jsonl as they are
+# added: an 'inicio' line with the filtros, one 'dado' line per record (merged
+# records are written again), and a 'fim' line with the final status. Lines are
+# flushed on every write (they survive the GUI killing the process) and fsynced
+# in batches. "--recuperar" rebuilds results and the Excel file from a journal,
+# "--retomar" continues a stopped run without re-adding what it already had.
+
+JOURNAL_DIR = os.path.join(os.getcwd(), "journal")
+JOURNAL_FSYNC_A_CADA = 25
+JOURNAL_FSYNC_SEGUNDOS = 2.0
+
+
+JOURNAL_CHAVES_SECRETAS = ('zenrowsApiKey', 'zenrows_api_key')  # never written; a resume uses the current key
+
+
+class JournalExecucao:
+    """Append-only JSONL journal of the records of one run."""
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        self.caminho = None
+        self.links_coletados = set()
+        self._arquivo = None
+        self._lock = threading.Lock()
+        self._sem_fsync = 0
+        self._ultimo_fsync = 0.0
+
+    def abrir(self, filtros: dict, caminho: str = None):
+        """Start a new journal, or keep appending to caminho when resuming."""
+        self.fechar(None)
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            novo = caminho is None
+            if novo:
+                caminho = os.path.join(self.diretorio, time.strftime("run_%Y%m%d_%H%M%S.jsonl"))
+            self.caminho = caminho
+            if not novo and os.path.getsize(caminho):
+                with open(caminho, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    cortada = f.read(1) != b'\n'
+            else:
+                cortada = False
+            self._arquivo = open(caminho, 'a', encoding='utf-8')
+            if cortada:
+                # the killed run left half a line; start ours on a fresh one
+                self._arquivo.write("\n")
+            self._ultimo_fsync = time.time()
+            filtros = {k: v for k, v in filtros.items() if k not in JOURNAL_CHAVES_SECRETAS}
+            self._escrever({'tipo': 'inicio' if novo else 'retomada', 'ts': time.time(), 'filtros': filtros}, forcar=True)
+            logar(f"[JOURNAL] Gravando registros em {caminho}")
+        except Exception as e:
+            logar(f"[JOURNAL] Nao foi possivel abrir o journal: {e}")
+            self._arquivo = None
+
+    def _escrever(self, entrada: dict, forcar: bool = False):
+        with self._lock:
+            if self._arquivo is None:
+                return
+            try:
+                self._arquivo.write(json.dumps(entrada, ensure_ascii=False, default=json_listing) + "\n")
+                self._arquivo.flush()
+                self._sem_fsync += 1
+                if forcar or self._sem_fsync >= JOURNAL_FSYNC_A_CADA or \
+                        time.time() - self._ultimo_fsync >= JOURNAL_FSYNC_SEGUNDOS:
+                    os.fsync(self._arquivo.fileno())
+                    self._sem_fsync = 0
+                    self._ultimo_fsync = time.time()
+            except Exception as e:
+                logar(f"[JOURNAL] Falha ao gravar: {e}")
+
+    def registrar(self, dado: dict):
+        if dado.get('Link'):
+            self.links_coletados.add(dado['Link'])
+        self._escrever({'tipo': 'dado', 'dado': dado})
+
+    def fechar(self, status: Optional[str] = 'concluido', total: int = None):
+        if self._arquivo is None:
+            return
+        if status:
+            self._escrever({'tipo': 'fim', 'ts': time.time(), 'status': status, 'total': total}, forcar=True)
+        with self._lock:
+            try:
+                self._arquivo.close()
+            except Exception:
+                pass
+            self._arquivo = None
+
+    @staticmethod
+    def ultimo(diretorio: str = JOURNAL_DIR) -> Optional[str]:
+        try:
+            arquivos = sorted(f for f in os.listdir(diretorio) if f.startswith('run_') and f.endswith('.jsonl'))
+        except OSError:
+            return None
+        return os.path.join(diretorio, arquivos[-1]) if arquivos else None
+
+    @staticmethod
+    def ler(caminho: str):
+        """(filtros, records, status) from a journal; later lines for the same Link replace earlier ones
+        and a torn last line from a crash is ignored."""
+        filtros, status = {}, None
+        por_link, ordem = {}, []
+        with open(caminho, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    entrada = json.loads(linha)
+                except ValueError:
+                    continue
+                tipo = entrada.get('tipo')
+                if tipo == 'inicio':
+                    filtros = entrada.get('filtros') or {}
+                elif tipo == 'retomada':
+                    status = None
+                elif tipo == 'fim':
+                    status = entrada.get('status')
+                elif tipo == 'dado':
+                    dado = entrada.get('dado') or {}
+                    chave = dado.get('Link') or f"#{len(ordem)}"
+                    if chave not in por_link:
+                        ordem.append(chave)
+                    por_link[chave] = dado
+        return filtros, [por_link[c] for c in ordem], status
+
+
+JOURNAL = JournalExecucao(JOURNAL_DIR)
+atexit.register(JOURNAL.fechar, None)
+
+
+def recuperar_execucao(caminho: str = None) -> str:
+    """Rebuild the results and the Excel file of a run from its journal; returns RESULTADO_JSON payload."""
+    caminho = caminho or JournalExecucao.ultimo()
+    if not caminho or not os.path.exists(caminho):
+        logar("[JOURNAL] Nenhum journal encontrado para recuperar")
+        return json.dumps([])
+    _, dados, status = JournalExecucao.ler(caminho)
+    logar(f"[JOURNAL] {len(dados)} registros recuperados de {caminho} (status: {status or 'interrompido'})")
+    if dados:
+        salvar_excel_resultados(dados)
+    return json.dumps(dados, ensure_ascii=False)
+
+
+# ============================================================================
+# EXPORTAÇÃO EM STREAMING
+# ============================================================================
+# Rows are written while the records arrive, by a background thread fed through
+# a bounded queue, into a write-only openpyxl workbook (or CSV when openpyxl is
+# missing). Only the canonical columns below are exported; each one takes the
+# first non-empty value among the alias keys add_dado fills.
+
+EXPORT_COLUNAS = [
+    ("Nome do Carro", ("Nome do Carro", "nome")),
+    ("Valor", ("Valor", "valor")),
+    ("KM", ("KM", "Quilometragem", "quilometragem", "km")),
+    ("Ano", ("Ano", "ano")),
+    ("Motor", ("Motor", "motor")),
+    ("Potência", ("Potência (hp)", "Potencia", "potencia", "Potência do Motor", "potenciaMotor")),
+    ("Portas", ("Portas", "portas")),
+    ("Câmbio", ("Câmbio", "Cambio", "cambio")),
+    ("Combustível", ("Combustível", "Combustivel", "combustivel")),
+    ("Direção", ("Direção", "direcao", "Tipo de Direção", "tipoDirecao")),
+    ("Cor", ("Cor", "cor")),
+    ("Localização", ("Localização", "local")),
+    ("Portal", ("Portal", "portal")),
+    ("Portais", ("Portais",)),
+    ("Link", ("Link", "link")),
+    ("Imagem", ("Imagem", "imagem")),
+    ("Descrição", ("Descrição", "Descricao", "descricao")),
+    ("Palavras Proibidas", ("Palavras Proibidas", "palavrasProibidas")),
+    ("Fotos Repetidas", ("Fotos Repetidas",)),
+    ("Duplicado de", ("Duplicado de",)),
+]
+EXPORT_FILA_MAX = 1000
+# Merge and photo-flag data that is only final at the end of the run; written next to
+# the streamed rows (sheet "Atualizacoes" in .xlsx, <arquivo>_atualizacoes.csv otherwise)
+EXPORT_ATUALIZACOES = [
+    ("Link", ("Link", "link")),
+    ("Portais", ("Portais",)),
+    ("Links", ("Links",)),
+    ("Fotos Repetidas", ("Fotos Repetidas",)),
+    ("Duplicado de", ("Duplicado de",)),
+]
+
+
+def linha_exportacao(dado: dict, colunas=EXPORT_COLUNAS) -> list:
+    linha = []
+    for _, aliases in colunas:
+        valor = next((dado[k] for k in aliases if dado.get(k) not in (None, '', [])), '')
+        if isinstance(valor, (list, tuple, set)):
+            if any(isinstance(v, dict) for v in valor):
+                valor = json.dumps(list(valor), ensure_ascii=False)
+            else:
+                valor = ', '.join(str(v) for v in valor)
+        elif isinstance(valor, dict):
+            valor = json.dumps(valor, ensure_ascii=False)
+        elif isinstance(valor, float) and valor != valor:
+            valor = ''  # NaN from imported sheets
+        linha.append(valor)
+    return linha
+
+
+# Columnar export (.parquet / .arrow) adds typed copies of the numeric fields next to
+# the text columns, so large archives can be sorted and filtered without re-parsing.
+EXPORT_NUMERICAS = [
+    # (column, source canonical column, arrow type name, parser)
+    ("preco_centavos", "Valor", "int64", preco_centavos),
+    ("km_num", "KM", "int64", km_inteiro),
+    ("ano_num", "Ano", "int16", ano_inteiro),
+    ("portas_num", "Portas", "int8", portas_inteiro),
+    ("potencia_hp", "Potência", "int16", potencia_hp),
+    ("cilindrada", "Motor", "float32", cilindrada_litros),
+]
+EXPORT_LOTE_COLUNAR = 5000  # rows per Parquet row group / Arrow record batch
+EXPORT_COLUNARES = ('.parquet', '.arrow')
+
+# Columns the GUI reads back on import; the rest stay on disk.
+IMPORT_COLUNAS_GUI = [
+    "Nome do Carro", "Valor", "KM", "Ano", "Motor", "Potência", "Portas", "Câmbio",
+    "Combustível", "Cor", "Localização", "Portal", "Portais", "Link", "Imagem",
+    "Descrição", "Fotos Repetidas",
+] + [nome for nome, _, _, _ in EXPORT_NUMERICAS]
+
+
+def _esquema_colunar():
+    campos = [pa.field(nome, pa.string()) for nome, _ in EXPORT_COLUNAS]
+    campos += [pa.field(nome, getattr(pa, tipo)()) for nome, _, tipo, _ in EXPORT_NUMERICAS]
+    return pa.schema(campos)
+
+
+def _lote_colunar(linhas: list, esquema):
+    """Arrow record batch from canonical rows (text columns + typed numeric copies)."""
+    nomes = [nome for nome, _ in EXPORT_COLUNAS]
+    colunas = list(zip(*linhas))
+    arrays = [pa.array(['' if v is None else str(v) for v in col], type=pa.string()) for col in colunas]
+    for nome, origem, tipo, parser in EXPORT_NUMERICAS:
+        valores = colunas[nomes.index(origem)]
+        arrays.append(pa.array([parser(v) for v in valores], type=getattr(pa, tipo)()))
+    return pa.RecordBatch.from_arrays(arrays, schema=esquema)
+
+
+def importar_colunar(caminho: str, colunas: Optional[list] = None) -> list:
+    """Read a .parquet/.arrow export memory-mapped, loading only `colunas` that exist in the file."""
+    if pa is None:
+        raise RuntimeError("pyarrow nao instalado")
+    colunas = IMPORT_COLUNAS_GUI if colunas is None else colunas
+    if caminho.lower().endswith('.parquet'):
+        existentes = set(pq.read_schema(caminho, memory_map=True).names)
+        tabela = pq.read_table(caminho, columns=[c for c in colunas if c in existentes], memory_map=True)
+    else:
+        with pa.memory_map(caminho, 'r') as fonte:
+            tabela = pa.ipc.open_file(fonte).read_all()
+        tabela = tabela.select([c for c in colunas if c in tabela.column_names])
+    registros = []
+    for lote in tabela.to_batches():
+        registros.extend(lote.to_pylist())
+    return registros
+
+
+class ExportadorStreaming:
+    """Background writer of canonical rows to .xlsx (write-only openpyxl), .csv or .parquet/.arrow, with bounded memory."""
+
+    def __init__(self, arquivo: str):
+        base, ext = os.path.splitext(arquivo)
+        if ext.lower() in EXPORT_COLUNARES and pa is None:
+            logar("[EXPORT] pyarrow nao instalado, exportando planilha")
+            ext = '.xlsx'
+        if ext.lower() == '.xlsx' and openpyxl is None:
+            logar("[EXPORT] openpyxl nao instalado, exportando CSV")
+            ext = '.csv'
+        self.arquivo = base + ext.lower()
+        self.arquivo_atualizacoes = None
+        self.linhas = 0
+        self._atualizacoes = []
+        self._fila = None
+        self._thread = None
+        self.erro = None
+
+    def iniciar(self):
+        import queue
+        self._fila = queue.Queue(maxsize=EXPORT_FILA_MAX)
+        self._thread = threading.Thread(target=self._escrever, name='exportador', daemon=True)
+        self._thread.start()
+        return self
+
+    def adicionar(self, dado: dict):
+        """Queue one record; blocks only while the writer is EXPORT_FILA_MAX rows behind."""
+        if self._fila is not None:
+            self._fila.put(linha_exportacao(dado))
+
+    def _escrever(self):
+        tmp = self.arquivo + '.parcial'
+        try:
+            cabecalho = [nome for nome, _ in EXPORT_COLUNAS]
+            if self.arquivo.endswith(EXPORT_COLUNARES):
+                self._escrever_colunar(tmp)
+            elif self.arquivo.endswith('.xlsx'):
+                wb = openpyxl.Workbook(write_only=True)
+                ws = wb.create_sheet("Anuncios")
+                ws.append(cabecalho)
+                for linha in iter(self._fila.get, None):
+                    ws.append(linha)
+                    self.linhas += 1
+                if self._atualizacoes:
+                    ws = wb.create_sheet("Atualizacoes")
+                    ws.append([nome for nome, _ in EXPORT_ATUALIZACOES])
+                    for linha in self._atualizacoes:
+                        ws.append(linha)
+                    self.arquivo_atualizacoes = self.arquivo
+                wb.save(tmp)
+            else:
+                import csv
+                with open(tmp, 'w', encoding='utf-8-sig', newline='') as f:
+                    escritor = csv.writer(f)
+                    escritor.writerow(cabecalho)
+                    for linha in iter(self._fila.get, None):
+                        escritor.writerow(linha)
+                        self.linhas += 1
+            os.replace(tmp, self.arquivo)
+            if self._atualizacoes and not self.arquivo.endswith('.xlsx'):
+                self._escrever_atualizacoes_csv()
+        except Exception as e:
+            self.erro = e
+            logar(f"[EXPORT] Falha ao gravar {self.arquivo}: {e}")
+            # keep draining so producers never block on a dead writer
+            for _ in iter(self._fila.get, None):
+                pass
+
+    def _escrever_colunar(self, tmp: str):
+        esquema = _esquema_colunar()
+        parquet = self.arquivo.endswith('.parquet')
+        if parquet:
+            escritor = pq.ParquetWriter(tmp, esquema, compression='zstd')
+        else:
+            saida = pa.OSFile(tmp, 'wb')
+            escritor = pa.ipc.new_file(saida, esquema)
+        try:
+            lote = []
+            for linha in iter(self._fila.get, None):
+                lote.append(linha)
+                if len(lote) >= EXPORT_LOTE_COLUNAR:
+                    escritor.write_batch(_lote_colunar(lote, esquema))
+                    self.linhas += len(lote)
+                    lote = []
+            if lote:
+                escritor.write_batch(_lote_colunar(lote, esquema))
+                self.linhas += len(lote)
+        finally:
+            escritor.close()
+            if not parquet:
+                saida.close()
+
+    def _escrever_atualizacoes_csv(self):
+        import csv
+        caminho = os.path.splitext(self.arquivo)[0] + '_atualizacoes.csv'
+        with open(caminho + '.parcial', 'w', encoding='utf-8-sig', newline='') as f:
+            escritor = csv.writer(f)
+            escritor.writerow([nome for nome, _ in EXPORT_ATUALIZACOES])
+            escritor.writerows(self._atualizacoes)
+        os.replace(caminho + '.parcial', caminho)
+        self.arquivo_atualizacoes = caminho
+
+    def fechar(self, atualizacoes=()) -> Optional[str]:
+        """Finish the file, adding the EXPORT_ATUALIZACOES rows of atualizacoes; returns its path,
+        or None if writing failed."""
+        if self._fila is None:
+            return None
+        self._atualizacoes = [linha_exportacao(d, EXPORT_ATUALIZACOES) for d in atualizacoes]
+        self._fila.put(None)
+        self._thread.join()
+        self._fila = None
+        return None if self.erro else self.arquivo
+
+
+EXPORTADOR: Optional[ExportadorStreaming] = None
+
+
+def linha_copia(copia, principal) -> dict:
+    """Export record of a copy merged into principal (another portal's listing of the same car)."""
+    return dict(Listing.de_dict(copia).para_dict(), **{'Duplicado de': principal.get('Link', '')})
+
+
+def fechar_exportacao(dados: list) -> tuple:
+    """Close EXPORTADOR; returns (path or None, rows written).
+
+    The streamed rows are final. Cross-portal merges (Portais/Links) and photo flags
+    change records after their row was written, so the merged, flagged and copy
+    records go to the update rows (EXPORT_ATUALIZACOES) instead."""
+    global EXPORTADOR
+    with _saida_lock:
+        exportador, EXPORTADOR = EXPORTADOR, None
+        if exportador is None:
+            return None, 0
+        principais = {id(p) for _, p in INDICE_DUPLICADOS.copias}
+        atualizacoes = [d for d in dados if id(d) in principais or d.get('Fotos Repetidas')]
+        atualizacoes += [linha_copia(c, p) for c, p in INDICE_DUPLICADOS.copias]
+    planilha = exportador.fechar(atualizacoes)
+    if planilha and exportador.arquivo_atualizacoes:
+        logar(f"[EXPORT] {len(atualizacoes)} atualizacoes de mesclagem/fotos em '{exportador.arquivo_atualizacoes}'")
+    return planilha, exportador.linhas
+
+
+def salvar_excel_resultados(dados: list, arquivo: str = "anuncios_carros.xlsx"):
+    exportador = ExportadorStreaming(arquivo).iniciar()
+    for dado in dados:
+        exportador.adicionar(dado)
+    caminho = exportador.fechar()
+    if caminho:
+        logar(f"[OK] Planilha '{caminho}' gerada com {exportador.linhas} carros.")
+        emitir_evento('planilha', caminho)
+    return caminho
+
+
+ZENROWS_STATS_FILE = os.path.join(os.getcwd(), "zenrows_wait_stats.json")
+
+# Per-portal validity probes: a ZenRows response only counts as a success for the
+# wait ladder when the rendered HTML actually contains portal content.
+ZENROWS_PROBES = {
+    'olx': re.compile(r'(olx-adcard|data-lurker-listitemid|ad-price|/autos-e-pecas/)', re.I),
+    'webmotors': re.compile(r'(data-testid="vehicle_card_oem_container"|_Card_)', re.I),
+    'mercado_livre': re.compile(r'(ui-search-result|ui-pdp|andes-money-amount)', re.I),
+    'seminovos': re.compile(r'(anuncio-container|part-items-detalhes|R\$)', re.I),
+}
+
+
+def zenrows_html_valido(html_text: str, portal: str = None) -> bool:
+    if not html_text or len(html_text) <= 100:
+        return False
+    probe = ZENROWS_PROBES.get(portal or '')
+    return bool(probe.search(html_text)) if probe else True
+
+
+class ZenRowsWaitLadder:
+    """Learns, per portal, which ZenRows wait value first yields valid HTML.
+
+    For every successful fetch the wait that produced it is counted. Later fetches
+    start at the median of those first-success waits instead of always walking
+    the ladder from the shortest wait. One fetch in EXPLORAR_A_CADA still starts
+    at the bottom so the level can come back down, and counts are halved past
+    MAX_AMOSTRAS so old runs fade out. Stats persist in ZENROWS_STATS_FILE.
+    """
+
+    MIN_AMOSTRAS = 5
+    MAX_AMOSTRAS = 200
+    MAX_LATENCIAS = 50
+    EXPLORAR_A_CADA = 10
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._fetches = 0
+        self._sujo = False
+        self._ultimo_save = 0.0
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._stats = json.load(f) or {}
+        except Exception as e:
+            logar(f"[ZenRows] Nao foi possivel carregar estatisticas de espera: {e}")
+            self._stats = {}
+
+    def _primeiros_ok(self, portal: str) -> dict:
+        return self._stats.setdefault(portal, {}).setdefault('primeiro_ok', {})
+
+    def ordenar(self, portal: str, waits) -> list:
+        """Return the ladder to try for this portal, starting at the learned level."""
+        waits = list(waits)
+        if not portal or len(waits) <= 1:
+            return waits
+        with self._lock:
+            self._fetches += 1
+            if self._fetches % self.EXPLORAR_A_CADA == 0:
+                return waits
+            contagem = {int(w): n for w, n in self._primeiros_ok(portal).items()}
+        total = sum(n for w, n in contagem.items() if w in waits)
+        if total < self.MIN_AMOSTRAS:
+            return waits
+        acumulado = 0
+        for i, w in enumerate(waits):
+            acumulado += contagem.get(w, 0)
+            if acumulado * 2 >= total:
+                return waits[i:]
+        return waits
+
+    def registrar_latencia(self, portal: str, wait_ms: int, latencia: float):
+        """Remember how long a completed request at this wait level took."""
+        if not portal:
+            return
+        with self._lock:
+            lat = self._stats.setdefault(portal, {}).setdefault('latencias', {})
+            amostras = lat.setdefault(str(int(wait_ms)), [])
+            amostras.append(round(latencia, 2))
+            del amostras[:-self.MAX_LATENCIAS]
+            self._sujo = True
+
+    def percentil_latencia(self, portal: str, wait_ms: int, p: float):
+        """Latency percentile (seconds) for this portal/wait, or None without enough samples."""
+        with self._lock:
+            amostras = list(self._stats.get(portal or '', {}).get('latencias', {}).get(str(int(wait_ms)), []))
+        if len(amostras) < self.MIN_AMOSTRAS:
+            return None
+        amostras.sort()
+        return amostras[min(len(amostras) - 1, int(p * len(amostras)))]
+
+    def registrar(self, portal: str, wait_ms: int, latencia: float = None):
+        if not portal:
+            return
+        if latencia is not None:
+            self.registrar_latencia(portal, wait_ms, latencia)
+        with self._lock:
+            contagem = self._primeiros_ok(portal)
+            chave = str(int(wait_ms))
+            contagem[chave] = contagem.get(chave, 0) + 1
+            if sum(contagem.values()) > self.MAX_AMOSTRAS:
+                for k in list(contagem):
+                    contagem[k] = contagem[k] // 2
+                    if not contagem[k]:
+                        del contagem[k]
+            self._sujo = True
+            salvar = time.time() - self._ultimo_save > 5
+        if salvar:
+            self.salvar()
+
+    def salvar(self):
+        with self._lock:
+            if not self._sujo:
+                return
+            dados = json.dumps(self._stats, ensure_ascii=False, indent=2)
+            self._sujo = False
+            self._ultimo_save = time.time()
+        try:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(dados)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logar(f"[ZenRows] Nao foi possivel salvar estatisticas de espera: {e}")
+
+
+ZENROWS_LADDER = ZenRowsWaitLadder(ZENROWS_STATS_FILE)
+atexit.register(ZENROWS_LADDER.salvar)
+
+
+# Override with a local stand-in (e.g. http://127.0.0.1:8000/) to exercise the fetch paths offline.
+ZENROWS_ENDPOINT = os.getenv('ZENROWS_ENDPOINT', 'https://api.zenrows.com/v1/')
+ZENROWS_TIMEOUT = 90
+
+# Hedged mode: when the outstanding request takes longer than ZENROWS_HEDGE_PERCENTIL
+# of the latencies seen at its wait level, the next wait level is fired in parallel
+# and whichever valid response arrives first wins. Enabled via filtros['zenrows_hedge'].
+ZENROWS_HEDGE = os.getenv('ZENROWS_HEDGE', '').strip().lower() in ('1', 'true', 'sim')
+ZENROWS_HEDGE_PERCENTIL = 0.9
+ZENROWS_HEDGE_ATRASO_PADRAO = 20.0
+
+
+def zenrows_url(page_url: str, api_key: str, wait_ms: int) -> str:
+    return (
+        ZENROWS_ENDPOINT + "?" +
+        f"url={quote(page_url, safe='')}&apikey={quote(api_key)}&js_render=true&premium_proxy=true&antibot=true&wait={wait_ms}"
+    )
+
+
+class _ZenRowsTentativa:
+    """One ZenRows request whose pooled connection can be torn down when the hedge loses."""
+
+    def __init__(self, page_url: str, api_key: str, wait_ms: int):
+        self.wait_ms = wait_ms
+        self.url = zenrows_url(page_url, api_key, wait_ms)
+        self.inicio = time.time()
+        self.cancelada = False
+        self._conn = None  # only while the request is in flight
+        self._lock = threading.Lock()
+
+    def _ao_conectar(self, conn):
+        with self._lock:
+            if self.cancelada:
+                conn.close()
+                raise Exception('cancelada')
+            self._conn = conn
+
+    def _ao_liberar(self, conn) -> bool:
+        with self._lock:
+            self._conn = None
+            return not self.cancelada
+
+    def executar(self) -> str:
+        resp = HTTP_CLIENTE.get(self.url, timeout=ZENROWS_TIMEOUT, ao_conectar=self._ao_conectar,
+                                ao_liberar=self._ao_liberar)
+        if resp.status >= 400:
+            raise Exception(f"HTTP {resp.status}")
+        return resp.text
+
+    def cancelar(self):
+        """Abort the request if it is still in flight; a finished one already released (or pooled) its connection."""
+        with self._lock:
+            self.cancelada = True
+            conn = self._conn
+            try:
+                if conn is not None and conn.sock is not None:
+                    import socket
+                    conn.sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+
+
+def _zenrows_atraso_hedge(portal: str, wait_ms: int) -> float:
+    atraso = ZENROWS_LADDER.percentil_latencia(portal, wait_ms, ZENROWS_HEDGE_PERCENTIL)
+    if atraso is None:
+        return ZENROWS_HEDGE_ATRASO_PADRAO + wait_ms / 1000.0
+    return max(1.0, atraso)
+
+
+def _fetch_via_zenrows_hedged(page_url: str, api_key: str, ladder: list, portal: str = None) -> str:
+    """Hedged variant of the ladder walk: at most two requests in flight, first valid wins."""
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='zenrows-hedge')
+    proximos = list(ladder)
+    em_voo = {}
+    fallback_html = ''
+
+    def _disparar():
+        if not proximos:
+            return False
+        w = proximos.pop(0)
+        t = _ZenRowsTentativa(page_url, api_key, w)
+        em_voo[executor.submit(t.executar)] = t
+        return True
+
+    try:
+        _disparar()
+        while em_voo and not should_stop():
+            mais_recente = max(em_voo.values(), key=lambda t: t.inicio)
+            restante = _zenrows_atraso_hedge(portal, mais_recente.wait_ms) - (time.time() - mais_recente.inicio)
+            pode_hedgear = len(em_voo) < 2 and proximos
+            feitos, _ = wait(list(em_voo), timeout=max(0.05, restante) if pode_hedgear else 1.0,
+                             return_when=FIRST_COMPLETED)
+            if not feitos:
+                if pode_hedgear and _disparar():
+                    logar(f"[ZenRows] Hedge: wait={mais_recente.wait_ms} lento para {page_url}, disparando proximo nivel")
+                continue
+            for fut in feitos:
+                t = em_voo.pop(fut)
+                try:
+                    html_text = fut.result()
+                except Exception as e:
+                    if not t.cancelada:
+                        logar(f"[ZenRows] fetch failed for {page_url} wait={t.wait_ms}: {e}")
+                    html_text = ''
+                if html_text:
+                    ZENROWS_LADDER.registrar_latencia(portal, t.wait_ms, time.time() - t.inicio)
+                if zenrows_html_valido(html_text, portal):
+                    ZENROWS_LADDER.registrar(portal, t.wait_ms)
+                    return html_text
+                if html_text and len(html_text) > 100:
+                    fallback_html = html_text
+            if not em_voo:
+                _disparar()
+        return fallback_html
+    finally:
+        for fut, t in em_voo.items():
+            fut.cancel()
+            t.cancelar()
+        executor.shutdown(wait=False)
+
+
+def fetch_via_zenrows(page_url: str, api_key: str, waits=None, portal: str = None, hedge: bool = None,
+                      tipo: str = 'listagem') -> str:
+    """Fetch page via ZenRows and return HTML text. Returns empty string on failure.
+
+    With a portal name the wait ladder starts at the level learned for that portal
+    and a response must pass the portal probe to count as valid. If no wait passes
+    the probe, the last non-trivial HTML is returned so callers can still try
+    their own fallbacks. waits=None uses the speed profile ladder and hedge=None
+    follows ZENROWS_HEDGE. Valid pages are read through PAGE_CACHE, with the TTL
+    of tipo ('listagem' or 'detalhe').
+    """
+    html_text = PAGE_CACHE.obter(page_url, 'zenrows', tipo)
+    if html_text and zenrows_html_valido(html_text, portal):
+        return html_text
+    ladder = ZENROWS_LADDER.ordenar(portal, waits or PERFIL_VELOCIDADE['zenrows_waits'])
+    if (ZENROWS_HEDGE if hedge is None else hedge) and len(ladder) > 1:
+        html_text = _fetch_via_zenrows_hedged(page_url, api_key, ladder, portal)
+        if zenrows_html_valido(html_text, portal):
+            PAGE_CACHE.guardar(page_url, 'zenrows', html_text, tipo)
+        return html_text
+    fallback_html = ''
+    for w in ladder:
+        try:
+            inicio = time.time()
+            resp = HTTP_CLIENTE.get(zenrows_url(page_url, api_key, w), timeout=ZENROWS_TIMEOUT)
+            if resp.status >= 400:
+                raise Exception(f"HTTP {resp.status}")
+            html_text = resp.text
+            if html_text:
+                ZENROWS_LADDER.registrar_latencia(portal, w, time.time() - inicio)
             # quick sanity probe
-            if html_text and len(html_text) > 100:
+            if zenrows_html_valido(html_text, portal):
+                ZENROWS_LADDER.registrar(portal, w)
+                PAGE_CACHE.guardar(page_url, 'zenrows', html_text, tipo)
                 return html_text
+            if html_text and len(html_text) > 100:
+                fallback_html = html_text
         except Exception as e:
             logar(f"[ZenRows] fetch failed for {page_url} wait={w}: {e}")
             continue
-    return ''
+    return fallback_html
+
+
+ZENROWS_CONCURRENCY_PADRAO = 4
+
+
+def zenrows_concurrency(filtros) -> int:
+    """Parallel detail fetches allowed for ZenRows (filtros['zenrows_concurrency'])."""
+    try:
+        return max(1, int(filtros.get('zenrows_concurrency') or ZENROWS_CONCURRENCY_PADRAO))
+    except Exception:
+        return ZENROWS_CONCURRENCY_PADRAO
+
+
+def fetch_many_via_zenrows(links, api_key: str, max_workers: int = ZENROWS_CONCURRENCY_PADRAO, **fetch_kwargs):
+    """Fetch many pages via ZenRows with at most max_workers requests in flight.
+
+    Yields (link, html_text) in completion order so callers can parse each page as
+    soon as it arrives. Links are submitted lazily; once should_stop() fires nothing
+    new is submitted and queued fetches are cancelled.
+    """
+    fetch_kwargs.setdefault('tipo', 'detalhe')
+    pendentes_links = iter(links)
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='zenrows')
+    em_voo = {}
+
+    def _preencher():
+        while len(em_voo) < max_workers:
+            try:
+                link = next(pendentes_links)
+            except StopIteration:
+                return
+            em_voo[executor.submit(fetch_via_zenrows, link, api_key, **fetch_kwargs)] = link
+
+    try:
+        _preencher()
+        while em_voo:
+            if should_stop():
+                break
+            prontos, _ = wait(list(em_voo), timeout=1.0, return_when=FIRST_COMPLETED)
+            for fut in prontos:
+                link = em_voo.pop(fut)
+                try:
+                    html_text = fut.result()
+                except Exception as e:
+                    logar(f"[ZenRows] fetch failed for {link}: {e}")
+                    html_text = ''
+                yield link, html_text
+            if not should_stop():
+                _preencher()
+    finally:
+        for fut in em_voo:
+            fut.cancel()
+        executor.shutdown(wait=False)
 
 
 def extract_olx_details_from_html(html_text: str, forbidden_words: list) -> dict:
@@ -532,16 +3193,334 @@ def extract_details_seminovos_from_html(html_text: str, forbidden_words: list) -
             m = re.search(r'<p[^>]{0,120}>([^<]{50,400})</p>', html_text, flags=re.I)
             if m:
                 details['descricao'] = re.sub(r"\s+", " ", m.group(1)).strip()
-        # forbidden words
-        desc_norm = normalize_text(details.get('descricao',''))
+        # forbidden words
+        desc_norm = normalize_text(details.get('descricao',''))
+        for w in forbidden_words or []:
+            if normalize_text(w.strip()) and normalize_text(w.strip()) in desc_norm:
+                details['palavrasProibidas'].append(w.strip())
+    except Exception as e:
+        log_seminovos(f"[SEMINOVOS][HTML] erro ao extrair detalhes: {e}")
+    return details
+
+
+def extract_localiza_details_from_html(html_text: str, forbidden_words: list) -> dict:
+    """Localiza detail pages are server-rendered with a schema.org Car JSON-LD block."""
+    details = _detalhes_seminovos_vazios()
+    try:
+        body = html_text or ''
+        for bloco in re.findall(r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', body, flags=re.I | re.S):
+            try:
+                dados = json.loads(bloco.strip())
+            except Exception:
+                continue
+            candidatos = dados if isinstance(dados, list) else dados.get('@graph', [dados]) if isinstance(dados, dict) else []
+            carro = next((c for c in candidatos if isinstance(c, dict) and c.get('@type') in ('Car', 'Vehicle', 'Product')), None)
+            if carro:
+                details.update({k: str(v).strip() for k, v in _detalhes_seminovos_json_ld(carro).items() if v and k != 'palavrasProibidas'})
+                break
+        if not details['quilometragem']:
+            m = re.search(r'([\d\.]+)\s*km', body, flags=re.I)
+            if m:
+                details['quilometragem'] = m.group(1).replace('.', '') + ' km'
+        if not details['descricao']:
+            m = re.search(r'<meta[^>]+name=["\']description["\'][^>]+content=["\']([^"\']+)["\']', body, flags=re.I)
+            if m:
+                details['descricao'] = re.sub(r"\s+", " ", m.group(1)).strip()
+        desc_norm = normalize_text(details.get('descricao', ''))
         for w in forbidden_words or []:
             if normalize_text(w.strip()) and normalize_text(w.strip()) in desc_norm:
                 details['palavrasProibidas'].append(w.strip())
     except Exception as e:
-        log_seminovos(f"[SEMINOVOS][HTML] erro ao extrair detalhes: {e}")
+        logar(f"[LOCALIZA][HTML] erro ao extrair detalhes: {e}")
+    return details
+
+
+# ============================================================================
+# DETALHES VIA HTTP COM A SESSÃO DO NAVEGADOR
+# ============================================================================
+# The listing is still loaded in Selenium (cookies, consent, anti-bot), but detail
+# pages that are server-rendered are then fetched with plain HTTP carrying the
+# browser's cookies and user agent. Pages that fail validation go back to the
+# browser through AgendadorAbas.
+
+HTTP_WORKERS_PADRAO = 4
+HTTP_TIMEOUT = 20
+# Challenge/consent pages served instead of the listing detail
+HTTP_BLOQUEIO = re.compile(r'(cf-chl|challenge-platform|captcha|Just a moment|Access Denied|px-captcha)', re.I)
+# Fields whose presence shows the parser really found a detail page
+HTTP_CHAVES_DETALHE = ('quilometragem', 'cambio', 'ano', 'combustivel', 'descricao', 'portas', 'cor')
+HTTP_MIN_CAMPOS = 2
+
+
+def http_details(filtros) -> bool:
+    """Whether detail pages are fetched over HTTP first (filtros['http_details'])."""
+    return bool(filtros.get('http_details', True))
+
+
+def http_workers(filtros) -> int:
+    """Concurrent HTTP detail fetches (filtros['http_workers'])."""
+    try:
+        return max(1, int(filtros.get('http_workers') or HTTP_WORKERS_PADRAO))
+    except Exception:
+        return HTTP_WORKERS_PADRAO
+
+
+def sessao_do_driver(driver):
+    """SessaoHTTP carrying the driver's cookie jar, user agent and referer (None if unavailable)."""
+    try:
+        sessao = HTTP_CLIENTE.sessao()
+        try:
+            ua = driver.execute_script("return navigator.userAgent;")
+        except Exception:
+            ua = None
+        sessao.headers.update({
+            'User-Agent': ua or 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.5',
+        })
+        try:
+            sessao.headers['Referer'] = driver.current_url
+        except Exception:
+            pass
+        for cookie in driver.get_cookies():
+            sessao.definir_cookie(cookie['name'], cookie['value'],
+                                  cookie.get('domain') or '', cookie.get('path') or '/')
+        return sessao
+    except Exception as e:
+        logar(f"[HTTP] Nao foi possivel exportar a sessao do navegador: {e}")
+        return None
+
+
+def detalhes_http_validos(details) -> bool:
+    if not details:
+        return False
+    return sum(1 for k in HTTP_CHAVES_DETALHE if details.get(k)) >= HTTP_MIN_CAMPOS
+
+
+def _buscar_detalhe_http(sessao, link: str, parser, forbidden_words):
+    html_text = PAGE_CACHE.obter(link, 'http', 'detalhe')
+    if html_text:
+        details = parser(html_text, forbidden_words)
+        if detalhes_http_validos(details):
+            return details
+    resp = sessao.get(link, timeout=HTTP_TIMEOUT)
+    if resp.status != 200:
+        raise RuntimeError(f"HTTP {resp.status}")
+    html_text = resp.text
+    if HTTP_BLOQUEIO.search(html_text[:20000]):
+        raise RuntimeError("pagina de bloqueio")
+    details = parser(html_text, forbidden_words)
+    if not detalhes_http_validos(details):
+        raise RuntimeError("detalhes incompletos")
+    PAGE_CACHE.guardar(link, 'http', html_text, 'detalhe')
     return details
 
 
+def buscar_detalhes_http(sessao, links, parser, forbidden_words, portal: str, max_workers: int = HTTP_WORKERS_PADRAO):
+    """Fetch and parse detail pages over HTTP; yields (link, details or None) as each completes."""
+    links = list(links)
+    if not links:
+        return
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(links)))
+    futuros = {}
+    try:
+        futuros = {executor.submit(_buscar_detalhe_http, sessao, link, parser, forbidden_words): link for link in links}
+        for fut in as_completed(futuros):
+            link = futuros[fut]
+            try:
+                yield link, fut.result()
+            except Exception as e:
+                logar(f"[HTTP] {portal}: {link} -> {e}, usando navegador")
+                yield link, None
+            if should_stop():
+                break
+    finally:
+        # cancel_futures needs Python 3.9
+        for fut in futuros:
+            fut.cancel()
+        executor.shutdown(wait=False)
+
+
+def coletar_detalhes_hibrido(driver, links, portal: str, parser, forbidden_words, filtros,
+                             pronto_seletor: str = None, extrator_navegador=None):
+    """Yield (link, details) for every link: HTTP with the browser session first, browser tabs for the rest.
+
+    extrator_navegador(driver) reads the detail from a loaded tab; by default the
+    same HTML parser is run on page_source.
+    """
+    links = list(links)
+    pendentes = links
+    sessao = sessao_do_driver(driver) if http_details(filtros) else None
+    if sessao is not None and links:
+        pendentes = []
+        inicio = time.time()
+        for link, details in buscar_detalhes_http(sessao, links, parser, forbidden_words, portal, http_workers(filtros)):
+            if details:
+                yield link, details
+            else:
+                pendentes.append(link)
+        if should_stop():
+            return
+        logar(f"[HTTP] {portal}: {len(links) - len(pendentes)}/{len(links)} detalhes via HTTP em {time.time() - inicio:.1f}s, "
+              f"{len(pendentes)} pelo navegador")
+    if pendentes:
+        if extrator_navegador is None:
+            extrator_navegador = lambda d: parser(d.page_source, forbidden_words)
+        agendador = AgendadorAbas(driver, detail_tabs(filtros), portal, pronto_seletor)
+        yield from agendador.processar(pendentes, extrator_navegador)
+
+
+# Walks every OLX listing card in the page in a single execute_script round trip.
+# Mirrors the Selenium selector fallbacks: card discovery, name, image, price, details,
+# location, link and the recommendation-carousel check.
+OLX_CARDS_JS = r"""
+const texto = el => ((el && (el.innerText || el.textContent)) || '').trim();
+let anuncios = Array.from(document.querySelectorAll('section.olx-adcard'));
+if (!anuncios.length) {
+    anuncios = Array.from(document.querySelectorAll('li[data-lurker-listitemid], a[data-testid="ad-card"], .sc-1fcmfeb-2, div.sc-1fcmfeb-2'));
+}
+if (!anuncios.length) {
+    anuncios = Array.from(document.querySelectorAll('a[href^="https://www.olx.com.br/ans/"], a[href*="/anuncio/"]')).slice(0, 30);
+}
+const precoSeletores = [
+    'span[data-testid="ad-price"]', 'div[data-testid="ad-price"]', 'span[data-testid="listing-card-price"]',
+    '.olx-adcard__price', '.sc-1fcmfeb-4', '.ad-card__price', '.price'
+];
+const recomendacao = el => {
+    const pai = el.parentElement;
+    if (!pai) return false;
+    if (pai.closest('[data-component="Rec-Gallery"]')) return true;
+    if (pai.closest('[class*="Recommendation"]')) return true;
+    for (let a = pai; a; a = a.parentElement) {
+        for (const h2 of a.querySelectorAll('h2')) {
+            if ((h2.textContent || '').replace(/\s+/g, ' ').includes('Baseado na sua navegação')) return true;
+        }
+    }
+    return false;
+};
+return anuncios.map(card => {
+    const h2 = card.querySelector('h2');
+    const nome = h2 ? texto(h2) : texto(card).split('\n')[0].trim();
+    const img = card.querySelector('picture img') || card.querySelector('img');
+    let valor = '';
+    for (const sel of precoSeletores) {
+        const t = texto(card.querySelector(sel));
+        if (t) { valor = t; break; }
+    }
+    if (!valor) {
+        const linha = texto(card).split('\n').map(l => l.trim().replace(/\u00a0/g, ' ')).find(l => l && l.includes('R$'));
+        valor = linha || '';
+    }
+    const detalhes = Array.from(card.querySelectorAll('.olx-adcard__detail')).map(d => d.getAttribute('aria-label') || '');
+    const motorLabel = detalhes.find(l => l.toLowerCase().includes('motor'));
+    const ancora = card.href ? card : card.querySelector('a');
+    return {
+        nome: nome,
+        valor: valor,
+        km: detalhes.length ? detalhes[0] : '',
+        motor: motorLabel ? motorLabel.replace('Motor ', '').trim() : '',
+        local: texto(card.querySelector('.olx-adcard__location')),
+        imagem: img ? (img.src || img.getAttribute('data-src') || '') : '',
+        link: ancora ? (ancora.href || '') : '',
+        recomendacao: recomendacao(card)
+    };
+});
+"""
+
+
+def _card_olx_por_elemento(anuncio) -> dict:
+    """Per-element fallback of OLX_CARDS_JS (one WebDriver round trip per field)."""
+    # Attempt to extract name/value/image from ad container or anchor
+    nome = ""
+    try:
+        nome = anuncio.find_element(By.CSS_SELECTOR, 'h2').text.strip()
+    except:
+        try:
+            nome = anuncio.text.split('\n')[0].strip()
+        except:
+            nome = ''
+    imagem = ''
+    try:
+        img_el = anuncio.find_element(By.CSS_SELECTOR, 'picture img')
+        imagem = img_el.get_attribute('src')
+    except:
+        try:
+            img_el = anuncio.find_element(By.CSS_SELECTOR, 'img')
+            imagem = img_el.get_attribute('src')
+        except:
+            imagem = ''
+    valor = ''
+    price_selectors = [
+        'span[data-testid="ad-price"]',
+        'div[data-testid="ad-price"]',
+        'span[data-testid="listing-card-price"]',
+        '.olx-adcard__price',
+        '.sc-1fcmfeb-4',
+        '.ad-card__price',
+        '.price',
+    ]
+    for selector in price_selectors:
+        try:
+            price_el = anuncio.find_element(By.CSS_SELECTOR, selector)
+            text = price_el.text.strip()
+            if text:
+                valor = text
+                break
+        except Exception:
+            continue
+    if not valor:
+        try:
+            raw_text = anuncio.text
+            if raw_text:
+                for line in [line.strip() for line in raw_text.splitlines() if line.strip()]:
+                    cleaned = line.replace('\u00a0', ' ')
+                    if 'R$' in cleaned:
+                        valor = cleaned
+                        break
+        except Exception:
+            valor = ''
+    km = ''
+    motor = ''
+    try:
+        detalhes = anuncio.find_elements(By.CSS_SELECTOR, '.olx-adcard__detail')
+        if detalhes:
+            km = detalhes[0].get_attribute('aria-label') or ''
+            # Try to extract motor from other detail elements
+            for detalhe in detalhes:
+                aria_label = detalhe.get_attribute('aria-label') or ''
+                if 'motor' in aria_label.lower():
+                    motor = aria_label.replace('Motor ', '').strip()
+                    break
+    except:
+        km = ''
+    local = ''
+    try:
+        local = anuncio.find_element(By.CSS_SELECTOR, '.olx-adcard__location').text.strip()
+    except:
+        local = ''
+    link = ''
+    try:
+        link = anuncio.get_attribute('href') or anuncio.find_element(By.CSS_SELECTOR, 'a').get_attribute('href')
+    except:
+        link = ''
+
+    return {"nome": nome, "valor": valor, "km": km, "motor": motor, "local": local, "imagem": imagem, "link": link}
+
+
+def extrair_cards_olx(driver):
+    """Extract every OLX card of the current page with one execute_script call.
+
+    Returns a list of dicts (nome, valor, km, motor, local, imagem, link, recomendacao)
+    or None if the script failed, so the caller can fall back to per-element reads.
+    """
+    try:
+        cards = driver.execute_script(OLX_CARDS_JS)
+        return cards if isinstance(cards, list) else None
+    except Exception as e:
+        logar(f"[OLX] Extracao em lote falhou, usando leitura por elemento: {e}")
+        return None
+
+
 def scraping_olx(filtros):
     try:
         # If ZenRows key provided, use it to fetch listing and detail pages (avoid Selenium)
@@ -589,9 +3568,11 @@ def scraping_olx(filtros):
                 url += "?" + "&".join(filtros_url)
 
             collected_links = []
-            for page in range(1, 6):
+            for page in range(1, limite_paginas(5) + 1):
+                if page > 1:
+                    pausa_entre_paginas()
                 page_url = url + ("&" if "?" in url else "?") + f"page={page}"
-                html_text = fetch_via_zenrows(page_url, api_key)
+                html_text = fetch_via_zenrows(page_url, api_key, portal='olx')
                 if not html_text:
                     continue
                 # try to find OLX ad links
@@ -603,11 +3584,8 @@ def scraping_olx(filtros):
                     break
 
             forbidden = filtros.get('forbiddenWords') or []
-            for link in collected_links:
-                if should_stop():
-                    break
+            for link, d_html in fetch_many_via_zenrows(collected_links, api_key, zenrows_concurrency(filtros), portal='olx'):
                 try:
-                    d_html = fetch_via_zenrows(link, api_key)
                     if not d_html:
                         continue
                     details = extract_olx_details_from_html(d_html, forbidden)
@@ -650,17 +3628,7 @@ def scraping_olx(filtros):
                     logar(f"[OLX][ZenRows] Erro processando link {link}: {e}")
             return
 
-        options = Options()
-        options.headless = True
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-
-        global current_driver
-        driver = webdriver.Firefox(service=Service(), options=options)
-        try:
-            current_driver = driver
-        except Exception:
-            pass
+        driver = obter_driver('OLX')
 
         forbidden_words = filtros.get("forbiddenWords", []) or []
         capture_details = filtros.get("capture_details", True)
@@ -710,7 +3678,7 @@ def scraping_olx(filtros):
 
         logar(f"[OLX] Acessando: {url}")
         driver.get(url)
-        time.sleep(2)
+        esperar_rede_ociosa(driver, 'OLX', 'listagem')
 
         # Aplicar filtros adicionais que não s��o passados via URL na OLX
         try:
@@ -733,7 +3701,7 @@ def scraping_olx(filtros):
                                             if portas_valor.lower() in label_text:
                                                 if not checkbox.is_selected():
                                                     driver.execute_script("arguments[0].click();", checkbox)
-                                                    time.sleep(0.5)
+                                                    esperar_condicao(checkbox.is_selected, 'OLX', 'filtro_checkbox', timeout=2)
                                                 logar(f"[OLX] Filtro Portas aplicado: {portas_valor}")
                                                 break
                                         except Exception:
@@ -761,7 +3729,7 @@ def scraping_olx(filtros):
                                         if combustivel_valor in label_text:
                                             if not checkbox.is_selected():
                                                 driver.execute_script("arguments[0].click();", checkbox)
-                                                time.sleep(0.5)
+                                                esperar_condicao(checkbox.is_selected, 'OLX', 'filtro_checkbox', timeout=2)
                                             logar(f"[OLX] Filtro Combustível aplicado: {combustivel_valor}")
                                             break
                                     except Exception:
@@ -789,7 +3757,7 @@ def scraping_olx(filtros):
                                         if transmissao_valor in label_text:
                                             if not checkbox.is_selected():
                                                 driver.execute_script("arguments[0].click();", checkbox)
-                                                time.sleep(0.5)
+                                                esperar_condicao(checkbox.is_selected, 'OLX', 'filtro_checkbox', timeout=2)
                                             logar(f"[OLX] Filtro Transmissão aplicado: {transmissao_valor}")
                                             break
                                     except Exception:
@@ -817,7 +3785,7 @@ def scraping_olx(filtros):
                                         if cor_valor in label_text:
                                             if not checkbox.is_selected():
                                                 driver.execute_script("arguments[0].click();", checkbox)
-                                                time.sleep(0.5)
+                                                esperar_condicao(checkbox.is_selected, 'OLX', 'filtro_checkbox', timeout=2)
                                             logar(f"[OLX] Filtro Cor aplicado: {cor_valor}")
                                             break
                                     except Exception:
@@ -828,12 +3796,13 @@ def scraping_olx(filtros):
                 except Exception as e:
                     logar(f"[OLX] Aviso: Nao foi possivel aplicar filtro de cor: {e}")
 
-            time.sleep(1)
+            esperar_rede_ociosa(driver, 'OLX', 'aplicar_filtros')
         except Exception as e:
             logar(f"[OLX] Aviso: Erro ao aplicar filtros dinamicos: {e}")
 
         pagina = 1
-        while not should_stop() and pagina <= 5:  # Limitar a 5 páginas para não demorar muito
+        max_paginas = limite_paginas(5)  # Limitar a 5 páginas para não demorar muito
+        while not should_stop() and pagina <= max_paginas:
             logar(f"[OLX] Pagina {pagina}")
             try:
                 # wait for any ad-like element to appear
@@ -841,58 +3810,74 @@ def scraping_olx(filtros):
             except:
                 logar("[OLX] Nenhum anuncio encontrado ou pagina nao carregou (fallback check). Tentando seletores alternativos.")
 
-            # Try multiple possible selectors to find ads (fallbacks for markup changes)
-            anuncios = []
-            try:
-                anuncios = driver.find_elements(By.CSS_SELECTOR, 'section.olx-adcard')
-            except:
+            cards = extrair_cards_olx(driver)
+            if cards is not None:
+                total_cards = len(cards)
+                cards = [c for c in cards if not c.get('recomendacao')]
+                logar(f"[OLX] {len(cards)} anuncios extraidos em lote ({total_cards - len(cards)} recomendacoes ignoradas)")
+            else:
+                # Try multiple possible selectors to find ads (fallbacks for markup changes)
                 anuncios = []
-
-            if not anuncios:
                 try:
-                    anuncios = driver.find_elements(By.CSS_SELECTOR, 'li[data-lurker-listitemid], a[data-testid="ad-card"], .sc-1fcmfeb-2, div.sc-1fcmfeb-2')
+                    anuncios = driver.find_elements(By.CSS_SELECTOR, 'section.olx-adcard')
                 except:
                     anuncios = []
 
-            # Final fallback: any anchor inside main list that looks like an ad
-            if not anuncios:
-                try:
-                    anchors = driver.find_elements(By.CSS_SELECTOR, 'a[href^="https://www.olx.com.br/ans/"], a[href*="/anuncio/"]')
-                    anuncios = anchors[:30]
-                except:
-                    anuncios = []
+                if not anuncios:
+                    try:
+                        anuncios = driver.find_elements(By.CSS_SELECTOR, 'li[data-lurker-listitemid], a[data-testid="ad-card"], .sc-1fcmfeb-2, div.sc-1fcmfeb-2')
+                    except:
+                        anuncios = []
 
-            # Filter out recommendation/carousel items (e.g., 'Baseado na sua navegação' or Rec-Gallery carousels)
-            def is_recommendation(el):
-                try:
-                    # ancestor with explicit Rec-Gallery data-component
-                    el.find_element(By.XPATH, "ancestor::*[@data-component='Rec-Gallery']")
-                    return True
-                except Exception:
-                    pass
-                try:
-                    # ancestor containing a 'Baseado na sua navegação' header
-                    el.find_element(By.XPATH, "ancestor::*[descendant::h2[contains(normalize-space(.),'Baseado na sua navegação')]]")
-                    return True
-                except Exception:
-                    pass
-                try:
-                    # ancestor with classes that usually indicate recommendation/gallery blocks
-                    el.find_element(By.XPATH, "ancestor::*[contains(@class,'RecommendationGallery') or contains(@class,'Recommendation')]")
-                    return True
-                except Exception:
-                    pass
-                return False
+                # Final fallback: any anchor inside main list that looks like an ad
+                if not anuncios:
+                    try:
+                        anchors = driver.find_elements(By.CSS_SELECTOR, 'a[href^="https://www.olx.com.br/ans/"], a[href*="/anuncio/"]')
+                        anuncios = anchors[:30]
+                    except:
+                        anuncios = []
 
-            filtered = []
-            for a in anuncios:
-                try:
-                    if is_recommendation(a):
+                # Filter out recommendation/carousel items (e.g., 'Baseado na sua navegação' or Rec-Gallery carousels)
+                def is_recommendation(el):
+                    try:
+                        # ancestor with explicit Rec-Gallery data-component
+                        el.find_element(By.XPATH, "ancestor::*[@data-component='Rec-Gallery']")
+                        return True
+                    except Exception:
+                        pass
+                    try:
+                        # ancestor containing a 'Baseado na sua navegação' header
+                        el.find_element(By.XPATH, "ancestor::*[descendant::h2[contains(normalize-space(.),'Baseado na sua navegação')]]")
+                        return True
+                    except Exception:
+                        pass
+                    try:
+                        # ancestor with classes that usually indicate recommendation/gallery blocks
+                        el.find_element(By.XPATH, "ancestor::*[contains(@class,'RecommendationGallery') or contains(@class,'Recommendation')]")
+                        return True
+                    except Exception:
+                        pass
+                    return False
+
+                filtered = []
+                for a in anuncios:
+                    try:
+                        if is_recommendation(a):
+                            continue
+                    except Exception:
+                        pass
+                    filtered.append(a)
+                anuncios = filtered
+
+                cards = []
+                for anuncio in anuncios:
+                    if should_stop():
+                        break
+                    try:
+                        cards.append(_card_olx_por_elemento(anuncio))
+                    except Exception:
                         continue
-                except Exception:
-                    pass
-                filtered.append(a)
-            anuncios = filtered
+            anuncios = cards
 
             if not anuncios:
                 logar("[OLX] Nenhum anuncio detectado com seletores conhecidos. Salvando snapshot para analise.")
@@ -908,83 +3893,17 @@ def scraping_olx(filtros):
 
             # First pass: collect car data from list view
             cars_to_process = []
-            for anuncio in anuncios:
+            for card in cards:
                 if should_stop():
                     break
                 try:
-                    # Attempt to extract name/value/image from ad container or anchor
-                    nome = ""
-                    try:
-                        nome = anuncio.find_element(By.CSS_SELECTOR, 'h2').text.strip()
-                    except:
-                        try:
-                            nome = anuncio.text.split('\n')[0].strip()
-                        except:
-                            nome = ''
-                    imagem = ''
-                    try:
-                        img_el = anuncio.find_element(By.CSS_SELECTOR, 'picture img')
-                        imagem = img_el.get_attribute('src')
-                    except:
-                        try:
-                            img_el = anuncio.find_element(By.CSS_SELECTOR, 'img')
-                            imagem = img_el.get_attribute('src')
-                        except:
-                            imagem = ''
-                    valor = ''
-                    price_selectors = [
-                        'span[data-testid="ad-price"]',
-                        'div[data-testid="ad-price"]',
-                        'span[data-testid="listing-card-price"]',
-                        '.olx-adcard__price',
-                        '.sc-1fcmfeb-4',
-                        '.ad-card__price',
-                        '.price',
-                    ]
-                    for selector in price_selectors:
-                        try:
-                            price_el = anuncio.find_element(By.CSS_SELECTOR, selector)
-                            text = price_el.text.strip()
-                            if text:
-                                valor = text
-                                break
-                        except Exception:
-                            continue
-                    if not valor:
-                        try:
-                            raw_text = anuncio.text
-                            if raw_text:
-                                for line in [line.strip() for line in raw_text.splitlines() if line.strip()]:
-                                    cleaned = line.replace('\u00a0', ' ')
-                                    if 'R$' in cleaned:
-                                        valor = cleaned
-                                        break
-                        except Exception:
-                            valor = ''
-                    km = ''
-                    motor = ''
-                    try:
-                        detalhes = anuncio.find_elements(By.CSS_SELECTOR, '.olx-adcard__detail')
-                        if detalhes:
-                            km = detalhes[0].get_attribute('aria-label') or ''
-                            # Try to extract motor from other detail elements
-                            for detalhe in detalhes:
-                                aria_label = detalhe.get_attribute('aria-label') or ''
-                                if 'motor' in aria_label.lower():
-                                    motor = aria_label.replace('Motor ', '').strip()
-                                    break
-                    except:
-                        km = ''
-                    local = ''
-                    try:
-                        local = anuncio.find_element(By.CSS_SELECTOR, '.olx-adcard__location').text.strip()
-                    except:
-                        local = ''
-                    link = ''
-                    try:
-                        link = anuncio.get_attribute('href') or anuncio.find_element(By.CSS_SELECTOR, 'a').get_attribute('href')
-                    except:
-                        link = ''
+                    nome = card.get('nome') or ''
+                    valor = card.get('valor') or ''
+                    km = card.get('km') or ''
+                    motor = card.get('motor') or ''
+                    local = card.get('local') or ''
+                    imagem = card.get('imagem') or ''
+                    link = card.get('link') or ''
 
                     # Aplicar filtros adicionais locais (modelo, km, carroceria) usando normalização
                     modelo = normalize_text(filtros.get('modelo') or '')
@@ -1027,26 +3946,56 @@ def scraping_olx(filtros):
                     continue
 
             # Second pass: extract detailed information for each car (avoiding stale element references)
+            def _aplicar_detalhes_olx(car_data, details):
+                car_data.update({
+                    "Ano": details["ano"],
+                    "Motor": details.get("motor", "") ,
+                    "Potência do Motor": details["potenciaMotor"],
+                    "Portas": details["portas"],
+                    "Direção": details["direcao"],
+                    "Câmbio": details["cambio"],
+                    "Tipo de Direção": details["tipoDirecao"],
+                    "Combustível": details["combustivel"],
+                    "Quilometragem": details["quilometragem"],
+                    "Descrição": details["descricao"],
+                    "Palavras Proibidas": details["palavrasProibidas"]
+                })
+
+            if capture_details and (detail_tabs(filtros) > 1 or http_details(filtros)) and cars_to_process:
+                # Hybrid mode: detail pages over HTTP with the browser session, then a pool of
+                # K tabs for the ones that failed, each harvested as soon as it is ready
+                por_link = {}
+                for car_data, link in cars_to_process:
+                    por_link.setdefault(link, []).append(car_data)
+                reaproveitar_detalhes('OLX', por_link, forbidden_words, _aplicar_detalhes_olx)
+                try:
+                    for link, details in coletar_detalhes_hibrido(driver, list(por_link), 'OLX', extract_olx_details_from_html,
+                                                                  forbidden_words, filtros, ', '.join(OLX_DETALHE_SELETORES),
+                                                                  lambda d: _ler_detalhes_olx(d, forbidden_words)):
+                        for car_data in por_link.pop(link, []):
+                            if details:
+                                SEEN_LISTINGS.registrar('OLX', car_data, details, forbidden_words)
+                                _aplicar_detalhes_olx(car_data, details)
+                            add_dado(car_data)
+                except Exception as e:
+                    logar(f"[OLX] Erro no modo multi-abas, seguindo sem detalhes: {e}")
+                if not should_stop():
+                    for restantes in por_link.values():
+                        for car_data in restantes:
+                            add_dado(car_data)
+                cars_to_process = []
+
             for car_data, link in cars_to_process:
                 if should_stop():
                     break
                 try:
                     if capture_details:
                         try:
-                            details = extract_olx_details(driver, link, forbidden_words, listing_page_url)
-                            car_data.update({
-                                "Ano": details["ano"],
-                                "Motor": details.get("motor", "") ,
-                                "Potência do Motor": details["potenciaMotor"],
-                                "Portas": details["portas"],
-                                "Direção": details["direcao"],
-                                "Câmbio": details["cambio"],
-                                "Tipo de Direção": details["tipoDirecao"],
-                                "Combustível": details["combustivel"],
-                                "Quilometragem": details["quilometragem"],
-                                "Descrição": details["descricao"],
-                                "Palavras Proibidas": details["palavrasProibidas"]
-                            })
+                            details = SEEN_LISTINGS.detalhes('OLX', car_data, forbidden_words)
+                            if details is None:
+                                details = extract_olx_details(driver, link, forbidden_words, listing_page_url)
+                                SEEN_LISTINGS.registrar('OLX', car_data, details, forbidden_words)
+                            _aplicar_detalhes_olx(car_data, details)
                         except Exception as e:
                             logar(f"[OLX] Erro ao capturar detalhes: {e}")
 
@@ -1113,23 +4062,34 @@ def scraping_olx(filtros):
                     except Exception:
                         pass
 
-                if advanced and next_link:
+                if advanced and next_link and pagina < max_paginas:
+                    pausa_entre_paginas()
                     driver.get(next_link)
                     pagina += 1
-                    time.sleep(2)
+                    esperar_rede_ociosa(driver, 'OLX', 'paginacao')
                 else:
                     break
             except Exception:
                 break
 
-        driver.quit()
+        liberar_driver(driver)
 
     except Exception as e:
         logar(f"[ERRO] OLX - Erro: {str(e)}")
 
-def extract_olx_details(driver, url: str, forbidden_words: list, current_listing_url: str = None) -> dict:
-    """Extract detailed information from OLX car detail page"""
-    details = {
+# Detail-page readiness selectors for OLX (any of them means the ad content is in the DOM)
+OLX_DETALHE_SELETORES = [
+    "[data-section='description']",
+    "[data-testid='ad-price']",
+    "section[data-testid='ad']",
+    "main",
+    "div.sc-1fcmfeb-2",
+    "[id*='ad']",
+]
+
+
+def _detalhes_olx_vazios() -> dict:
+    return {
         "ano": "",
         "potenciaMotor": "",
         "portas": "",
@@ -1142,241 +4102,246 @@ def extract_olx_details(driver, url: str, forbidden_words: list, current_listing
         "palavrasProibidas": []
     }
 
-    # keep track of original window handle so we can return to it without reloading
-    original_handle = driver.current_window_handle
-    used_new_tab = False
 
+def _ler_detalhes_olx(driver, forbidden_words: list) -> dict:
+    """Scrape the OLX detail page loaded in the driver's current window."""
+    details = _detalhes_olx_vazios()
+    # Extract year from possible places
     try:
-        # Open detail in a new tab to avoid losing listing context
-        existing_handles = set(driver.window_handles)
-        try:
-            driver.execute_script("window.open(arguments[0], '_blank');", url)
-            WebDriverWait(driver, 8).until(lambda d: len(d.window_handles) > len(existing_handles))
-            new_handles = [h for h in driver.window_handles if h not in existing_handles]
-            if new_handles:
-                driver.switch_to.window(new_handles[0])
-                used_new_tab = True
-            else:
-                driver.get(url)
-                used_new_tab = False
-        except Exception:
-            # Fallback to navigating in same tab
-            driver.get(url)
-            used_new_tab = False
-
-        # Wait for common detail selectors (try several fallbacks)
-        detail_wait_selectors = [
-            "[data-section='description']",
-            "[data-testid='ad-price']",
-            "section[data-testid='ad']",
-            "main",
-            "div.sc-1fcmfeb-2",
-            "[id*='ad']",
-        ]
-        waited = False
-        for sel in detail_wait_selectors:
-            try:
-                WebDriverWait(driver, 6).until(EC.presence_of_element_located((By.CSS_SELECTOR, sel)))
-                waited = True
-                break
-            except Exception:
-                continue
-        if not waited:
-            # final short sleep as last resort
-            time.sleep(1.5)
+        page_text = driver.find_element(By.TAG_NAME, 'body').text
+        ymatch = re.search(r"\b(19|20)\d{2}\b", page_text)
+        if ymatch:
+            details["ano"] = ymatch.group(0)
+    except Exception:
+        pass
 
-        # Extract year from possible places
+    # Try structured detail extraction first
+    try:
+        # Many OLX pages render attribute pairs with an 'overline' label and a sibling value
         try:
-            page_text = driver.find_element(By.TAG_NAME, 'body').text
-            ymatch = re.search(r"\b(19|20)\d{2}\b", page_text)
-            if ymatch:
-                details["ano"] = ymatch.group(0)
+            label_nodes = driver.find_elements(By.CSS_SELECTOR, "[data-variant='overline']")
         except Exception:
-            pass
+            label_nodes = []
 
-        # Try structured detail extraction first
-        try:
-            # Many OLX pages render attribute pairs with an 'overline' label and a sibling value
+        for node in label_nodes:
             try:
-                label_nodes = driver.find_elements(By.CSS_SELECTOR, "[data-variant='overline']")
-            except Exception:
-                label_nodes = []
+                label_text = (node.text or '').lower().strip()
 
-            for node in label_nodes:
+                # immediate parent should contain the value alongside the label
+                parent = None
                 try:
-                    label_text = (node.text or '').lower().strip()
-
-                    # immediate parent should contain the value alongside the label
+                    parent = node.find_element(By.XPATH, '..')
+                except Exception:
                     parent = None
+
+                value_text = ''
+                if parent:
+                    # 1) prefer anchor texts in the same parent (common for OLX values)
                     try:
-                        parent = node.find_element(By.XPATH, '..')
+                        a = parent.find_element(By.TAG_NAME, 'a')
+                        if a and (a.text or '').strip() and (a.text or '').strip() != node.text:
+                            value_text = (a.text or '').strip()
                     except Exception:
-                        parent = None
+                        pass
 
-                    value_text = ''
-                    if parent:
-                        # 1) prefer anchor texts in the same parent (common for OLX values)
+                    # 2) prefer span elements that are not the label (exclude data-variant overline)
+                    if not value_text:
                         try:
-                            a = parent.find_element(By.TAG_NAME, 'a')
-                            if a and (a.text or '').strip() and (a.text or '').strip() != node.text:
-                                value_text = (a.text or '').strip()
+                            spans = parent.find_elements(By.TAG_NAME, 'span')
+                            # choose the span with the most text that is not the label
+                            best = ''
+                            for sp in spans:
+                                try:
+                                    if sp.get_attribute('data-variant') == 'overline':
+                                        continue
+                                    txt = (sp.text or '').strip()
+                                    if txt and txt != node.text and len(txt) > len(best):
+                                        best = txt
+                                except Exception:
+                                    continue
+                            if best:
+                                value_text = best
                         except Exception:
                             pass
 
-                        # 2) prefer span elements that are not the label (exclude data-variant overline)
-                        if not value_text:
-                            try:
-                                spans = parent.find_elements(By.TAG_NAME, 'span')
-                                # choose the span with the most text that is not the label
-                                best = ''
-                                for sp in spans:
-                                    try:
-                                        if sp.get_attribute('data-variant') == 'overline':
-                                            continue
-                                        txt = (sp.text or '').strip()
-                                        if txt and txt != node.text and len(txt) > len(best):
-                                            best = txt
-                                    except Exception:
-                                        continue
-                                if best:
-                                    value_text = best
-                            except Exception:
-                                pass
-
-                        # 3) fallback to any text inside parent excluding the label text (trim and dedupe)
-                        if not value_text:
-                            try:
-                                full = parent.text or ''
-                                label_raw = (node.text or '').strip()
-                                # remove the first occurrence of the label to avoid collisions
-                                full_minus_label = full.replace(label_raw, '', 1).strip()
-                                # if the remaining text is short and looks like a boolean ('sim'/'não'), keep it
-                                value_text = full_minus_label
-                            except Exception:
-                                value_text = ''
-
-                    # 4) as a last resort, check the immediate following sibling element
+                    # 3) fallback to any text inside parent excluding the label text (trim and dedupe)
                     if not value_text:
                         try:
-                            sib = node.find_element(By.XPATH, 'following-sibling::*')
-                            v = (sib.text or '').strip()
-                            if v and v != node.text:
-                                value_text = v
+                            full = parent.text or ''
+                            label_raw = (node.text or '').strip()
+                            # remove the first occurrence of the label to avoid collisions
+                            full_minus_label = full.replace(label_raw, '', 1).strip()
+                            # if the remaining text is short and looks like a boolean ('sim'/'não'), keep it
+                            value_text = full_minus_label
                         except Exception:
                             value_text = ''
 
-                    if not label_text:
-                        continue
+                # 4) as a last resort, check the immediate following sibling element
+                if not value_text:
+                    try:
+                        sib = node.find_element(By.XPATH, 'following-sibling::*')
+                        v = (sib.text or '').strip()
+                        if v and v != node.text:
+                            value_text = v
+                    except Exception:
+                        value_text = ''
+
+                if not label_text:
+                    continue
+
+                # Normalize value_text
+                value_text = (value_text or '').strip()
 
-                    # Normalize value_text
-                    value_text = (value_text or '').strip()
-
-                    # Map known labels (use word boundaries to avoid 'porta copos')
-                    # PORTAS: only store when a numeric value is found
-                    if re.search(r"\bportas?\b", label_text) and not re.search(r"porta copos|porta-copos|copos", label_text):
-                        m = re.search(r"(\d+)", value_text)
-                        if m:
-                            details['portas'] = m.group(1)
-                        # else: skip storing non-numeric answers like 'Sim' or 'Não'
-
-                    # ANO
-                    elif re.search(r"\b(ano|ano de)\b", label_text):
-                        y = re.search(r"\b(19|20)\d{2}\b", value_text)
-                        details['ano'] = y.group(0) if y else value_text
-
-                    # QUILOMETRAGEM
-                    elif re.search(r"\bquil[oô]m[eê]tr|quilometr", label_text):
-                        m = re.search(r"([\d\.]+)\s*km", value_text.replace('\u00a0',' '), flags=re.I)
-                        if m:
-                            details['quilometragem'] = m.group(0).strip()
+                # Map known labels (use word boundaries to avoid 'porta copos')
+                # PORTAS: only store when a numeric value is found
+                if re.search(r"\bportas?\b", label_text) and not re.search(r"porta copos|porta-copos|copos", label_text):
+                    m = re.search(r"(\d+)", value_text)
+                    if m:
+                        details['portas'] = m.group(1)
+                    # else: skip storing non-numeric answers like 'Sim' or 'Não'
+
+                # ANO
+                elif re.search(r"\b(ano|ano de)\b", label_text):
+                    y = re.search(r"\b(19|20)\d{2}\b", value_text)
+                    details['ano'] = y.group(0) if y else value_text
+
+                # QUILOMETRAGEM
+                elif re.search(r"\bquil[oô]m[eê]tr|quilometr", label_text):
+                    m = re.search(r"([\d\.]+)\s*km", value_text.replace('\u00a0',' '), flags=re.I)
+                    if m:
+                        details['quilometragem'] = m.group(0).strip()
+                    else:
+                        # sometimes OLX shows plain numbers; accept them and normalize later
+                        digits = re.search(r"([\d\.]+)", value_text)
+                        details['quilometragem'] = (digits.group(1) + ' km') if digits else value_text
+
+                # POTENCIA / MOTOR: be careful - OLX sometimes uses 'Potência do motor' to show displacement
+                elif 'potência do motor' in label_text or 'potencia do motor' in label_text or re.search(r"\bpot[eê]ncia\b", label_text):
+                    vt = value_text
+                    # if contains hp or cv -> it's horsepower
+                    if re.search(r"\b(hp|cv)\b", vt, flags=re.I):
+                        details['potenciaMotor'] = vt
+                    else:
+                        # numeric single value like '1.3' or '1,3' is likely displacement - store to motor and also keep potenciaMotor
+                        mdisp = re.search(r"^(\d+[\.,]?\d*)$", vt)
+                        if mdisp:
+                            disp = mdisp.group(1).replace(',', '.')
+                            details['motor'] = disp
+                            details['potenciaMotor'] = disp
                         else:
-                            # sometimes OLX shows plain numbers; accept them and normalize later
-                            digits = re.search(r"([\d\.]+)", value_text)
-                            details['quilometragem'] = (digits.group(1) + ' km') if digits else value_text
-
-                    # POTENCIA / MOTOR: be careful - OLX sometimes uses 'Potência do motor' to show displacement
-                    elif 'potência do motor' in label_text or 'potencia do motor' in label_text or re.search(r"\bpot[eê]ncia\b", label_text):
-                        vt = value_text
-                        # if contains hp or cv -> it's horsepower
-                        if re.search(r"\b(hp|cv)\b", vt, flags=re.I):
+                            # ambiguous string - keep raw under potenciaMotor
                             details['potenciaMotor'] = vt
-                        else:
-                            # numeric single value like '1.3' or '1,3' is likely displacement - store to motor and also keep potenciaMotor
-                            mdisp = re.search(r"^(\d+[\.,]?\d*)$", vt)
-                            if mdisp:
-                                disp = mdisp.group(1).replace(',', '.')
-                                details['motor'] = disp
-                                details['potenciaMotor'] = disp
-                            else:
-                                # ambiguous string - keep raw under potenciaMotor
-                                details['potenciaMotor'] = vt
 
-                    # DIREÇÃO / TIPO DE DIREÇÃO
-                    elif re.search(r"\bdirec(?:ção|ao|cao|ao)\b", label_text) or 'tipo de direção' in label_text or 'tipo de direcao' in label_text:
-                        details['direcao'] = value_text
-                        details['tipoDirecao'] = value_text
+                # DIREÇÃO / TIPO DE DIREÇÃO
+                elif re.search(r"\bdirec(?:ção|ao|cao|ao)\b", label_text) or 'tipo de direção' in label_text or 'tipo de direcao' in label_text:
+                    details['direcao'] = value_text
+                    details['tipoDirecao'] = value_text
 
-                    # CÂMBIO / TRANSMISSÃO
-                    elif re.search(r"\bc[âa]mbi?o\b", label_text) or re.search(r"\btransmiss(?:ão|ao)\b", label_text):
-                        details['cambio'] = value_text
+                # CÂMBIO / TRANSMISSÃO
+                elif re.search(r"\bc[âa]mbi?o\b", label_text) or re.search(r"\btransmiss(?:ão|ao)\b", label_text):
+                    details['cambio'] = value_text
 
-                    # COMBUSTÍVEL
-                    elif re.search(r"\bcombust[ií]vel\b", label_text) or 'combustivel' in label_text:
-                        details['combustivel'] = value_text
+                # COMBUSTÍVEL
+                elif re.search(r"\bcombust[ií]vel\b", label_text) or 'combustivel' in label_text:
+                    details['combustivel'] = value_text
 
-                except Exception:
-                    continue
+            except Exception:
+                continue
 
-            # If some fields still missing, fallback to body regex but use strict word boundaries
-            body_text = driver.find_element(By.TAG_NAME, 'body').text
+        # If some fields still missing, fallback to body regex but use strict word boundaries
+        body_text = driver.find_element(By.TAG_NAME, 'body').text
 
-            if not details['portas']:
-                m = re.search(r"\bportas?\b[:\s\n]*([\d]+)", body_text, flags=re.I)
-                if m:
-                    details['portas'] = m.group(1)
+        if not details['portas']:
+            m = re.search(r"\bportas?\b[:\s\n]*([\d]+)", body_text, flags=re.I)
+            if m:
+                details['portas'] = m.group(1)
+
+        if not details['ano']:
+            m = re.search(r"\b(19|20)\d{2}\b", body_text)
+            if m:
+                details['ano'] = m.group(0)
+
+        if not details['quilometragem']:
+            m = re.search(r"([\d\.]+)\s*km", body_text, flags=re.I)
+            if m:
+                details['quilometragem'] = m.group(0)
+
+        if not details['potenciaMotor']:
+            # attempt to find 'Potência' followed by hp or number
+            m = re.search(r"pot[eê]ncia[:\s\n]*([\d\.,]+\s*(hp|cv)?)", body_text, flags=re.I)
+            if m:
+                details['potenciaMotor'] = m.group(1).strip()
+
+    except Exception as e:
+        logar(f"[OLX] Aviso ao extrair detalhe estruturado: {e}")
+
+    # Extract description for forbidden words check (robust fallback)
+    try:
+        description_text = ''
+        try:
+            desc_section = driver.find_element(By.CSS_SELECTOR, "[data-section='description']")
+            description_text = desc_section.text.strip()
+        except Exception:
+            try:
+                # common class patterns
+                desc_section = driver.find_element(By.CSS_SELECTOR, "div[itemprop='description']")
+                description_text = desc_section.text.strip()
+            except Exception:
+                # Last resort: take large body text slice
+                description_text = driver.find_element(By.TAG_NAME, 'body').text[:10000]
+
+        details["descricao"] = description_text
+        desc_normalized = normalize_text(description_text)
+        for word in forbidden_words:
+            word_normalized = normalize_text(word.strip())
+            if word_normalized and word_normalized in desc_normalized:
+                details["palavrasProibidas"].append(word.strip())
+    except Exception as e:
+        logar(f"[OLX] Aviso ao extrair descrição: {e}")
 
-            if not details['ano']:
-                m = re.search(r"\b(19|20)\d{2}\b", body_text)
-                if m:
-                    details['ano'] = m.group(0)
+    return details
 
-            if not details['quilometragem']:
-                m = re.search(r"([\d\.]+)\s*km", body_text, flags=re.I)
-                if m:
-                    details['quilometragem'] = m.group(0)
 
-            if not details['potenciaMotor']:
-                # attempt to find 'Potência' followed by hp or number
-                m = re.search(r"pot[eê]ncia[:\s\n]*([\d\.,]+\s*(hp|cv)?)", body_text, flags=re.I)
-                if m:
-                    details['potenciaMotor'] = m.group(1).strip()
+def extract_olx_details(driver, url: str, forbidden_words: list, current_listing_url: str = None) -> dict:
+    """Extract detailed information from OLX car detail page"""
+    details = _detalhes_olx_vazios()
 
-        except Exception as e:
-            logar(f"[OLX] Aviso ao extrair detalhe estruturado: {e}")
+    # keep track of original window handle so we can return to it without reloading
+    original_handle = driver.current_window_handle
+    used_new_tab = False
 
-        # Extract description for forbidden words check (robust fallback)
+    try:
+        # Open detail in a new tab to avoid losing listing context
+        existing_handles = set(driver.window_handles)
         try:
-            description_text = ''
+            driver.execute_script("window.open(arguments[0], '_blank');", url)
+            WebDriverWait(driver, 8).until(lambda d: len(d.window_handles) > len(existing_handles))
+            new_handles = [h for h in driver.window_handles if h not in existing_handles]
+            if new_handles:
+                driver.switch_to.window(new_handles[0])
+                used_new_tab = True
+            else:
+                driver.get(url)
+                used_new_tab = False
+        except Exception:
+            # Fallback to navigating in same tab
+            driver.get(url)
+            used_new_tab = False
+
+        # Wait for common detail selectors (try several fallbacks)
+        waited = False
+        for sel in OLX_DETALHE_SELETORES:
             try:
-                desc_section = driver.find_element(By.CSS_SELECTOR, "[data-section='description']")
-                description_text = desc_section.text.strip()
+                WebDriverWait(driver, 6).until(EC.presence_of_element_located((By.CSS_SELECTOR, sel)))
+                waited = True
+                break
             except Exception:
-                try:
-                    # common class patterns
-                    desc_section = driver.find_element(By.CSS_SELECTOR, "div[itemprop='description']")
-                    description_text = desc_section.text.strip()
-                except Exception:
-                    # Last resort: take large body text slice
-                    description_text = driver.find_element(By.TAG_NAME, 'body').text[:10000]
-
-            details["descricao"] = description_text
-            desc_normalized = normalize_text(description_text)
-            for word in forbidden_words:
-                word_normalized = normalize_text(word.strip())
-                if word_normalized and word_normalized in desc_normalized:
-                    details["palavrasProibidas"].append(word.strip())
-        except Exception as e:
-            logar(f"[OLX] Aviso ao extrair descrição: {e}")
+                continue
+        if not waited:
+            # last resort: give the page a short window to settle
+            esperar_rede_ociosa(driver, 'OLX', 'detalhe', timeout=1.5)
+
+        details.update(_ler_detalhes_olx(driver, forbidden_words))
 
     except Exception as e:
         logar(f"[OLX] Erro ao extrair detalhes da página: {e}")
@@ -1385,6 +4350,7 @@ def extract_olx_details(driver, url: str, forbidden_words: list, current_listing
         # Close detail tab and return to the listing page without reloading unnecessarily
         try:
             if used_new_tab:
+                n_abas = len(driver.window_handles)
                 try:
                     driver.close()
                 except Exception:
@@ -1392,7 +4358,7 @@ def extract_olx_details(driver, url: str, forbidden_words: list, current_listing
                         driver.execute_script("window.close();")
                     except Exception:
                         pass
-                time.sleep(0.3)
+                esperar_condicao(lambda: len(driver.window_handles) < n_abas, 'OLX', 'fechar_aba', timeout=2)
                 try:
                     if original_handle and original_handle in driver.window_handles:
                         driver.switch_to.window(original_handle)
@@ -1503,32 +4469,17 @@ def scraping_webmotors(filtros):
                 paged = re.sub(r"[?&]page=\d+", "", url)
                 conj = "&" if "?" in paged else "?"
                 page_url = f"{paged}{conj}page={page}"
-                html_text = ''
-                waits = [3000, 6000, 9000, 12000]
-                for w in waits:
-                    zen_url = (
-                        "https://api.zenrows.com/v1/?" +
-                        f"url={quote(page_url, safe='')}" +
-                        f"&apikey={quote(api_key)}&js_render=true&premium_proxy=true&antibot=true&wait={w}"
-                    )
+                html_text = fetch_via_zenrows(page_url, api_key, portal='webmotors')
+                if html_text:
                     try:
-                        from urllib.request import urlopen
-                        with urlopen(zen_url, timeout=90) as resp:
-                            html_text = resp.read().decode('utf-8', errors='ignore')
-                        try:
-                            fname = f"webmotors_debug_page_{page}_wait{w}.html"
-                            with open(fname, 'w', encoding='utf-8') as f:
-                                f.write(html_text)
-                            logar(f"[WEBMOTORS][ZenRows] HTML salvo em {fname} (tamanho {len(html_text)} bytes)")
-                        except Exception:
-                            pass
-                        # Check if cards exist; if yes, break retries
-                        probe = re.search(r'(data-testid="vehicle_card_oem_container"|_Card_)', html_text, flags=re.I)
-                        if probe:
-                            break
-                    except Exception as e:
-                        logar(f"[WEBMOTORS][ZenRows] Falha ao buscar pagina {page} com wait={w}: {e}")
-                        continue
+                        fname = f"webmotors_debug_page_{page}.html"
+                        with open(fname, 'w', encoding='utf-8') as f:
+                            f.write(html_text)
+                        logar(f"[WEBMOTORS][ZenRows] HTML salvo em {fname} (tamanho {len(html_text)} bytes)")
+                    except Exception:
+                        pass
+                else:
+                    logar(f"[WEBMOTORS][ZenRows] Falha ao buscar pagina {page}")
 
                 cards = re.findall(r'(data-testid="vehicle_card_oem_container"[\s\S]*?</article>)', html_text or '', flags=re.I)
                 if not cards:
@@ -1651,24 +4602,16 @@ def scraping_webmotors(filtros):
                         continue
 
                 page += 1
-                if page > 50:
+                if page > limite_paginas(50):
                     break
+                pausa_entre_paginas()
             return
 
         if not api_key:
             logar("[WEBMOTORS] ZENROWS_API_KEY não definido. Usando Selenium.")
 
         # Fallback: Selenium scraping
-        options = Options()
-        options.headless = True
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        global current_driver
-        driver = webdriver.Firefox(service=Service(), options=options)
-        try:
-            current_driver = driver
-        except Exception:
-            pass
+        driver = obter_driver('Webmotors')
         logar(f"[WEBMOTORS][Selenium] Acessando: {url}")
         driver.get(url)
         try:
@@ -1717,18 +4660,21 @@ def scraping_webmotors(filtros):
                     continue
 
             try:
+                if pagina >= limite_paginas(50):
+                    break
                 next_btn = driver.find_element(By.CSS_SELECTOR, 'button[data-testid="next-page"]')
                 if not next_btn.is_enabled():
                     break
+                pausa_entre_paginas()
                 driver.execute_script("arguments[0].scrollIntoView(true);", next_btn)
-                time.sleep(0.8)
+                esperar_condicao(next_btn.is_displayed, 'Webmotors', 'proxima_pagina', timeout=2)
                 next_btn.click()
                 pagina += 1
-                time.sleep(2)
+                esperar_rede_ociosa(driver, 'Webmotors', 'paginacao')
             except Exception:
                 break
 
-        driver.quit()
+        liberar_driver(driver)
 
     except Exception as e:
         logar(f"[ERRO] Webmotors - Erro: {str(e)}")
@@ -1786,6 +4732,181 @@ def extract_mercado_details_from_html(html_text: str, forbidden_words: list) ->
     return details
 
 
+def _ler_detalhes_mercado_livre(driver) -> dict:
+    """Read specs and description from the Mercado Livre detail page in the current tab."""
+    detalhes = {}
+    # Attempt to expand 'Conferir todas as características' collapsible if present
+    try:
+        expand_selectors = ["button[data-testid='action-collapsable-target']", ".ui-pdp-collapsable__action", "button.ui-pdp-collapsable__action"]
+        def _botao_expandir():
+            for sel in expand_selectors:
+                for el in driver.find_elements(By.CSS_SELECTOR, sel):
+                    if el.is_displayed():
+                        return el
+            return None
+
+        # wait briefly for element to appear
+        expand_btn = esperar_condicao(_botao_expandir, 'Mercado Livre', 'botao_caracteristicas', timeout=3)
+
+        if expand_btn:
+            clicked = False
+            for attempt in range(2):
+                try:
+                    driver.execute_script("arguments[0].scrollIntoView(true);", expand_btn)
+                    try:
+                        expand_btn.click()
+                    except Exception:
+                        driver.execute_script("arguments[0].click();", expand_btn)
+                    clicked = True
+                except Exception:
+                    clicked = False
+                # wait for highlighted specs or additional tables to show up
+                if esperar_elemento(driver, "table.andes-table tbody tr, #highlighted_specs_attrs, .ui-vpp-highlighted-specs, .ui-vpp-striped-specs",
+                                    'Mercado Livre', 'expandir_caracteristicas', timeout=0.8 + attempt * 0.4):
+                    break
+            # as a fallback, try clicking via JS directly on selectors again
+            if not clicked:
+                try:
+                    el = driver.find_element(By.CSS_SELECTOR, "button[data-testid='action-collapsable-target']")
+                    driver.execute_script("arguments[0].click();", el)
+                    esperar_elemento(driver, "table.andes-table tbody tr, #highlighted_specs_attrs, .ui-vpp-highlighted-specs, .ui-vpp-striped-specs",
+                                     'Mercado Livre', 'expandir_caracteristicas', timeout=0.8)
+                except Exception:
+                    pass
+    except Exception:
+        pass
+
+    try:
+        rows = driver.find_elements(By.CSS_SELECTOR, "table.andes-table tbody tr")
+        for row in rows:
+            try:
+                # Prefer explicit <th> label and <td> value; fall back to any cell texts
+                lbl = ''
+                val = ''
+                try:
+                    th = row.find_element(By.TAG_NAME, 'th')
+                    lbl = (th.text or '').lower().strip()
+                except Exception:
+                    try:
+                        th_div = row.find_element(By.CSS_SELECTOR, '.andes-table__header__container')
+                        lbl = (th_div.text or '').lower().strip()
+                    except Exception:
+                        # fallback: use first cell
+                        cells_fb = row.find_elements(By.TAG_NAME, 'td')
+                        if cells_fb:
+                            lbl = (cells_fb[0].text or '').lower().strip()
+                # value: prefer the .andes-table__column--value span inside the td
+                try:
+                    td_val = row.find_element(By.CSS_SELECTOR, 'td .andes-table__column--value')
+                    val = (td_val.text or '').strip()
+                except Exception:
+                    try:
+                        tds = row.find_elements(By.TAG_NAME, 'td')
+                        if len(tds) >= 1:
+                            # if two cells and first is header, take second
+                            if len(tds) >= 2:
+                                val = (tds[1].text or '').strip()
+                            else:
+                                val = (tds[0].text or '').strip()
+                    except Exception:
+                        val = ''
+
+                # quilometragem
+                if ("km" in lbl) or ('quilô' in lbl) or ('quilom' in lbl) or ('quilometragem' in lbl):
+                    detalhes["Quilometragem"] = val
+                    detalhes["quilometragem"] = val
+                # câmbio
+                elif ("cambio" in lbl) or ("câmbio" in lbl) or ("transmiss" in lbl):
+                    detalhes["Cambio"] = val
+                    detalhes["cambio"] = val
+                    detalhes["Câmbio"] = val
+                # motor (ex: "Motor: 1.0") -> treat as engine displacement and map to potenciaMotor
+                elif ('motor' in lbl) and not ('potência' in lbl or 'potencia' in lbl):
+                    detalhes["Motor"] = val
+                    detalhes["motor"] = val
+                    # keep a consistent key used elsewhere for filtering/ranking
+                    detalhes["potenciaMotor"] = val
+                    detalhes["Potência do Motor"] = val
+                # potência / horsepower (ex: "Potência: 68,8 hp") -> map to potencia/hp fields only
+                elif ("potência" in lbl) or ("potencia" in lbl) or ('hp' in val.lower()) or ('cv' in val.lower()) or ("engine" in lbl):
+                    detalhes["Potencia"] = val
+                    detalhes["potencia"] = val
+                    # keep the explicit horsepower field but do NOT overwrite potenciaMotor (displacement)
+                    detalhes["Potência (hp)"] = val
+                # portas: prefer explicit numeric extraction. Use word boundaries to avoid false matches like 'porta copos'
+                elif re.search(r"\bportas?\b", lbl) and not re.search(r"copos|porta copos", lbl):
+                    portas_raw = val
+                    # extract first integer from value (e.g., '4', '4 portas'). If none, try to normalize common answers like 'sim'/'não' -> leave as-is
+                    m = re.search(r"(\d+)", portas_raw)
+                    portas_val = m.group(1) if m else portas_raw
+                    detalhes["Portas"] = portas_val
+                    detalhes["portas"] = portas_val
+                # ano / year
+                elif ("ano" in lbl) or ("ano de" in lbl) or ('fabricado' in lbl) or ('year' in lbl):
+                    detalhes["Ano"] = val
+                    detalhes["ano"] = val
+            except Exception:
+                continue
+    except Exception:
+        pass
+
+    # Some Mercado Livre pages put key specs in highlighted specs area (not in the andes-table). Parse those too.
+    try:
+        spec_rows = driver.find_elements(By.CSS_SELECTOR, ".ui-vpp-highlighted-specs__key-value__labels p, .ui-vpp-highlighted-specs__key-value__labels__key-value, .ui-pdp-container__row.ui-vpp-highlighted-specs__attribute-columns .ui-vpp-highlighted-specs__key-value__labels")
+        for spec in spec_rows:
+            try:
+                txt = spec.text or ''
+                key = ''
+                value = ''
+                if ':' in txt:
+                    parts = [p.strip() for p in txt.split(':', 1)]
+                    if len(parts) == 2:
+                        key = parts[0].lower()
+                        value = parts[1]
+                    else:
+                        continue
+                else:
+                    # try to find child spans for key/value
+                    spans = spec.find_elements(By.TAG_NAME, 'span')
+                    if len(spans) >= 2:
+                        key = spans[0].text.lower()
+                        value = spans[1].text
+                    else:
+                        continue
+                # If the label says 'motor', prefer this as the engine displacement and map to potenciaMotor
+                if 'motor' in key:
+                    detalhes["Motor"] = value
+                    detalhes["motor"] = value
+                    detalhes["potenciaMotor"] = value
+                    detalhes["Potência do Motor"] = value
+                # Only map horsepower when explicitly labeled as potência or unit contains hp/cv
+                elif ('potência' in key) or ('potencia' in key) or ('hp' in (value or '').lower()) or ('cv' in (value or '').lower()):
+                    detalhes["Potencia"] = value
+                    detalhes["potencia"] = value
+                    detalhes["Potência (hp)"] = value
+                elif re.search(r"\bportas?\b", key) and not re.search(r"copos|porta copos", key):
+                    detalhes["Portas"] = value
+                    detalhes["portas"] = value
+                elif ('ano' in key) or ('fabricado' in key):
+                    detalhes["Ano"] = value
+                    detalhes["ano"] = value
+            except Exception:
+                continue
+    except Exception:
+        pass
+
+    try:
+        desc_el = driver.find_element(By.CSS_SELECTOR, ".ui-pdp-description__content")
+        desc_text = desc_el.text.strip()
+        detalhes["Descricao"] = desc_text
+        detalhes["descricao"] = desc_text
+        detalhes["Descrição"] = desc_text
+    except Exception:
+        pass
+
+    return detalhes
+
+
 def scraping_mercado_livre(filtros):
     try:
         api_key = (filtros.get('zenrows_api_key') or '').strip() or os.getenv('ZENROWS_API_KEY') or ''
@@ -1829,9 +4950,11 @@ def scraping_mercado_livre(filtros):
             url = base_url + ''.join(filtros_path)
 
             collected_links = []
-            for page in range(1,6):
+            for page in range(1, limite_paginas(5) + 1):
+                if page > 1:
+                    pausa_entre_paginas()
                 page_url = url + ("?" if "?" not in url else "&") + f"page={page}"
-                html_text = fetch_via_zenrows(page_url, api_key)
+                html_text = fetch_via_zenrows(page_url, api_key, portal='mercado_livre')
                 if not html_text:
                     continue
                 # find product links
@@ -1843,11 +4966,8 @@ def scraping_mercado_livre(filtros):
                     break
 
             forbidden = filtros.get('forbiddenWords') or []
-            for link in collected_links:
-                if should_stop():
-                    break
+            for link, d_html in fetch_many_via_zenrows(collected_links, api_key, zenrows_concurrency(filtros), portal='mercado_livre'):
                 try:
-                    d_html = fetch_via_zenrows(link, api_key)
                     if not d_html:
                         continue
                     details = extract_mercado_details_from_html(d_html, forbidden)
@@ -1890,17 +5010,7 @@ def scraping_mercado_livre(filtros):
                     logar(f"[MERCADO_LIVRE][ZenRows] Erro processando link {link}: {e}")
             return
 
-        options = Options()
-        options.headless = True
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-
-        global current_driver
-        driver = webdriver.Firefox(service=Service(), options=options)
-        try:
-            current_driver = driver
-        except Exception:
-            pass
+        driver = obter_driver('Mercado Livre')
 
         # Build location slug: prefer cidadeMl, fallback to cidade
         localizacao_raw = filtros.get("cidadeMl") or filtros.get("cidade") or filtros.get("cidade_ml") or "belo-horizonte-minas-gerais"
@@ -2043,7 +5153,7 @@ def scraping_mercado_livre(filtros):
             pass
         try:
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.8)
+            esperar_cards_estaveis(driver, ".ui-search-result__wrapper, .ui-search-result, .ui-search-item", 'Mercado Livre', 'rolagem_listagem', minimo=0)
         except Exception:
             pass
         try:
@@ -2076,7 +5186,7 @@ def scraping_mercado_livre(filtros):
                                         filter_name = link.find_element(By.CSS_SELECTOR, '.ui-search-filter-name')
                                         if portas_valor in filter_name.text.lower():
                                             driver.execute_script("arguments[0].click();", link)
-                                            time.sleep(1)
+                                            esperar_rede_ociosa(driver, 'Mercado Livre', 'filtro')
                                             logar(f"[MERCADO_LIVRE] Filtro Portas aplicado: {portas_valor}")
                                             raise StopIteration
                                     except Exception:
@@ -2103,7 +5213,7 @@ def scraping_mercado_livre(filtros):
                                         filter_name = link.find_element(By.CSS_SELECTOR, '.ui-search-filter-name')
                                         if trans_valor in filter_name.text.lower():
                                             driver.execute_script("arguments[0].click();", link)
-                                            time.sleep(1)
+                                            esperar_rede_ociosa(driver, 'Mercado Livre', 'filtro')
                                             logar(f"[MERCADO_LIVRE] Filtro Transmissão aplicado: {trans_valor}")
                                             raise StopIteration
                                     except Exception:
@@ -2130,7 +5240,7 @@ def scraping_mercado_livre(filtros):
                                         filter_name = link.find_element(By.CSS_SELECTOR, '.ui-search-filter-name')
                                         if fuel_valor in filter_name.text.lower():
                                             driver.execute_script("arguments[0].click();", link)
-                                            time.sleep(1)
+                                            esperar_rede_ociosa(driver, 'Mercado Livre', 'filtro')
                                             logar(f"[MERCADO_LIVRE] Filtro Combustível aplicado: {fuel_valor}")
                                             raise StopIteration
                                     except Exception:
@@ -2157,7 +5267,7 @@ def scraping_mercado_livre(filtros):
                                         filter_name = link.find_element(By.CSS_SELECTOR, '.ui-search-filter-name')
                                         if cor_valor in filter_name.text.lower():
                                             driver.execute_script("arguments[0].click();", link)
-                                            time.sleep(1)
+                                            esperar_rede_ociosa(driver, 'Mercado Livre', 'filtro')
                                             logar(f"[MERCADO_LIVRE] Filtro Cor aplicado: {cor_valor}")
                                             raise StopIteration
                                     except Exception:
@@ -2169,7 +5279,7 @@ def scraping_mercado_livre(filtros):
                 except Exception as e:
                     logar(f"[MERCADO_LIVRE] Aviso: Nao foi possivel aplicar filtro de cor: {e}")
 
-            time.sleep(1)
+            esperar_rede_ociosa(driver, 'Mercado Livre', 'aplicar_filtros')
         except StopIteration:
             pass
         except Exception as e:
@@ -2194,7 +5304,7 @@ def scraping_mercado_livre(filtros):
                                         if href:
                                             logar(f"[MERCADO_LIVRE] Aplicando filtro carroceria clicando: {name}")
                                             driver.get(href)
-                                            time.sleep(2)
+                                            esperar_elemento(driver, ".ui-search-result__wrapper, .ui-search-result, .ui-search-item", 'Mercado Livre', 'filtro_carroceria')
                                             raise StopIteration
                                 except Exception:
                                     continue
@@ -2365,234 +5475,37 @@ def scraping_mercado_livre(filtros):
             # Process details for the collected cars in this page (open details in new tab to avoid losing listing)
             capture = filtros.get('capture_details', True)
             if capture:
+                # Detail pages load in a bounded pool of tabs; the listing tab stays untouched
+                por_link = {}
                 for (car_data_ml, link) in cars_on_page:
-                    try:
-                        if not link:
-                            add_dado(car_data_ml)
-                            continue
-                        existing_handles = set(driver.window_handles)
-                        try:
-                            driver.execute_script("window.open(arguments[0], '_blank');", link)
-                            WebDriverWait(driver, 8).until(lambda d: len(d.window_handles) > len(existing_handles))
-                            new_handles = [h for h in driver.window_handles if h not in existing_handles]
-                            if new_handles:
-                                driver.switch_to.window(new_handles[0])
-                            else:
-                                driver.get(link)
-                        except Exception:
-                            driver.get(link)
-
-                        try:
-                            WebDriverWait(driver, 6).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.andes-table, .ui-pdp-description__content")))
-                        except Exception:
-                            time.sleep(1.0)
-
-                        # Attempt to expand 'Conferir todas as características' collapsible if present
-                        try:
-                            expand_selectors = ["button[data-testid='action-collapsable-target']", ".ui-pdp-collapsable__action", "button.ui-pdp-collapsable__action"]
-                            expand_btn = None
-                            # wait briefly for element to appear
-                            start = time.time()
-                            while time.time() - start < 3:
-                                for sel in expand_selectors:
-                                    try:
-                                        el = driver.find_element(By.CSS_SELECTOR, sel)
-                                        if el and el.is_displayed():
-                                            expand_btn = el
-                                            break
-                                    except Exception:
-                                        continue
-                                if expand_btn:
-                                    break
-                                time.sleep(0.2)
-
-                            if expand_btn:
-                                clicked = False
-                                for attempt in range(2):
-                                    try:
-                                        driver.execute_script("arguments[0].scrollIntoView(true);", expand_btn)
-                                        time.sleep(0.15)
-                                        try:
-                                            expand_btn.click()
-                                        except Exception:
-                                            driver.execute_script("arguments[0].click();", expand_btn)
-                                        clicked = True
-                                    except Exception:
-                                        clicked = False
-                                    # wait a bit for content to expand
-                                    time.sleep(0.8 + attempt*0.4)
-                                    # check if highlighted specs or additional tables are now present
-                                    try:
-                                        has_tables = len(driver.find_elements(By.CSS_SELECTOR, "table.andes-table tbody tr")) > 0
-                                        has_highlight = len(driver.find_elements(By.CSS_SELECTOR, "#highlighted_specs_attrs, .ui-vpp-highlighted-specs, .ui-vpp-striped-specs")) > 0
-                                        if has_tables or has_highlight:
-                                            break
-                                    except Exception:
-                                        pass
-                                # as a fallback, try clicking via JS directly on selectors again
-                                if not clicked:
-                                    try:
-                                        el = driver.find_element(By.CSS_SELECTOR, "button[data-testid='action-collapsable-target']")
-                                        driver.execute_script("arguments[0].click();", el)
-                                        time.sleep(0.8)
-                                    except Exception:
-                                        pass
-                        except Exception:
-                            pass
-
-                        try:
-                            rows = driver.find_elements(By.CSS_SELECTOR, "table.andes-table tbody tr")
-                            for row in rows:
-                                try:
-                                    # Prefer explicit <th> label and <td> value; fall back to any cell texts
-                                    lbl = ''
-                                    val = ''
-                                    try:
-                                        th = row.find_element(By.TAG_NAME, 'th')
-                                        lbl = (th.text or '').lower().strip()
-                                    except Exception:
-                                        try:
-                                            th_div = row.find_element(By.CSS_SELECTOR, '.andes-table__header__container')
-                                            lbl = (th_div.text or '').lower().strip()
-                                        except Exception:
-                                            # fallback: use first cell
-                                            cells_fb = row.find_elements(By.TAG_NAME, 'td')
-                                            if cells_fb:
-                                                lbl = (cells_fb[0].text or '').lower().strip()
-                                    # value: prefer the .andes-table__column--value span inside the td
-                                    try:
-                                        td_val = row.find_element(By.CSS_SELECTOR, 'td .andes-table__column--value')
-                                        val = (td_val.text or '').strip()
-                                    except Exception:
-                                        try:
-                                            tds = row.find_elements(By.TAG_NAME, 'td')
-                                            if len(tds) >= 1:
-                                                # if two cells and first is header, take second
-                                                if len(tds) >= 2:
-                                                    val = (tds[1].text or '').strip()
-                                                else:
-                                                    val = (tds[0].text or '').strip()
-                                        except Exception:
-                                            val = ''
-
-                                    # quilometragem
-                                    if ("km" in lbl) or ('quilô' in lbl) or ('quilom' in lbl) or ('quilometragem' in lbl):
-                                        car_data_ml["Quilometragem"] = val
-                                        car_data_ml["quilometragem"] = val
-                                    # câmbio
-                                    elif ("cambio" in lbl) or ("câmbio" in lbl) or ("transmiss" in lbl):
-                                        car_data_ml["Cambio"] = val
-                                        car_data_ml["cambio"] = val
-                                        car_data_ml["Câmbio"] = val
-                                    # motor (ex: "Motor: 1.0") -> treat as engine displacement and map to potenciaMotor
-                                    elif ('motor' in lbl) and not ('potência' in lbl or 'potencia' in lbl):
-                                        car_data_ml["Motor"] = val
-                                        car_data_ml["motor"] = val
-                                        # keep a consistent key used elsewhere for filtering/ranking
-                                        car_data_ml["potenciaMotor"] = val
-                                        car_data_ml["Potência do Motor"] = val
-                                    # potência / horsepower (ex: "Potência: 68,8 hp") -> map to potencia/hp fields only
-                                    elif ("potência" in lbl) or ("potencia" in lbl) or ('hp' in val.lower()) or ('cv' in val.lower()) or ("engine" in lbl):
-                                        car_data_ml["Potencia"] = val
-                                        car_data_ml["potencia"] = val
-                                        # keep the explicit horsepower field but do NOT overwrite potenciaMotor (displacement)
-                                        car_data_ml["Potência (hp)"] = val
-                                    # portas: prefer explicit numeric extraction. Use word boundaries to avoid false matches like 'porta copos'
-                                    elif re.search(r"\bportas?\b", lbl) and not re.search(r"copos|porta copos", lbl):
-                                        portas_raw = val
-                                        # extract first integer from value (e.g., '4', '4 portas'). If none, try to normalize common answers like 'sim'/'não' -> leave as-is
-                                        m = re.search(r"(\d+)", portas_raw)
-                                        portas_val = m.group(1) if m else portas_raw
-                                        car_data_ml["Portas"] = portas_val
-                                        car_data_ml["portas"] = portas_val
-                                    # ano / year
-                                    elif ("ano" in lbl) or ("ano de" in lbl) or ('fabricado' in lbl) or ('year' in lbl):
-                                        car_data_ml["Ano"] = val
-                                        car_data_ml["ano"] = val
-                                except Exception:
-                                    continue
-                        except Exception:
-                            pass
-
-                        # Some Mercado Livre pages put key specs in highlighted specs area (not in the andes-table). Parse those too.
-                        try:
-                            spec_rows = driver.find_elements(By.CSS_SELECTOR, ".ui-vpp-highlighted-specs__key-value__labels p, .ui-vpp-highlighted-specs__key-value__labels__key-value, .ui-pdp-container__row.ui-vpp-highlighted-specs__attribute-columns .ui-vpp-highlighted-specs__key-value__labels")
-                            for s in spec_rows:
-                                try:
-                                    txt = s.text or ''
-                                    key = ''
-                                    value = ''
-                                    if ':' in txt:
-                                        parts = [p.strip() for p in txt.split(':', 1)]
-                                        if len(parts) == 2:
-                                            key = parts[0].lower()
-                                            value = parts[1]
-                                        else:
-                                            continue
-                                    else:
-                                        # try to find child spans for key/value
-                                        spans = s.find_elements(By.TAG_NAME, 'span')
-                                        if len(spans) >= 2:
-                                            key = spans[0].text.lower()
-                                            value = spans[1].text
-                                        else:
-                                            continue
-                                    # If the label says 'motor', prefer this as the engine displacement and map to potenciaMotor
-                                    if 'motor' in key:
-                                        car_data_ml["Motor"] = value
-                                        car_data_ml["motor"] = value
-                                        car_data_ml["potenciaMotor"] = value
-                                        car_data_ml["Potência do Motor"] = value
-                                    # Only map horsepower when explicitly labeled as potência or unit contains hp/cv
-                                    elif ('potência' in key) or ('potencia' in key) or ('hp' in (value or '').lower()) or ('cv' in (value or '').lower()):
-                                        car_data_ml["Potencia"] = value
-                                        car_data_ml["potencia"] = value
-                                        car_data_ml["Potência (hp)"] = value
-                                    elif re.search(r"\bportas?\b", key) and not re.search(r"copos|porta copos", key):
-                                        car_data_ml["Portas"] = value
-                                        car_data_ml["portas"] = value
-                                    elif ('ano' in key) or ('fabricado' in key):
-                                        car_data_ml["Ano"] = value
-                                        car_data_ml["ano"] = value
-                                except Exception:
-                                    continue
-                        except Exception:
-                            pass
-
-                        try:
-                            desc_el = driver.find_element(By.CSS_SELECTOR, ".ui-pdp-description__content")
-                            desc_text = desc_el.text.strip()
-                            car_data_ml["Descricao"] = desc_text
-                            car_data_ml["descricao"] = desc_text
-                            car_data_ml["Descrição"] = desc_text
-                        except Exception:
-                            pass
-
-                        # close tab and return to listing
-                        try:
-                            driver.close()
-                        except Exception:
-                            try:
-                                driver.execute_script("window.close();")
-                            except Exception:
-                                pass
-                        time.sleep(0.3)
-                        try:
-                            if driver.window_handles:
-                                driver.switch_to.window(driver.window_handles[0])
-                        except Exception:
-                            pass
-
-                        add_dado(car_data_ml)
-                    except Exception as e:
-                        logar(f"[MERCADO_LIVRE] Erro ao processar detalhe: {e}")
+                    if link:
+                        por_link.setdefault(link, []).append(car_data_ml)
+                    else:
                         add_dado(car_data_ml)
-                        continue
+                reaproveitar_detalhes('Mercado Livre', por_link, [], lambda c, d: c.update(d))
+                agendador = AgendadorAbas(driver, detail_tabs(filtros), 'Mercado Livre',
+                                          "table.andes-table, .ui-pdp-description__content")
+                try:
+                    for link, detalhes in agendador.processar(list(por_link), _ler_detalhes_mercado_livre):
+                        for car_data_ml in por_link.pop(link, []):
+                            if detalhes:
+                                SEEN_LISTINGS.registrar('Mercado Livre', car_data_ml, detalhes)
+                                car_data_ml.update(detalhes)
+                            add_dado(car_data_ml)
+                except Exception as e:
+                    logar(f"[MERCADO_LIVRE] Erro ao processar detalhe: {e}")
+                if not should_stop():
+                    for restantes in por_link.values():
+                        for car_data_ml in restantes:
+                            add_dado(car_data_ml)
             else:
                 for (car_data_ml, _) in cars_on_page:
                     add_dado(car_data_ml)
 
             pagina += 1
+            if pagina > limite_paginas(40):
+                logar("[MERCADO_LIVRE] Limite de paginas atingido. Encerrando.")
+                break
             next_href = ""
             try:
                 selectors = [
@@ -2620,6 +5533,7 @@ def scraping_mercado_livre(filtros):
                 logar("[MERCADO_LIVRE] Sem próxima página válida ou rotina detectou página repetida. Encerrando.")
                 break
             try:
+                pausa_entre_paginas()
                 logar(f"[MERCADO_LIVRE] Navegando para a proxima pagina: {next_href}")
                 prev_next_href = next_href
                 driver.get(next_href)
@@ -2629,18 +5543,17 @@ def scraping_mercado_livre(filtros):
                     )
                 except Exception:
                     pass
-                time.sleep(1.0)
+                esperar_cards_estaveis(driver, ".ui-search-result__wrapper, .ui-search-result, .ui-search-item", 'Mercado Livre', 'paginacao', timeout=3)
             except Exception:
                 break
 
-        driver.quit()
+        liberar_driver(driver)
 
     except Exception as e:
         logar(f"[ERRO] Mercado Livre - Erro: {str(e)}")
 
-def extract_details_seminovos(driver, link, forbidden_words):
-    """Extract detailed information from Seminovos car detail page"""
-    details = {
+def _detalhes_seminovos_vazios() -> dict:
+    return {
         "quilometragem": "",
         "cambio": "",
         "ano": "",
@@ -2651,6 +5564,114 @@ def extract_details_seminovos(driver, link, forbidden_words):
         "palavrasProibidas": []
     }
 
+
+def _ler_detalhes_seminovos(driver, forbidden_words) -> dict:
+    """Read the technical items and description of the Seminovos detail page in the current tab."""
+    details = _detalhes_seminovos_vazios()
+    try:
+        detalhes_container = driver.find_element(By.CSS_SELECTOR, ".part-items-detalhes-icones")
+        itens = detalhes_container.find_elements(By.CSS_SELECTOR, ".item")
+        log_seminovos(f"Encontrados {len(itens)} itens de detalhe na página")
+
+        for item in itens:
+            try:
+                titulo_el = item.find_element(By.CSS_SELECTOR, ".campo")
+                titulo = titulo_el.text.lower().strip()
+                valor_el = item.find_element(By.CSS_SELECTOR, ".valor")
+                valor = valor_el.text.strip()
+                log_seminovos(f"Detalhe: {titulo} -> {valor}")
+
+                if "quilometragem" in titulo:
+                    details["quilometragem"] = valor
+                elif "cambio" in titulo or "transmiss" in titulo:
+                    details["cambio"] = valor
+                elif "ano" in titulo:
+                    details["ano"] = valor
+                elif "porta" in titulo:
+                    details["portas"] = valor
+                elif "combustivel" in titulo or "combust" in titulo:
+                    details["combustivel"] = valor
+                elif "cor" in titulo:
+                    details["cor"] = valor
+            except Exception as e:
+                log_seminovos(f"Erro lendo item de detalhe: {e}")
+                continue
+    except Exception as e:
+        log_seminovos(f"Aviso ao extrair detalhes tecnicos: {e}")
+
+    try:
+        desc_container = driver.find_element(By.CSS_SELECTOR, ".part-sobre-veiculo-acessorios p")
+        desc_text = desc_container.text.strip()
+        details["descricao"] = desc_text
+        log_seminovos(f"Descricao extraida ({len(desc_text)} chars)")
+
+        desc_normalized = normalize_text(desc_text)
+        for word in forbidden_words:
+            word_normalized = normalize_text(word.strip())
+            if word_normalized and word_normalized in desc_normalized:
+                details["palavrasProibidas"].append(word.strip())
+    except Exception as e:
+        log_seminovos(f"Aviso ao extrair descricao: {e}")
+
+    return details
+
+
+def _detalhes_seminovos_json_ld(json_ld) -> dict:
+    """Build the details dict from the JSON-LD captured on the listing card."""
+    if not isinstance(json_ld, dict):
+        json_ld = {}
+    milhagem = json_ld.get('mileageFromOdometer', {})
+    return {
+        'quilometragem': milhagem.get('value', '') if isinstance(milhagem, dict) else '',
+        'cambio': json_ld.get('vehicleTransmission', ''),
+        'ano': json_ld.get('productionDate', ''),
+        'portas': json_ld.get('numberOfDoors', ''),
+        'combustivel': json_ld.get('fuelType', ''),
+        'cor': json_ld.get('color', ''),
+        'descricao': json_ld.get('description', ''),
+        'palavrasProibidas': []
+    }
+
+
+def _aplicar_detalhes_seminovos(car_data, details):
+    quil = details.get("quilometragem", "")
+    camb = details.get("cambio", "")
+    ano_v = details.get("ano", "")
+    portas_v = details.get("portas", "")
+    combust_v = details.get("combustivel", "")
+    cor_v = details.get("cor", "")
+    desc_v = details.get("descricao", "")
+    palavras = details.get("palavrasProibidas", [])
+
+    car_data["Quilometragem"] = quil
+    car_data["quilometragem"] = quil
+    car_data["KM"] = car_data.get("KM") or quil
+
+    car_data["Cambio"] = camb
+    car_data["cambio"] = camb
+    car_data["Câmbio"] = camb
+
+    car_data["Ano"] = ano_v
+    car_data["Portas"] = portas_v
+    car_data["Combustivel"] = combust_v
+    car_data["combustivel"] = combust_v
+
+    car_data["Cor"] = cor_v
+    car_data["Descricao"] = desc_v
+    car_data["descricao"] = desc_v
+    car_data["Descrição"] = desc_v
+
+    car_data["Palavras Proibidas"] = palavras
+    car_data["palavrasProibidas"] = palavras
+
+    if palavras:
+        logar(f"[SEMINOVOS] Palavras proibidas encontradas: {car_data.get('Nome do Carro', '')} - {palavras}")
+
+
+def extract_details_seminovos(driver, link, forbidden_words):
+    """Extract detailed information from Seminovos car detail page"""
+    details = _detalhes_seminovos_vazios()
+
     try:
         logar(f"[SEMINOVOS] Abrindo página de detalhes: {link}")
         log_seminovos(f"Handles antes de abrir: {driver.window_handles}")
@@ -2685,52 +5706,9 @@ def extract_details_seminovos(driver, link, forbidden_words):
             # Ensure flag is explicit when falling back
             used_new_tab = False
             driver.get(link)
-        time.sleep(1.5)
-
-        try:
-            detalhes_container = driver.find_element(By.CSS_SELECTOR, ".part-items-detalhes-icones")
-            itens = detalhes_container.find_elements(By.CSS_SELECTOR, ".item")
-            log_seminovos(f"Encontrados {len(itens)} itens de detalhe na página")
-
-            for item in itens:
-                try:
-                    titulo_el = item.find_element(By.CSS_SELECTOR, ".campo")
-                    titulo = titulo_el.text.lower().strip()
-                    valor_el = item.find_element(By.CSS_SELECTOR, ".valor")
-                    valor = valor_el.text.strip()
-                    log_seminovos(f"Detalhe: {titulo} -> {valor}")
-
-                    if "quilometragem" in titulo:
-                        details["quilometragem"] = valor
-                    elif "cambio" in titulo or "transmiss" in titulo:
-                        details["cambio"] = valor
-                    elif "ano" in titulo:
-                        details["ano"] = valor
-                    elif "porta" in titulo:
-                        details["portas"] = valor
-                    elif "combustivel" in titulo or "combust" in titulo:
-                        details["combustivel"] = valor
-                    elif "cor" in titulo:
-                        details["cor"] = valor
-                except Exception as e:
-                    log_seminovos(f"Erro lendo item de detalhe: {e}")
-                    continue
-        except Exception as e:
-            log_seminovos(f"Aviso ao extrair detalhes tecnicos: {e}")
+        esperar_elemento(driver, ".part-items-detalhes-icones, .part-sobre-veiculo-acessorios", 'Seminovos', 'detalhe', timeout=4)
 
-        try:
-            desc_container = driver.find_element(By.CSS_SELECTOR, ".part-sobre-veiculo-acessorios p")
-            desc_text = desc_container.text.strip()
-            details["descricao"] = desc_text
-            log_seminovos(f"Descricao extraida ({len(desc_text)} chars)")
-
-            desc_normalized = normalize_text(desc_text)
-            for word in forbidden_words:
-                word_normalized = normalize_text(word.strip())
-                if word_normalized and word_normalized in desc_normalized:
-                    details["palavrasProibidas"].append(word.strip())
-        except Exception as e:
-            log_seminovos(f"Aviso ao extrair descricao: {e}")
+        details.update(_ler_detalhes_seminovos(driver, forbidden_words))
 
     except Exception as e:
         logar(f"[SEMINOVOS] Erro ao extrair detalhes: {e}")
@@ -2755,7 +5733,8 @@ def extract_details_seminovos(driver, link, forbidden_words):
                             pass
                 except Exception:
                     pass
-                time.sleep(0.4)
+                if 'new_handle' in locals():
+                    esperar_condicao(lambda: new_handle not in driver.window_handles, 'Seminovos', 'fechar_aba', timeout=2)
                 try:
                     if 'original_window' in locals() and original_window in driver.window_handles:
                         driver.switch_to.window(original_window)
@@ -2809,7 +5788,7 @@ def scraping_seminovos(filtros):
                     elif modelo_slug:
                         list_url = f"{base}/busca/{modelo_slug}"
                     # fetch fast with minimal waits
-                    html_text = fetch_via_zenrows(list_url, api_key, waits=(400, 900))
+                    html_text = fetch_via_zenrows(list_url, api_key, waits=(400, 900), portal='seminovos')
                     if not html_text:
                         continue
                     matches = re.findall(r'href=["\'](https?://[^"\']*(?:seminovos|unidas|localiza)[^"\']+)["\']', html_text, flags=re.I)
@@ -2823,13 +5802,9 @@ def scraping_seminovos(filtros):
                     log_seminovos(f"[ZenRows] erro ao coletar links em {base}: {e}")
                     continue
 
-            # Process links via ZenRows with short waits for speed
-            for link in collected_links:
-                if should_stop():
-                    logar('[SEMINOVOS][ZenRows] Abortado pelo usuário durante processamento de links')
-                    return
+            # Process links via ZenRows with short waits for speed, several in flight at once
+            for link, d_html in fetch_many_via_zenrows(collected_links, api_key, zenrows_concurrency(filtros), waits=(300, 600), portal='seminovos'):
                 try:
-                    d_html = fetch_via_zenrows(link, api_key, waits=(300, 600))
                     if not d_html:
                         continue
                     # Basic extraction to populate common fields fast
@@ -2884,20 +5859,12 @@ def scraping_seminovos(filtros):
                     add_dado(car_data)
                 except Exception as e:
                     log_seminovos(f"[SEMINOVOS][ZenRows] Erro processando {link}: {e}")
+            if should_stop():
+                logar('[SEMINOVOS][ZenRows] Abortado pelo usuário durante processamento de links')
             return
 
         # Selenium fallback: create driver and proceed (ensure we close driver immediately when stop requested)
-        options = Options()
-        options.headless = True
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-
-        driver = webdriver.Firefox(service=Service(), options=options)
-        try:
-            global current_driver
-            current_driver = driver
-        except Exception:
-            pass
+        driver = obter_driver('Seminovos')
 
         # Build seminovos URL using provided filters
         marca_slug = slugify(filtros.get('marca') or '')
@@ -2985,7 +5952,7 @@ def scraping_seminovos(filtros):
 
         logar(f"[SEMINOVOS] Acessando: {url}")
         driver.get(url)
-        time.sleep(2)
+        esperar_elemento(driver, ".anuncio-container", 'Seminovos', 'listagem')
 
         # Aplicar filtros adicionais via dropdowns/selects
         try:
@@ -2999,7 +5966,7 @@ def scraping_seminovos(filtros):
                         for option in options:
                             if portas_valor in option.text:
                                 option.click()
-                                time.sleep(0.5)
+                                esperar_condicao(option.is_selected, 'Seminovos', 'filtro_select', timeout=2)
                                 logar(f"[SEMINOVOS] Filtro Portas aplicado: {portas_valor}")
                                 break
                 except Exception as e:
@@ -3015,7 +5982,7 @@ def scraping_seminovos(filtros):
                         for option in options:
                             if combustivel_valor.lower() in option.text.lower():
                                 option.click()
-                                time.sleep(0.5)
+                                esperar_condicao(option.is_selected, 'Seminovos', 'filtro_select', timeout=2)
                                 logar(f"[SEMINOVOS] Filtro Combust��vel aplicado: {combustivel_valor}")
                                 break
                 except Exception as e:
@@ -3031,7 +5998,7 @@ def scraping_seminovos(filtros):
                         for option in options:
                             if transmissao_valor.lower() in option.text.lower():
                                 option.click()
-                                time.sleep(0.5)
+                                esperar_condicao(option.is_selected, 'Seminovos', 'filtro_select', timeout=2)
                                 logar(f"[SEMINOVOS] Filtro Transmissão aplicado: {transmissao_valor}")
                                 break
                 except Exception as e:
@@ -3047,7 +6014,7 @@ def scraping_seminovos(filtros):
                         for option in options:
                             if cor_valor.lower() in option.text.lower():
                                 option.click()
-                                time.sleep(0.5)
+                                esperar_condicao(option.is_selected, 'Seminovos', 'filtro_select', timeout=2)
                                 logar(f"[SEMINOVOS] Filtro Cor aplicado: {cor_valor}")
                                 break
                 except Exception as e:
@@ -3063,13 +6030,13 @@ def scraping_seminovos(filtros):
                         for option in options:
                             if tipo_valor.lower() in option.text.lower():
                                 option.click()
-                                time.sleep(0.5)
+                                esperar_condicao(option.is_selected, 'Seminovos', 'filtro_select', timeout=2)
                                 logar(f"[SEMINOVOS] Filtro Tipo de Veículo aplicado: {tipo_valor}")
                                 break
                 except Exception as e:
                     logar(f"[SEMINOVOS] Aviso: Nao foi possivel aplicar filtro de tipo: {e}")
 
-            time.sleep(1)
+            esperar_rede_ociosa(driver, 'Seminovos', 'aplicar_filtros')
         except Exception as e:
             logar(f"[SEMINOVOS] Aviso: Erro ao aplicar filtros dinamicos: {e}")
 
@@ -3118,7 +6085,15 @@ def scraping_seminovos(filtros):
                 return False
             return False
 
-        max_cycles = 120
+        def _total_anuncios():
+            return driver.execute_script("return document.getElementsByClassName('anuncio-container').length;")
+
+        def _aguardar_novos(antes, timeout):
+            # wait for new cards after a scroll/click, then for the count to settle
+            if esperar_condicao(lambda: _total_anuncios() > antes, 'Seminovos', 'carregar_mais', timeout=timeout):
+                esperar_cards_estaveis(driver, ".anuncio-container", 'Seminovos', 'carregar_mais_estavel', timeout=3, estabilidade=0.3)
+
+        max_cycles = limite_paginas(120)
         last_total = 0
         while not should_stop() and max_cycles > 0:
             max_cycles -= 1
@@ -3128,7 +6103,7 @@ def scraping_seminovos(filtros):
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             except Exception:
                 pass
-            time.sleep(0.6)
+            esperar_rede_ociosa(driver, 'Seminovos', 'rolagem', timeout=2, ociosidade=0.3)
 
             # try to locate load more button
             btn = _find_load_more_button()
@@ -3144,7 +6119,8 @@ def scraping_seminovos(filtros):
                         driver.execute_script("arguments[0].scrollIntoView(true);", btn)
                     except Exception:
                         pass
-                    time.sleep(0.3)
+                    esperar_condicao(btn.is_displayed, 'Seminovos', 'botao_carregar_mais', timeout=1)
+                    pausa_entre_paginas()
                     try:
                         btn.click()
                     except Exception:
@@ -3153,10 +6129,9 @@ def scraping_seminovos(filtros):
                         except Exception:
                             pass
 
-                    # after click, keep scrolling a bit to allow loading
-                    for _ in range(4):
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(0.6)
+                    # after click, scroll and wait for the new cards to arrive
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    _aguardar_novos(last_total, 2.4)
 
                     # if after click the button becomes disabled, we are done
                     try:
@@ -3179,10 +6154,9 @@ def scraping_seminovos(filtros):
 
                 # if no growth after this iteration, assume no more results and stop
                 if total_now == last_total:
-                    # final attempts: try scrolling a couple more times then break
-                    for _ in range(3):
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(0.6)
+                    # final attempt: scroll again and give new cards a moment before stopping
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    _aguardar_novos(last_total, 1.8)
                     try:
                         total_now = len(driver.find_elements(By.CLASS_NAME, "anuncio-container"))
                     except Exception:
@@ -3193,13 +6167,12 @@ def scraping_seminovos(filtros):
                 last_total = total_now
                 continue
 
-            # if no button found, do a few scrolls and check if new items appeared; if not, break
-            for _ in range(3):
-                try:
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                except Exception:
-                    pass
-                time.sleep(0.6)
+            # if no button found, scroll and check if new items appeared; if not, break
+            try:
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            except Exception:
+                pass
+            _aguardar_novos(last_total, 1.8)
             try:
                 total_now = len(driver.find_elements(By.CLASS_NAME, "anuncio-container"))
             except Exception:
@@ -3418,13 +6391,14 @@ def scraping_seminovos(filtros):
         # FASE 2: Abrir página de detalhe para cada link coletado
         if filtros.get('capture_details', False):
             logar(f"[SEMINOVOS] FASE 2: Capturando detalhes de {len(cars_to_process)} anúncios...")
+            forbidden_words = filtros.get('forbiddenWords', [])
+            por_link = {}
             for idx, (car_data, link) in enumerate(cars_to_process):
                 if should_stop():
                     break
                 try:
                     logar(f"[SEMINOVOS] Processando detalhe {idx+1}/{len(cars_to_process)}: {car_data.get('Nome do Carro', '')}")
 
-                    details = None
                     # If the collected link looks like the listing page or is empty, try to use the JSON-LD parsed earlier
                     bad_link = False
                     try:
@@ -3440,92 +6414,222 @@ def scraping_seminovos(filtros):
                     if bad_link and car_data.get('_json_ld'):
                         log_seminovos(f"Link de detalhe possivelmente inválido ('{link}'), usando JSON-LD como fallback para '{car_data.get('Nome do Carro', '')}'")
                         try:
-                            json_ld = car_data.get('_json_ld') or {}
-                            details = {}
-                            details['quilometragem'] = json_ld.get('mileageFromOdometer', {}).get('value', '') if isinstance(json_ld, dict) else ''
-                            details['cambio'] = json_ld.get('vehicleTransmission', '') if isinstance(json_ld, dict) else ''
-                            details['ano'] = json_ld.get('productionDate', '') if isinstance(json_ld, dict) else ''
-                            details['portas'] = json_ld.get('numberOfDoors', '') if isinstance(json_ld, dict) else ''
-                            details['combustivel'] = json_ld.get('fuelType', '') if isinstance(json_ld, dict) else ''
-                            details['cor'] = json_ld.get('color', '') if isinstance(json_ld, dict) else ''
-                            details['descricao'] = json_ld.get('description', '') if isinstance(json_ld, dict) else ''
-                            details['palavrasProibidas'] = []
+                            _aplicar_detalhes_seminovos(car_data, _detalhes_seminovos_json_ld(car_data.get('_json_ld')))
                         except Exception as e:
                             log_seminovos(f"Erro ao usar JSON-LD fallback: {e}")
-                            details = None
+                        add_dado(car_data)
+                    elif link:
+                        # valid detail link: queued for the tab pool below
+                        por_link.setdefault(link, []).append(car_data)
                     else:
-                        # If link looks valid, open detail page
-                        if link:
-                            details = extract_details_seminovos(driver, link, filtros.get('forbiddenWords', []))
-
-                    if details:
-                            quil = details.get("quilometragem", "")
-                            camb = details.get("cambio", "")
-                            ano_v = details.get("ano", "")
-                            portas_v = details.get("portas", "")
-                            combust_v = details.get("combustivel", "")
-                            cor_v = details.get("cor", "")
-                            desc_v = details.get("descricao", "")
-                            palavras = details.get("palavrasProibidas", [])
-
-                            car_data["Quilometragem"] = quil
-                            car_data["quilometragem"] = quil
-                            car_data["KM"] = car_data.get("KM") or quil
-
-                            car_data["Cambio"] = camb
-                            car_data["cambio"] = camb
-                            car_data["Câmbio"] = camb
-
-                            car_data["Ano"] = ano_v
-                            car_data["Portas"] = portas_v
-                            car_data["Combustivel"] = combust_v
-                            car_data["combustivel"] = combust_v
-
-                            car_data["Cor"] = cor_v
-                            car_data["Descricao"] = desc_v
-                            car_data["descricao"] = desc_v
-                            car_data["Descrição"] = desc_v
-
-                            car_data["Palavras Proibidas"] = palavras
-                            car_data["palavrasProibidas"] = palavras
-
-                            if palavras:
-                                logar(f"[SEMINOVOS] Palavras proibidas encontradas: {car_data.get('Nome do Carro', '')} - {palavras}")
-
-                    add_dado(car_data)
+                        add_dado(car_data)
                 except Exception as e:
                     logar(f"[SEMINOVOS] Erro ao processar detalhe: {e}")
                     add_dado(car_data)
                     continue
+
+            # Ads unchanged since a previous run reuse their details; the rest come over HTTP
+            # with the browser session or from a bounded pool of tabs, added as each completes
+            reaproveitar_detalhes('Seminovos', por_link, forbidden_words, _aplicar_detalhes_seminovos)
+            try:
+                for link, details in coletar_detalhes_hibrido(driver, list(por_link), 'Seminovos', extract_details_seminovos_from_html,
+                                                              forbidden_words, filtros,
+                                                              ".part-items-detalhes-icones, .part-sobre-veiculo-acessorios",
+                                                              lambda d: _ler_detalhes_seminovos(d, forbidden_words)):
+                    for car_data in por_link.pop(link, []):
+                        if details:
+                            SEEN_LISTINGS.registrar('Seminovos', car_data, details, forbidden_words)
+                            _aplicar_detalhes_seminovos(car_data, details)
+                        add_dado(car_data)
+            except Exception as e:
+                logar(f"[SEMINOVOS] Erro ao processar detalhe: {e}")
+            if not should_stop():
+                for restantes in por_link.values():
+                    for car_data in restantes:
+                        add_dado(car_data)
             logar(f"[SEMINOVOS] FASE 2 concluída")
         else:
             # Se não capturar detalhes, apenas adiciona os dados básicos
             for car_data, _ in cars_to_process:
                 add_dado(car_data)
 
-        driver.quit()
+        liberar_driver(driver)
 
     except Exception as e:
         logar(f"[ERRO] Seminovos - Erro: {str(e)}")
 
-def scraping_localiza(filtros):
+# Generic in-browser card extractor driven by an ordered selector spec per field.
+# spec = {'cards': css, 'campos': {campo: {'seletores': [...], 'modo': ..., 'attrs': [...]}}}
+#   modo 'primeiro': first selector (in order) with a match, first element
+#   modo 'juntar':   every element of every selector, unique non-empty values in order
+#   modo 'lista':    every element matching any selector, in document order
+#   attrs: properties/attributes tried in order; omitted means the rendered text
+# Each card also carries '_seletores': {campo: selector that matched}.
+CARD_EXTRACTOR_JS = r"""
+const spec = arguments[0];
+const ler = (el, attrs) => {
+    if (!attrs) return ((el.innerText || el.textContent) || '').trim();
+    for (const a of attrs) {
+        const v = (typeof el[a] === 'string') ? el[a] : el.getAttribute(a);
+        if (v) return v;
+    }
+    return '';
+};
+return Array.from(document.querySelectorAll(spec.cards)).map(card => {
+    const out = {}, usados = {};
+    for (const [campo, f] of Object.entries(spec.campos)) {
+        const modo = f.modo || 'primeiro';
+        if (modo === 'lista') {
+            out[campo] = Array.from(card.querySelectorAll(f.seletores.join(', '))).map(el => ler(el, f.attrs));
+            if (out[campo].length) usados[campo] = f.seletores.join(', ');
+        } else if (modo === 'juntar') {
+            out[campo] = [];
+            for (const sel of f.seletores) {
+                for (const el of card.querySelectorAll(sel)) {
+                    const v = ler(el, f.attrs);
+                    if (v && !out[campo].includes(v)) {
+                        out[campo].push(v);
+                        if (!usados[campo]) usados[campo] = sel;
+                    }
+                }
+            }
+        } else {
+            out[campo] = '';
+            for (const sel of f.seletores) {
+                const el = card.querySelector(sel);
+                if (el) { out[campo] = ler(el, f.attrs); usados[campo] = sel; break; }
+            }
+        }
+    }
+    out._seletores = usados;
+    return out;
+});
+"""
+
+
+def _extrair_cards_spec_selenium(driver, spec: dict) -> list:
+    """Per-element fallback of CARD_EXTRACTOR_JS with the same spec semantics."""
+    def ler(el, attrs):
+        if not attrs:
+            return (el.text or '').strip()
+        for a in attrs:
+            v = el.get_attribute(a)
+            if v:
+                return v
+        return ''
+
+    resultado = []
+    for card in driver.find_elements(By.CSS_SELECTOR, spec['cards']):
+        out, usados = {}, {}
+        for campo, f in spec['campos'].items():
+            modo = f.get('modo', 'primeiro')
+            try:
+                if modo == 'lista':
+                    out[campo] = [ler(el, f.get('attrs')) for el in card.find_elements(By.CSS_SELECTOR, ', '.join(f['seletores']))]
+                    if out[campo]:
+                        usados[campo] = ', '.join(f['seletores'])
+                elif modo == 'juntar':
+                    out[campo] = []
+                    for sel in f['seletores']:
+                        for el in card.find_elements(By.CSS_SELECTOR, sel):
+                            v = ler(el, f.get('attrs'))
+                            if v and v not in out[campo]:
+                                out[campo].append(v)
+                                usados.setdefault(campo, sel)
+                else:
+                    out[campo] = ''
+                    for sel in f['seletores']:
+                        els = card.find_elements(By.CSS_SELECTOR, sel)
+                        if els:
+                            out[campo] = ler(els[0], f.get('attrs'))
+                            usados[campo] = sel
+                            break
+            except Exception:
+                out.setdefault(campo, [] if modo in ('lista', 'juntar') else '')
+        out['_seletores'] = usados
+        resultado.append(out)
+    return resultado
+
+
+def extrair_cards_spec(driver, spec: dict, tag: str = '') -> list:
+    """Extract every card described by spec in one execute_script call.
+
+    Falls back to per-element reads if the script fails. Logs which selector
+    matched each field (and how many cards used it) so broken fallbacks show up.
+    """
     try:
-        options = Options()
-        options.headless = True
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
+        cards = driver.execute_script(CARD_EXTRACTOR_JS, spec)
+        if not isinstance(cards, list):
+            raise ValueError(f"retorno inesperado: {type(cards).__name__}")
+    except Exception as e:
+        logar(f"{tag} Extracao em lote falhou, usando leitura por elemento: {e}")
+        cards = _extrair_cards_spec_selenium(driver, spec)
+    if cards:
+        uso = {}
+        for card in cards:
+            for campo, sel in (card.get('_seletores') or {}).items():
+                uso.setdefault(campo, {}).setdefault(sel, 0)
+                uso[campo][sel] += 1
+        resumo = '; '.join(
+            f"{campo}: " + ', '.join(f"{sel} ({n})" for sel, n in sels.items())
+            for campo, sels in uso.items()
+        )
+        logar(f"{tag} {len(cards)} cards; seletores usados -> {resumo}")
+    return cards
+
+
+LOCALIZA_CARD_SPEC = {
+    'cards': '[data-testid="product-card-standard"], .mui-1fobd63, .product-card',
+    'campos': {
+        'nome': {'seletores': ["h2", "[data-testid='product-card-title']", ".name-vehicle", ".title"]},
+        'imagem': {'seletores': ["img", "picture img"], 'attrs': ["src", "data-src"]},
+        'valor': {'seletores': ["h3", "[data-testid='product-card-price']", ".price-vehicle"]},
+        'km': {'seletores': [".mui-rsig1c, .details, [class*='km'], li"]},
+        'local': {'seletores': [".mui-12ksvqc", "[class*='location']", ".details"]},
+        'link': {'seletores': ["a", "[data-testid='product-card-anchor']"], 'attrs': ["href", "data-href"]},
+    },
+}
 
-        driver = webdriver.Firefox(service=Service(), options=options)
-        try:
-            global current_driver
-            current_driver = driver
-        except Exception:
-            pass
+UNIDAS_CARD_SPEC = {
+    'cards': ".new-card, .card, [class*='vehicle-card']",
+    'campos': {
+        'nome': {'seletores': [".name-vehicle", ".info-vehicle", "h2", "h3", ".title", ".vehicle-name"], 'modo': 'juntar'},
+        'imagem': {'seletores': [".card-image", "img", "picture img"], 'attrs': ["src", "data-src"]},
+        'valor': {'seletores': [".price-vehicle", "[class*='price']", "h3", "strong.price"]},
+        'detalhes': {'seletores': [".details", "li", "[class*='km']", "[class*='local']"], 'modo': 'lista'},
+        'link': {'seletores': ["a", "[data-testid='card-link']"], 'attrs': ["href"]},
+    },
+}
+
+
+def _aplicar_detalhes_localiza(car_data, details):
+    quil = details.get("quilometragem", "")
+    camb = details.get("cambio", "")
+    desc_v = details.get("descricao", "")
+    if quil and car_data.get("KM") in ("", "N/A", None):
+        car_data["KM"] = quil
+    car_data["Quilometragem"] = quil
+    car_data["Cambio"] = camb
+    car_data["Câmbio"] = camb
+    car_data["Ano"] = details.get("ano", "")
+    car_data["Portas"] = details.get("portas", "")
+    car_data["Combustivel"] = details.get("combustivel", "")
+    car_data["Cor"] = details.get("cor", "")
+    car_data["Descricao"] = desc_v
+    car_data["Descrição"] = desc_v
+    car_data["Palavras Proibidas"] = details.get("palavrasProibidas", [])
+
+
+def scraping_localiza(filtros):
+    try:
+        driver = obter_driver('Localiza')
 
         # Cidade padrao: mg-belo-horizonte
         cidade_uf = filtros.get("cidadeUf", filtros.get("cidade_uf", "mg-belo-horizonte")).lower()
         page = 1
         encontrados_total = 0
+        capture_details = filtros.get('capture_details', False)
+        forbidden_words = filtros.get('forbiddenWords', [])
 
         while not should_stop():
             extra = []
@@ -3554,86 +6658,30 @@ def scraping_localiza(filtros):
             url = f"https://seminovos.localiza.com/carros/{cidade_uf}{path_suffix}?page={page}{q}"
             logar(f"[LOCALIZA] Acessando: {url}")
             driver.get(url)
-            time.sleep(3)
+            esperar_cards_estaveis(driver, LOCALIZA_CARD_SPEC['cards'], 'Localiza', 'listagem')
 
-            cards = driver.find_elements(By.CSS_SELECTOR, '[data-testid="product-card-standard"], .mui-1fobd63, .product-card')
+            cards = extrair_cards_spec(driver, LOCALIZA_CARD_SPEC, '[LOCALIZA]')
             if not cards:
                 logar("[LOCALIZA] Nenhum card encontrado. Encerrando.")
                 break
 
+            carros_pagina = []
+
             for card in cards:
                 if should_stop():
                     break
                 try:
-                    # Nome
-                    nome = ""
-                    nome_el = None
-                    for sel in ["h2", "[data-testid='product-card-title']", ".name-vehicle", ".title"]:
-                        els = card.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            nome_el = els[0]
-                            break
-                    if nome_el:
-                        nome = nome_el.text.replace("\n", " ").strip()
-
-                    # Imagem
-                    imagem = ""
-                    img_el = None
-                    for sel in ["img", "picture img"]:
-                        els = card.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            img_el = els[0]
-                            break
-                    if img_el:
-                        imagem = img_el.get_attribute("src") or img_el.get_attribute("data-src") or ""
-
-                    # Valor
-                    valor = ""
-                    preco_el = None
-                    for sel in ["h3", "[data-testid='product-card-price']", ".price-vehicle"]:
-                        els = card.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            preco_el = els[0]
-                            break
-                    if preco_el:
-                        valor = preco_el.text.split("\n")[0].strip()
-
-                    # KM
-                    km = "N/A"
-                    detalhes = card.find_elements(By.CSS_SELECTOR, ".mui-rsig1c, .details, [class*='km'], li")
-                    if detalhes:
-                        try:
-                            km = detalhes[0].text.strip()
-                        except:
-                            pass
-
-                    # Local
-                    local = ""
-                    local_el = None
-                    for sel in [".mui-12ksvqc", "[class*='location']", ".details"]:
-                        els = card.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            local_el = els[0]
-                            break
-                    if local_el:
-                        local = local_el.text.strip()
-
-                    # Link
-                    link = ""
-                    a_el = None
-                    for sel in ["a", "[data-testid='product-card-anchor']"]:
-                        els = card.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            a_el = els[0]
-                            break
-                    if a_el:
-                        href = a_el.get_attribute("href") or a_el.get_attribute("data-href") or ""
-                        if href and href.startswith("/"):
-                            href = "https://seminovos.localiza.com" + href
-                        link = href
+                    nome = (card.get('nome') or '').replace("\n", " ").strip()
+                    imagem = card.get('imagem') or ""
+                    valor = (card.get('valor') or '').split("\n")[0].strip()
+                    km = card['km'].strip() if 'km' in card.get('_seletores', {}) else "N/A"
+                    local = (card.get('local') or '').strip()
+                    link = card.get('link') or ""
+                    if link and link.startswith("/"):
+                        link = "https://seminovos.localiza.com" + link
 
                     if nome:
-                        add_dado({
+                        carros_pagina.append({
                             "Nome do Carro": nome,
                             "Valor": valor,
                             "KM": km,
@@ -3646,30 +6694,45 @@ def scraping_localiza(filtros):
                 except Exception:
                     continue
 
+            por_link = {}
+            for car_data in carros_pagina:
+                if capture_details and car_data["Link"]:
+                    por_link.setdefault(car_data["Link"], []).append(car_data)
+                else:
+                    add_dado(car_data)
+            reaproveitar_detalhes('Localiza', por_link, forbidden_words, _aplicar_detalhes_localiza)
+            if por_link:
+                try:
+                    for link, details in coletar_detalhes_hibrido(driver, list(por_link), 'Localiza', extract_localiza_details_from_html,
+                                                                  forbidden_words, filtros, 'script[type="application/ld+json"]'):
+                        for car_data in por_link.pop(link, []):
+                            if details:
+                                # hash the list-view fields, before the details replace KM 'N/A'
+                                SEEN_LISTINGS.registrar('Localiza', car_data, details, forbidden_words)
+                                _aplicar_detalhes_localiza(car_data, details)
+                            add_dado(car_data)
+                except Exception as e:
+                    logar(f"[LOCALIZA] Erro ao capturar detalhes: {e}")
+                if not should_stop():
+                    for restantes in por_link.values():
+                        for car_data in restantes:
+                            add_dado(car_data)
+
             # Tentativa de proxima pagina
             page += 1
-            if page > 20:
+            if page > limite_paginas(20):
                 break
+            pausa_entre_paginas()
 
         logar(f"[LOCALIZA] Coletados {encontrados_total} itens.")
-        driver.quit()
+        liberar_driver(driver)
     except Exception as e:
         logar(f"[ERRO] Localiza - Erro: {str(e)}")
 
 
 def scraping_unidas(filtros):
     try:
-        options = Options()
-        options.headless = True
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-
-        driver = webdriver.Firefox(service=Service(), options=options)
-        try:
-            global current_driver
-            current_driver = driver
-        except Exception:
-            pass
+        driver = obter_driver('Unidas')
 
         page = 1
         encontrados_total = 0
@@ -3760,7 +6823,7 @@ def scraping_unidas(filtros):
             url = f"{base_prefix}?page={page}&perpage=24&order=destaque:desc&layout=grid"
             logar(f"[UNIDAS] Acessando: {url}")
             driver.get(url)
-            time.sleep(3)
+            esperar_cards_estaveis(driver, UNIDAS_CARD_SPEC['cards'], 'Unidas', 'listagem')
 
             # Fecha possiveis modais de geolocalizacao
             try:
@@ -3768,9 +6831,9 @@ def scraping_unidas(filtros):
                 for modal in modals:
                     try:
                         driver.execute_script("arguments[0].scrollIntoView(true);", modal)
-                        time.sleep(0.5)
+                        esperar_condicao(modal.is_displayed, 'Unidas', 'modal_geo', timeout=1)
                         modal.click()
-                        time.sleep(0.5)
+                        esperar_condicao(lambda: not modal.is_displayed(), 'Unidas', 'fechar_modal_geo', timeout=1)
                     except Exception:
                         try:
                             driver.execute_script("arguments[0].click();", modal)
@@ -3789,10 +6852,8 @@ def scraping_unidas(filtros):
                         try:
                             el = driver.find_element(By.CSS_SELECTOR, sel)
                             driver.execute_script("arguments[0].scrollIntoView(true);", el)
-                            time.sleep(0.3)
                             el.click()
                             clicked = True
-                            time.sleep(0.6)
                             break
                         except Exception:
                             continue
@@ -3804,25 +6865,20 @@ def scraping_unidas(filtros):
                             city_to_type = str(cidade_raw)
                             inp = WebDriverWait(driver, 3).until(EC.presence_of_element_located((By.ID, 'geo-city-select')))
                             driver.execute_script("arguments[0].value = ''; arguments[0].dispatchEvent(new Event('input'))", inp)
-                            time.sleep(0.2)
                             inp.send_keys(city_to_type)
-                            time.sleep(1.0)
                             # trigger input event via JS to notify frameworks
                             driver.execute_script("var e = new Event('input', {bubbles:true}); document.getElementById('geo-city-select').dispatchEvent(e);")
-                            time.sleep(1.0)
 
                             # Try to select first suggestion if appears
+                            sugestoes = esperar_elemento(driver, '.geo-modal-list li, .suggestion-item, .vue-geo-suggestion', 'Unidas', 'sugestao_cidade', timeout=2)
                             try:
-                                first_sugg = driver.find_element(By.CSS_SELECTOR, '.geo-modal-list li, .suggestion-item, .vue-geo-suggestion')
+                                first_sugg = sugestoes[0]
                                 driver.execute_script("arguments[0].scrollIntoView(true);", first_sugg)
-                                time.sleep(0.2)
                                 first_sugg.click()
-                                time.sleep(0.4)
                             except Exception:
                                 # fallback: press Enter
                                 try:
                                     inp.send_keys('\n')
-                                    time.sleep(0.5)
                                 except Exception:
                                     pass
 
@@ -3831,7 +6887,7 @@ def scraping_unidas(filtros):
                                 confirm = driver.find_element(By.CSS_SELECTOR, '.geo-modal-button-confirm')
                                 if confirm and confirm.is_enabled():
                                     driver.execute_script("arguments[0].click();", confirm)
-                                    time.sleep(0.8)
+                                    esperar_rede_ociosa(driver, 'Unidas', 'confirmar_cidade', timeout=3)
                             except Exception:
                                 pass
                         except Exception:
@@ -3842,7 +6898,7 @@ def scraping_unidas(filtros):
             # Track count before processing page to detect no-new-results condition
             before_count = encontrados_total
 
-            cards = driver.find_elements(By.CSS_SELECTOR, ".new-card, .card, [class*='vehicle-card']")
+            cards = extrair_cards_spec(driver, UNIDAS_CARD_SPEC, '[UNIDAS]')
             if not cards:
                 logar("[UNIDAS] Nenhum card encontrado nesta página. Encerrando.")
                 break
@@ -3852,66 +6908,26 @@ def scraping_unidas(filtros):
                     break
                 try:
                     # Nome (junta nome + info)
-                    nome = ""
-                    nome_parts = []
-                    for sel in [".name-vehicle", ".info-vehicle", "h2", "h3", ".title", ".vehicle-name"]:
-                        for el in card.find_elements(By.CSS_SELECTOR, sel):
-                            t = el.text.strip()
-                            if t and t not in nome_parts:
-                                nome_parts.append(t)
-                    nome = (" ".join(nome_parts)).strip()
-
-                    # Imagem
-                    imagem = ""
-                    img_el = None
-                    for sel in [".card-image", "img", "picture img"]:
-                        els = card.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            img_el = els[0]
-                            break
-                    if img_el:
-                        imagem = img_el.get_attribute("src") or img_el.get_attribute("data-src") or ""
-
-                    # Valor
-                    valor = ""
-                    preco_el = None
-                    for sel in [".price-vehicle", "[class*='price']", "h3", "strong.price"]:
-                        els = card.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            preco_el = els[0]
-                            break
-                    if preco_el:
-                        valor = preco_el.text.strip()
+                    nome = (" ".join(card.get('nome') or [])).strip()
+                    imagem = card.get('imagem') or ""
+                    valor = (card.get('valor') or '').strip()
 
                     # KM e Local
                     km = "N/A"
                     local = ""
-                    details = card.find_elements(By.CSS_SELECTOR, ".details, li, [class*='km'], [class*='local']")
-                    if details:
-                        try:
-                            if len(details) > 1:
-                                km = details[1].text.strip() or km
-                                local = details[0].text.strip() or local
-                            else:
-                                for d in details:
-                                    txt = d.text.lower()
-                                    if 'km' in txt:
-                                        km = d.text.strip()
-                                    if any(k in txt for k in ['bh', 'belo', 'mg']):
-                                        local = d.text.strip()
-                        except:
-                            pass
+                    details = [d.strip() for d in (card.get('detalhes') or [])]
+                    if len(details) > 1:
+                        km = details[1] or km
+                        local = details[0] or local
+                    else:
+                        for d in details:
+                            txt = d.lower()
+                            if 'km' in txt:
+                                km = d
+                            if any(k in txt for k in ['bh', 'belo', 'mg']):
+                                local = d
 
-                    # Link
-                    link = ""
-                    a_el = None
-                    for sel in ["a", "[data-testid='card-link']"]:
-                        els = card.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            a_el = els[0]
-                            break
-                    if a_el:
-                        link = a_el.get_attribute("href") or ""
+                    link = card.get('link') or ""
 
                     if nome:
                         add_dado({
@@ -3933,19 +6949,84 @@ def scraping_unidas(filtros):
                 break
 
             page += 1
-            if page > 40:
+            if page > limite_paginas(40):
                 break
+            pausa_entre_paginas()
 
         logar(f"[UNIDAS] Coletados {encontrados_total} itens.")
-        driver.quit()
+        liberar_driver(driver)
     except Exception as e:
         logar(f"[ERRO] Unidas - Erro: {str(e)}")
 
 
-def executar_scraping(filtros_json):
-    global dados_carros, parar_scraping
+PORTAIS = [
+    ('OLX', scraping_olx),
+    ('Webmotors', scraping_webmotors),
+    ('Mercado Livre', scraping_mercado_livre),
+    ('Seminovos', scraping_seminovos),
+    ('Localiza', scraping_localiza),
+    ('Unidas', scraping_unidas),
+]
+
+
+def _executar_portal(nome, func, filtros):
+    inicio = time.time()
+    logar(f"[PORTAIS] {nome}: iniciado")
+    try:
+        func(filtros)
+    except Exception as e:
+        logar(f"[ERRO] {nome} - Erro inesperado: {e}")
+    finally:
+        # Portals that bailed out through an exception never returned their driver
+        DRIVER_POOL.liberar_da_thread()
+    logar(f"[PORTAIS] {nome}: finalizado em {time.time() - inicio:.1f}s")
+
+
+def executar_portais(selecionados, filtros):
+    """Run the selected portals concurrently, one worker (and one driver) per portal.
+
+    Every portal still reports through add_dado, so results stream out as a single
+    sequence. The coordinator polls should_stop() while waiting so an external stop
+    signal quits every live driver, even when the workers are blocked on I/O.
+    """
+    if not selecionados:
+        return
+    try:
+        max_workers = int(filtros.get('parallel_portals') or len(selecionados))
+    except Exception:
+        max_workers = len(selecionados)
+    max_workers = max(1, min(max_workers, len(selecionados)))
+
+    if max_workers == 1:
+        for nome, func in selecionados:
+            if should_stop():
+                break
+            _executar_portal(nome, func, filtros)
+        return
+
+    logar(f"[PORTAIS] Executando {len(selecionados)} portais com {max_workers} workers em paralelo")
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='portal')
+    try:
+        pendentes = {executor.submit(_executar_portal, nome, func, filtros) for nome, func in selecionados}
+        while pendentes:
+            _, pendentes = wait(pendentes, timeout=1.0, return_when=FIRST_COMPLETED)
+            if should_stop():
+                for fut in pendentes:
+                    fut.cancel()
+                # workers notice the stop flag on their next should_stop() check
+                wait(pendentes, timeout=30)
+                break
+    finally:
+        executor.shutdown(wait=False)
+
+
+def executar_scraping(filtros_json, retomar: str = None):
+    """Run the selected portals. retomar: journal of a stopped run to continue (its filtros
+    are used and its records are kept instead of being scraped again)."""
+    global dados_carros, parar_scraping, ZENROWS_HEDGE, LEAN_BROWSING, EXPORTADOR
     dados_carros = []
     parar_scraping = False
+    JOURNAL.links_coletados = set()
 
     try:
         logar(f"[DEBUG] JSON recebido: {repr(filtros_json)}")
@@ -3969,6 +7050,16 @@ def executar_scraping(filtros_json):
 
         logar("[INICIO] Iniciando scraping de carros...")
 
+        anteriores = []
+        if retomar:
+            filtros_anteriores, anteriores, status = JournalExecucao.ler(retomar)
+            if status == 'concluido':
+                logar(f"[JOURNAL] {retomar} ja foi concluida; nada para retomar")
+                return resultado_json([])
+            if filtros_anteriores:
+                filtros = dict(filtros_anteriores, **{k: filtros[k] for k in JOURNAL_CHAVES_SECRETAS if filtros.get(k)})
+            logar(f"[JOURNAL] Retomando {retomar}: {len(anteriores)} registros ja coletados")
+
         allowed = set()
         portals = filtros.get('portals')
         if isinstance(portals, list) and portals:
@@ -3980,50 +7071,89 @@ def executar_scraping(filtros_json):
         def can(p: str) -> bool:
             return (len(allowed) == 0) or (p in allowed)
 
-        if can('OLX'):
-            scraping_olx(filtros)
-        if can('Webmotors'):
-            scraping_webmotors(filtros)
-        if can('Mercado Livre'):
-            scraping_mercado_livre(filtros)
-        if can('Seminovos'):
-            scraping_seminovos(filtros)
-        if can('Localiza'):
-            scraping_localiza(filtros)
-        if can('Unidas'):
-            scraping_unidas(filtros)
-
+        aplicar_perfil_velocidade(filtros)
+
+        if 'zenrows_hedge' in filtros:
+            ZENROWS_HEDGE = bool(filtros.get('zenrows_hedge'))
+        if 'lean_browsing' in filtros:
+            LEAN_BROWSING = bool(filtros.get('lean_browsing'))
+        PAGE_CACHE.configurar(bool(filtros.get('page_cache', True)),
+                              {'listagem': filtros.get('cache_ttl_listagem'), 'detalhe': filtros.get('cache_ttl_detalhe')})
+        SEEN_LISTINGS.ativo = bool(filtros.get('incremental', True))
+        INDICE_DUPLICADOS.limpar()
+        INDICE_DUPLICADOS.ativo = bool(filtros.get('deduplicar', True))
+        EXPORTADOR = ExportadorStreaming("anuncios_carros.xlsx").iniciar()
+        for dado in map(Listing.de_dict, anteriores):
+            dados_carros.append(dado)
+            EXPORTADOR.adicionar(dado)
+            INDICE_DUPLICADOS.registrar(dado)
+            if dado.get('Link'):
+                JOURNAL.links_coletados.add(dado['Link'])
+            emitir_evento('dado', dado)
+        JOURNAL.abrir(filtros, retomar)
+        HASH_IMAGENS.configurar(bool(filtros.get('image_hash', False)), bool(filtros.get('image_hash_offline', False)))
+
+        selecionados = [(nome, func) for nome, func in PORTAIS if can(nome)]
+        executar_portais(selecionados, filtros)
+        JOURNAL.fechar('parado' if parar_scraping else 'concluido', len(dados_carros))
+        HASH_IMAGENS.finalizar()
+        if HASH_IMAGENS.repetidos:
+            logar(f"[IMAGENS] {HASH_IMAGENS.repetidos} anuncios com fotos repetidas")
+        PAGE_CACHE.salvar()
+        logar(f"[CACHE] {PAGE_CACHE.relatorio()}")
+        SEEN_LISTINGS.salvar()
+        logar(f"[VISTOS] {SEEN_LISTINGS.stats}")
+        if INDICE_DUPLICADOS.mesclados:
+            logar(f"[DUPLICADO] {INDICE_DUPLICADOS.mesclados} anuncios mesclados entre portais")
+
+        planilha, linhas = fechar_exportacao(dados_carros)
         if dados_carros:
-            df = pd.DataFrame(dados_carros)
-            df.to_excel("anuncios_carros.xlsx", index=False)
-            logar(f"[OK] Planilha 'anuncios_carros.xlsx' gerada com {len(dados_carros)} carros.")
-            try:
-                print("EVENT_EXCEL_SAVED:anuncios_carros.xlsx")
-                sys.stdout.flush()
-            except Exception:
-                pass
+            if planilha:
+                logar(f"[OK] Planilha '{planilha}' gerada com {linhas} linhas.")
+                emitir_evento('planilha', planilha)
 
-            return json.dumps(dados_carros, ensure_ascii=False)
+            return resultado_json(dados_carros)
         else:
             logar("[AVISO] Nenhum carro encontrado.")
-            return json.dumps([])
+            return resultado_json([])
 
     except Exception as e:
         logar(f"[ERRO] Erro geral: {str(e)}")
-        return json.dumps([])
+        fechar_exportacao(dados_carros)
+        # over IPC the streamed records stay valid; the text result keeps the old empty list
+        return resultado_json(dados_carros) if CANAL_IPC.ativo else json.dumps([])
 
 if __name__ == "__main__":
     SEMINOVOS_VERBOSE = False
-    if len(sys.argv) > 1:
+    if '--ipc' in sys.argv:
+        sys.argv.remove('--ipc')
+        CANAL_IPC.iniciar()
+    if len(sys.argv) > 1 and sys.argv[1] in ('--recuperar', '--retomar'):
+        # journal commands: --recuperar [journal.jsonl] | --retomar [journal.jsonl]
+        journal = sys.argv[2] if len(sys.argv) > 2 else JournalExecucao.ultimo()
+        if sys.argv[1] == '--recuperar':
+            resultado = recuperar_execucao(journal)
+        elif journal:
+            resultado = executar_scraping('{}', retomar=journal)
+        else:
+            logar("[JOURNAL] Nenhum journal encontrado para retomar")
+            resultado = json.dumps([])
+        emitir_resultado(resultado)
+        sys.exit(0)
+    elif len(sys.argv) > 1:
         filtros_json = sys.argv[1]
         flags = sys.argv[2:]
         if any(f in ['--verbose-seminovos', '--verbose', '-v'] for f in flags):
             SEMINOVOS_VERBOSE = True
             logar("[DEBUG] Seminovos verbose logging ativado via argumentos")
         resultado = executar_scraping(filtros_json)
-        print("RESULTADO_JSON:" + resultado)
+        emitir_resultado(resultado)
+        if CANAL_IPC.ativo:
+            # the result frame must be the last one; skip the GUI module's own __main__ below
+            sys.exit(0)
     else:
         logar("[ERRO] Uso: python car_scraper.py '{\"ano_min\": 2014, \"preco_max\": 20000}' [--verbose-seminovos]")
+        logar("[ERRO]      python car_scraper.py --recuperar|--retomar [journal/run_....jsonl]")
 
 
 
@@ -4095,21 +7225,175 @@ def remove_stop_signal():
         pass
 
 
+STATE_DB_FILE = os.path.join(os.getcwd(), "app_state.db")
+
+
+class AppStateDB:
+    """SQLite store for the GUI state: listings, likes, hidden, ranking, descriptions and settings.
+
+    Listings are written one row at a time as they arrive (upsert by link), the
+    small tables are rewritten inside one transaction on save. The legacy
+    app_state.json is imported once and renamed to app_state.json.migrado.
+    """
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS listings (
+            link TEXT PRIMARY KEY,
+            portal TEXT,
+            preco INTEGER,  -- centavos
+            km INTEGER,
+            ano INTEGER,
+            dados TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_listings_portal ON listings(portal);
+        CREATE INDEX IF NOT EXISTS idx_listings_preco ON listings(preco);
+        CREATE INDEX IF NOT EXISTS idx_listings_km ON listings(km);
+        CREATE INDEX IF NOT EXISTS idx_listings_ano ON listings(ano);
+        CREATE TABLE IF NOT EXISTS likes (link TEXT PRIMARY KEY, dados TEXT);
+        CREATE TABLE IF NOT EXISTS hidden (link TEXT PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS ranking (posicao INTEGER PRIMARY KEY, link TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS descriptions (link TEXT PRIMARY KEY, descricao TEXT);
+        CREATE TABLE IF NOT EXISTS settings (chave TEXT PRIMARY KEY, valor TEXT);
+    """
+
+    def __init__(self, path: str = STATE_DB_FILE, legado: str = STATE_FILE):
+        import sqlite3
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.ESQUEMA)
+        self._migrar(legado)
+
+    # fields that identify a record without a Link; merges and photo flags never change them
+    CAMPOS_SEM_LINK = ('Portal', 'Nome do Carro', 'Valor', 'Ano', 'KM')
+
+    @staticmethod
+    def _chave(item: Dict[str, Any]) -> str:
+        link = item.get('Link') or item.get('link') or ''
+        if link:
+            return link
+        import hashlib
+        campos = [str(item.get(c) or '') for c in AppStateDB.CAMPOS_SEM_LINK]
+        return 'sem-link:' + hashlib.sha1('|'.join(campos).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _linha(item: Dict[str, Any]) -> tuple:
+        item = registro_canonico(item)
+        return (AppStateDB._chave(item), item.get('Portal') or '',
+                item.get('preco_centavos'), item.get('km_num'), item.get('ano_num'),
+                json.dumps(item, ensure_ascii=False, default=str))
+
+    _UPSERT = ("INSERT INTO listings(link, portal, preco, km, ano, dados) VALUES (?, ?, ?, ?, ?, ?) "
+               "ON CONFLICT(link) DO UPDATE SET portal=excluded.portal, preco=excluded.preco, "
+               "km=excluded.km, ano=excluded.ano, dados=excluded.dados")
+
+    def salvar_listing(self, item: Dict[str, Any]):
+        with self._lock, self.conn:
+            self.conn.execute(self._UPSERT, self._linha(item))
+
+    def salvar_listings(self, itens: List[Dict[str, Any]]):
+        with self._lock, self.conn:
+            self.conn.executemany(self._UPSERT, [self._linha(i) for i in itens])
+
+    def limpar_listings(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM listings")
+
+    def remover_listing(self, link: str):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM listings WHERE link = ?", (link,))
+
+    def substituir_listings(self, itens: List[Dict[str, Any]]):
+        """Replace all listings; rows sharing a key (same Link) keep the last one, and the count is logged."""
+        linhas = [self._linha(i) for i in itens]
+        repetidos = len(linhas) - len({l[0] for l in linhas})
+        if repetidos:
+            print(f"Aviso: {repetidos} anúncios com Link repetido; mantida a última versão de cada um")
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM listings")
+            self.conn.executemany(self._UPSERT, linhas)
+
+    def salvar_estado(self, state: Dict[str, Any]):
+        """Rewrite the small tables (likes, hidden, ranking, descriptions, settings) in one transaction."""
+        cache = state.get('liked_items_cache', {}) or {}
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM likes")
+            self.conn.executemany("INSERT INTO likes(link, dados) VALUES (?, ?)",
+                                  [(l, json.dumps(cache.get(l), ensure_ascii=False, default=str) if l in cache else None)
+                                   for l in state.get('liked_items', [])])
+            self.conn.execute("DELETE FROM hidden")
+            self.conn.executemany("INSERT INTO hidden(link) VALUES (?)", [(l,) for l in state.get('hidden_items', [])])
+            self.conn.execute("DELETE FROM ranking")
+            self.conn.executemany("INSERT INTO ranking(posicao, link) VALUES (?, ?)",
+                                  list(enumerate(l for l in state.get('ranking_list', []) if l)))
+            self.conn.execute("DELETE FROM descriptions")
+            self.conn.executemany("INSERT INTO descriptions(link, descricao) VALUES (?, ?)",
+                                  list((state.get('ranking_descriptions') or {}).items()))
+            for chave in ('preferences', 'preference_order', 'scraping_speed'):
+                if chave in state:
+                    self.conn.execute("INSERT OR REPLACE INTO settings(chave, valor) VALUES (?, ?)",
+                                      (chave, json.dumps(state[chave], ensure_ascii=False)))
+
+    def carregar(self) -> Dict[str, Any]:
+        """State in the shape of the old app_state.json."""
+        with self._lock:
+            cur = self.conn.cursor()
+            results = [registro_canonico(json.loads(d)) for (d,) in cur.execute("SELECT dados FROM listings ORDER BY rowid")]
+            likes = cur.execute("SELECT link, dados FROM likes").fetchall()
+            state = {
+                'results': results,
+                'liked_items': [l for l, _ in likes],
+                'liked_items_cache': {l: registro_canonico(json.loads(d)) for l, d in likes if d},
+                'hidden_items': [l for (l,) in cur.execute("SELECT link FROM hidden")],
+                'ranking_list': [l for (l,) in cur.execute("SELECT link FROM ranking ORDER BY posicao")],
+                'ranking_descriptions': dict(cur.execute("SELECT link, descricao FROM descriptions").fetchall()),
+            }
+            for chave, valor in cur.execute("SELECT chave, valor FROM settings"):
+                state[chave] = json.loads(valor)
+        return state
+
+    def _migrar(self, legado: str):
+        try:
+            if not legado or not os.path.exists(legado):
+                return
+            with self._lock:
+                vazio = not self.conn.execute("SELECT 1 FROM listings LIMIT 1").fetchone() and \
+                    not self.conn.execute("SELECT 1 FROM settings LIMIT 1").fetchone()
+            if not vazio:
+                return
+            with open(legado, 'r', encoding='utf-8') as f:
+                state = json.load(f) or {}
+            self.substituir_listings(state.get('results', []))
+            self.salvar_estado(state)
+            os.replace(legado, legado + '.migrado')
+            print(f"Estado migrado de {legado} para o banco SQLite")
+        except Exception as e:
+            print(f"Erro ao migrar estado JSON: {e}")
+
+
+_STATE_DB: Optional[AppStateDB] = None
+
+
+def state_db() -> AppStateDB:
+    global _STATE_DB
+    if _STATE_DB is None:
+        _STATE_DB = AppStateDB()
+    return _STATE_DB
+
+
 def save_app_state(state_data: Dict[str, Any]):
-    """Save app state to JSON file"""
+    """Save app state (everything but the listings, which are written as they arrive)"""
     try:
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(state_data, f, ensure_ascii=False, indent=2)
+        state_db().salvar_estado(state_data)
     except Exception as e:
         print(f"Erro ao salvar estado: {e}")
 
 
 def load_app_state() -> Dict[str, Any]:
-    """Load app state from JSON file"""
+    """Load app state from the SQLite store"""
     try:
-        if os.path.exists(STATE_FILE):
-            with open(STATE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        return state_db().carregar()
     except Exception as e:
         print(f"Erro ao carregar estado: {e}")
     return {}
@@ -4122,6 +7406,7 @@ class ScraperApp:
         self.child: Optional[subprocess.Popen] = None
         self.results: List[Dict[str, Any]] = []
         self.filtered_results: List[Dict[str, Any]] = []
+        self._cards: Dict[str, Any] = {}  # Link -> card shown in results_view
         self.liked_items: set = set()
         self.hidden_items: set = set()
         self.ranking_list: List[str] = []  # Lista ordenada de links dos carros curtidos
@@ -4318,6 +7603,8 @@ class ScraperApp:
 
         self.capture_details = ft.Checkbox(label="Capturar detalhes", value=True)
         self.capture_details.tooltip = "Abrir páginas de detalhe para extrair informações adicionais"
+        self.image_hash = ft.Checkbox(label="Marcar fotos repetidas", value=False)
+        self.image_hash.tooltip = "Compara as fotos dos anúncios para achar o mesmo carro repostado (requer Pillow)"
 
         self.forbidden = ft.TextField(label="Palavras proibidas (vírgula-separadas)", value="", width=360)
         self.zenrows_key = ft.TextField(label="ZenRows API Key (opcional)", value="", width=360)
@@ -4325,10 +7612,15 @@ class ScraperApp:
         # Controls
         self.start_btn = ft.ElevatedButton("Iniciar Scraping", on_click=self.on_start)
         self.stop_btn = ft.ElevatedButton("Parar Scraping", on_click=self.on_stop, bgcolor=ft.Colors.RED)
+        self.resume_btn = ft.ElevatedButton("Retomar Última", on_click=self.on_resume,
+                                            tooltip="Continua a última execução interrompida a partir do journal")
         self.stop_btn.disabled = True
-        self.import_btn = ft.ElevatedButton("Importar Excel/CSV", on_click=self.on_import)
+        self.import_btn = ft.ElevatedButton("Importar Excel/CSV/Parquet", on_click=self.on_import)
         self.export_btn = ft.ElevatedButton("Exportar Excel", on_click=self.on_export)
         self.export_btn.disabled = True
+        self.export_parquet_btn = ft.ElevatedButton("Exportar Parquet", on_click=self.on_export_parquet,
+                                                    tooltip="Arquivo colunar com preço, km, ano e portas numéricos")
+        self.export_parquet_btn.disabled = True
 
         # Results controls
         self.search_field = ft.TextField(label="Pesquisar nos resultados", value="", width=600, on_change=self._on_search_change)
@@ -4372,10 +7664,11 @@ class ScraperApp:
                               ft.Row([self.portal_seminovos, self.portal_localiza, self.portal_unidas]),
                               ft.Divider(),
                               self.capture_details,
+                              self.image_hash,
                               self.forbidden,
                               self.zenrows_key,
-                              ft.Row([self.start_btn, self.stop_btn]),
-                              ft.Row([self.import_btn, self.export_btn]),
+                              ft.Row([self.start_btn, self.stop_btn, self.resume_btn]),
+                              ft.Row([self.import_btn, self.export_btn, self.export_parquet_btn]),
                               ], scroll=ft.ScrollMode.AUTO, width=340)
 
         # Results column with search and sort controls
@@ -4675,44 +7968,36 @@ class ScraperApp:
         search_term = self.search_field.value.lower()
         sort_by = self.sort_dropdown.value or "Nome"
 
-        self.filtered_results = []
-        for item in self.results:
-            name = str(item.get('Nome do Carro') or item.get('nome') or '').lower()
-            marca = str(item.get('Marca') or item.get('marca') or '').lower()
-            modelo = str(item.get('Modelo') or item.get('modelo') or '').lower()
-            valor = str(item.get('Valor') or item.get('valor') or '').lower()
-
-            if search_term in name or search_term in marca or search_term in modelo or search_term in valor:
-                self.filtered_results.append(item)
+        self.filtered_results = [item for item in self.results if self._passa_busca(item, search_term)]
 
         self._sort_results(sort_by)
         self.refresh_results_table()
 
+    @staticmethod
+    def _passa_busca(item: Dict[str, Any], search_term: str) -> bool:
+        campos = (item.get('Nome do Carro') or item.get('nome'), item.get('Marca') or item.get('marca'),
+                  item.get('Modelo') or item.get('modelo'), item.get('Valor') or item.get('valor'))
+        return any(search_term in str(c or '').lower() for c in campos)
+
     def _sort_results(self, sort_by: str):
-        if sort_by == "Pre��o: Menor para Maior":
-            self.filtered_results.sort(key=lambda x: self._extract_number(x.get('Valor') or x.get('valor') or '0'), reverse=False)
+        # numbers come parsed from ingestion (Listing.normalizar_numeros); missing ones sort last
+        if sort_by == "Preço: Menor para Maior":
+            self.filtered_results.sort(key=lambda x: x.get('preco_centavos') or float('inf'))
         elif sort_by == "Preço: Maior para Menor":
-            self.filtered_results.sort(key=lambda x: self._extract_number(x.get('Valor') or x.get('valor') or '0'), reverse=True)
+            self.filtered_results.sort(key=lambda x: x.get('preco_centavos') or 0, reverse=True)
         elif sort_by == "KM: Menor para Maior":
-            self.filtered_results.sort(key=lambda x: self._extract_number(x.get('KM') or x.get('Quilometragem') or '999999999'), reverse=False)
+            self.filtered_results.sort(key=lambda x: float('inf') if x.get('km_num') is None else x['km_num'])
         elif sort_by == "KM: Maior para Menor":
-            self.filtered_results.sort(key=lambda x: self._extract_number(x.get('KM') or x.get('Quilometragem') or '0'), reverse=True)
+            self.filtered_results.sort(key=lambda x: x.get('km_num') or 0, reverse=True)
         elif sort_by == "Ano: Mais Novo":
-            self.filtered_results.sort(key=lambda x: self._extract_number(x.get('Ano') or '0'), reverse=True)
+            self.filtered_results.sort(key=lambda x: x.get('ano_num') or 0, reverse=True)
         elif sort_by == "Ano: Mais Antigo":
-            self.filtered_results.sort(key=lambda x: self._extract_number(x.get('Ano') or '0'), reverse=False)
+            self.filtered_results.sort(key=lambda x: x.get('ano_num') or float('inf'))
         elif sort_by == "Curtidos":
             self.filtered_results.sort(key=lambda x: x.get('Link') or x.get('link') or '' in self.liked_items, reverse=True)
         else:
             self.filtered_results.sort(key=lambda x: str(x.get('Nome do Carro') or x.get('nome') or ''))
 
-    def _extract_number(self, value: str) -> float:
-        if not value:
-            return 0
-        import re
-        match = re.search(r'\d+\.?\d*', str(value).replace(',', '.'))
-        return float(match.group()) if match else 0
-
     # ========================================================================
     # PREFERENCES METHODS - COMPLETE AND CORRECTED
     # ========================================================================
@@ -5696,51 +8981,15 @@ class ScraperApp:
             return None
 
         def calculate_score(item):
-            score = 0
             total_weight = sum(self.preferences.values())
             if total_weight == 0:
                 return 0
-
-            peso_km = self.preferences.get('quilometragem', 0)
-            peso_potencia = self.preferences.get('potenciaMotor', 0)
-            peso_portas = self.preferences.get('portas', 0)
-            peso_ano = self.preferences.get('ano', 0)
-
-            # KM (lower is better - inverse score)
-            try:
-                km_str = str(item.get('KM') or item.get('Quilometragem') or '999999').replace('.', '').replace(',', '')
-                km = int(''.join(filter(str.isdigit, km_str)) or '0')
-                km_score = max(0, 10 - (km / 20000)) * peso_km
-                score += km_score
-            except:
-                pass
-
-            # Potência (higher is better)
-            try:
-                potencia_str = str(item.get('Motor') or item.get('Potência do Motor') or item.get('Potência') or '0')
-                potencia = int(''.join(filter(str.isdigit, potencia_str)) or '0')
-                potencia_score = (potencia / 500) * 10 * peso_potencia if potencia > 0 else 0
-                score += potencia_score
-            except:
-                pass
-
-            # Portas (higher is better)
-            try:
-                portas_str = str(item.get('Portas') or '0')
-                portas = int(''.join(filter(str.isdigit, portas_str)) or '0')
-                portas_score = (portas / 5) * 10 * peso_portas
-                score += portas_score
-            except:
-                pass
-
-            # Ano (newer is better)
-            try:
-                ano = int(item.get('Ano') or '2000')
-                ano_score = ((ano - 2000) / 25) * 10 * peso_ano
-                score += ano_score
-            except:
-                pass
-
+            km = item.get('km_num')
+            km = 999999 if km is None else km
+            score = max(0, 10 - (km / 20000)) * self.preferences.get('quilometragem', 0)  # lower is better
+            score += ((item.get('potencia_hp') or 0) / 500) * 10 * self.preferences.get('potenciaMotor', 0)
+            score += ((item.get('portas_num') or 0) / 5) * 10 * self.preferences.get('portas', 0)
+            score += (((item.get('ano_num') or 2000) - 2000) / 25) * 10 * self.preferences.get('ano', 0)
             return score
 
         best_item = None
@@ -5766,19 +9015,20 @@ class ScraperApp:
         for item in self.filtered_results:
             score = 0
 
-            km_val = self._extract_number(item.get('KM') or item.get('Quilometragem') or '999999999')
+            km_val = item.get('km_num')
+            km_val = 999999999 if km_val is None else km_val
             km_weight = self.preferences.get('quilometragem', 4) / total_weight if total_weight > 0 else 0
             score += (1 - min(km_val / 500000, 1)) * 100 * km_weight
 
-            potencia_val = self._extract_number(item.get('Potência do Motor') or item.get('potencia_motor') or '0')
+            potencia_val = item.get('potencia_hp') or 0
             potencia_weight = self.preferences.get('potenciaMotor', 3) / total_weight if total_weight > 0 else 0
             score += (potencia_val / 500) * 100 * potencia_weight
 
-            portas_val = self._extract_number(item.get('Portas') or item.get('portas') or '0')
+            portas_val = item.get('portas_num') or 0
             portas_weight = self.preferences.get('portas', 2) / total_weight if total_weight > 0 else 0
             score += (portas_val / 5) * 100 * portas_weight
 
-            ano_val = self._extract_number(item.get('Ano') or item.get('ano') or '2000')
+            ano_val = item.get('ano_num') or 2000
             ano_weight = self.preferences.get('ano', 1) / total_weight if total_weight > 0 else 0
             score += (ano_val - 2000) / 25 * 100 * ano_weight
 
@@ -5857,6 +9107,7 @@ class ScraperApp:
             "portals": [],
             "captureDetails": self.capture_details.value,
             "capture_details": self.capture_details.value,
+            "image_hash": self.image_hash.value,
             "forbiddenWords": [w.strip() for w in (self.forbidden.value or "").split(",") if w.strip()],
             "forbidden_words": [w.strip() for w in (self.forbidden.value or "").split(",") if w.strip()],
             "zenrowsApiKey": self.zenrows_key.value or None,
@@ -5882,9 +9133,46 @@ class ScraperApp:
         self.append_log("Iniciando scraper com filtros: " + json.dumps(filters, ensure_ascii=False))
         remove_stop_signal()
 
+        # a new search replaces the shown results, as the final RESULTADO_JSON list used to
+        self.results = []
+        self.filtered_results = []
+        self._cards = {}
+        self.results_view.controls.clear()
+        try:
+            state_db().limpar_listings()
+        except Exception as ex:
+            self.append_log(f"Erro ao limpar anúncios: {ex}")
+        self._iniciar_processo([sys.executable, __file__, filters_json])
+
+    def on_resume(self, e):
+        if self.child and self.child.poll() is None:
+            self.append_log("Scraper já em execução")
+            return
+        journal = JournalExecucao.ultimo()
+        try:
+            status = JournalExecucao.ler(journal)[2] if journal else None
+        except Exception as ex:
+            self.append_log(f"Erro ao ler o journal: {ex}")
+            return
+        if not journal:
+            self.append_log("Nenhuma execução anterior para retomar")
+            return
+        if status == 'concluido':
+            self.append_log("A última execução já foi concluída; inicie uma nova busca")
+            return
+        self.append_log("Retomando a última execução a partir do journal")
+        self.show_loading_screen()
+        remove_stop_signal()
+        # the journal has no API key; the current one goes through the environment
+        env = dict(os.environ)
+        if self.zenrows_key.value:
+            env['ZENROWS_API_KEY'] = self.zenrows_key.value
+        # records the GUI already shows come back as 'dado' events and replace theirs by Link
+        self._iniciar_processo([sys.executable, __file__, '--retomar', journal], env=env)
+
+    def _iniciar_processo(self, cmd: List[str], env: Optional[Dict[str, str]] = None):
         try:
-            cmd = [sys.executable, __file__, filters_json]
-            self.child = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
+            self.child = subprocess.Popen(cmd + ['--ipc'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
             self.stop_btn.disabled = False
             self.start_btn.disabled = True
             self.page.update()
@@ -5894,35 +9182,23 @@ class ScraperApp:
             self.append_log(f"Erro ao iniciar processo Python: {ex}")
 
     def _read_output_thread(self):
+        """Read the scraper's frames into a bounded queue; a UI that falls behind fills the queue,
+        this thread stops reading and the scraper waits on the pipe."""
         assert self.child and self.child.stdout
-        for raw in self.child.stdout:
-            line = raw.rstrip("\n")
-            self.append_log(line)
-            self.add_loading_log(line)
-            if line.startswith("EVENT_JSON:"):
-                payload = line[len("EVENT_JSON:"):]
-                try:
-                    item = json.loads(payload)
-                    self.add_result(item)
-                except Exception:
-                    pass
-            elif line.startswith("RESULTADO_JSON:"):
-                payload = line[len("RESULTADO_JSON:"):]
-                try:
-                    data = json.loads(payload)
-                    self.results = data
-                    self.filtered_results = data.copy()
-                    self.refresh_results_table()
-                    self.append_log(f"Scraping finalizado com {len(data)} items")
-                    self.add_loading_log(f"Scraping finalizado com {len(data)} items")
-                    self.export_btn.disabled = False if len(data) > 0 else True
-                    self.hide_loading_screen()
-                    self.page.update()
-                except Exception as e:
-                    self.append_log(f"Erro ao parsear RESULTADO_JSON: {e}")
-            elif line.startswith("EVENT_EXCEL_SAVED:"):
-                fname = line[len("EVENT_EXCEL_SAVED:"):]
-                self.append_log(f"Excel salvo pelo scraper: {fname}")
+        import queue
+        fila = queue.Queue(maxsize=IPC_FILA_GUI)
+        consumidor = threading.Thread(target=self._aplicar_frames, args=(fila,), daemon=True)
+        consumidor.start()
+        try:
+            while True:
+                frame = CanalIPC.ler_frame(self.child.stdout)
+                if frame is None:
+                    break
+                fila.put(frame)
+        except Exception as ex:
+            fila.put((IPC_CANAL_LOG, f"Erro no canal do scraper: {ex}".encode('utf-8')))
+        fila.put(None)
+        consumidor.join()
         self.append_log("Processo Python finalizado")
         self.add_loading_log("Processo finalizado")
         self.stop_btn.disabled = True
@@ -5935,10 +9211,143 @@ class ScraperApp:
             pass
         self.page.update()
 
+    def _aplicar_frames(self, fila):
+        """Apply queued frames in batches: one SQLite transaction per batch, cards added or replaced
+        in place and the list pushed at most every IPC_REDESENHO_SEGUNDOS. The full re-filter and
+        re-sort runs once, at the end of the run."""
+        import queue
+        posicoes = {(r.get('Link') or ''): i for i, r in enumerate(self.results) if r.get('Link')}
+        ultimo_redesenho, pendente = 0.0, False
+        fim = False
+        while not fim:
+            lote = [fila.get()]
+            while len(lote) < IPC_LOTE_GUI:
+                try:
+                    lote.append(fila.get_nowait())
+                except queue.Empty:
+                    break
+            logs, gravar = [], []
+            for frame in lote:
+                if frame is None:
+                    fim = True
+                    break
+                canal, payload = frame
+                try:
+                    if canal == IPC_CANAL_LOG:
+                        logs.append(payload.decode('utf-8', errors='replace'))
+                    elif canal == IPC_CANAL_EVENTO:
+                        evento = json.loads(payload)
+                        if evento.get('tipo') == 'planilha':
+                            logs.append(f"Excel salvo pelo scraper: {evento.get('dado')}")
+                            continue
+                        item = evento.get('dado') or {}
+                        self._aplicar_registro(item, posicoes)
+                        gravar.append(item)
+                    elif canal == IPC_CANAL_RESULTADO:
+                        if gravar:
+                            self._persistir_lote(gravar)
+                            gravar = []
+                        self._aplicar_resultado(json.loads(payload))
+                        pendente = False
+                except Exception as ex:
+                    logs.append(f"Erro ao processar mensagem do scraper: {ex}")
+            if gravar:
+                self._persistir_lote(gravar)
+                self.export_btn.disabled = False
+                self.export_parquet_btn.disabled = False
+                pendente = True
+            if pendente and fim:
+                self._apply_filters()
+                pendente = False
+            elif pendente and time.time() - ultimo_redesenho >= IPC_REDESENHO_SEGUNDOS:
+                try:
+                    self.results_view.update()
+                except Exception as ex:
+                    logs.append(f"Erro ao atualizar resultados: {ex}")
+                ultimo_redesenho, pendente = time.time(), False
+            if logs:
+                self._append_logs(logs)
+            else:
+                self.page.update()
+
+    def _aplicar_registro(self, item: Dict[str, Any], posicoes: Dict[str, int]):
+        """Add one streamed record, or replace the shown one with the same Link (merged duplicates,
+        image flags, resumed runs)."""
+        link = item.get('Link') or ''
+        idx = posicoes.get(link) if link else None
+        if idx is not None and idx < len(self.results) and (self.results[idx].get('Link') or '') == link:
+            anterior, self.results[idx] = self.results[idx], item
+            self._trocar_card(anterior, item)
+            return
+        if link:
+            posicoes[link] = len(self.results)
+        self.results.append(item)
+        self._mostrar_card(item)
+
+    def _mostrar_card(self, item: Dict[str, Any]):
+        """Append the card of a new record when it passes the current search (sorting waits for the end of the run)."""
+        link = item.get('Link') or item.get('link') or ''
+        if not self._passa_busca(item, (self.search_field.value or '').lower()):
+            return
+        self.filtered_results.append(item)
+        if link in self.hidden_items:
+            return
+        card = self._build_card(item)
+        self.results_view.controls.append(card)
+        if link:
+            self._cards[link] = card
+
+    def _trocar_card(self, anterior: Dict[str, Any], item: Dict[str, Any]):
+        """Swap the shown card of a record that came back with the same Link, keeping its position."""
+        link = item.get('Link') or item.get('link') or ''
+        pos = next((i for i, r in enumerate(self.filtered_results) if r is anterior), None)
+        if pos is None:
+            self._mostrar_card(item)
+            return
+        card = self._cards.pop(link, None)
+        try:
+            idx = self.results_view.controls.index(card) if card is not None else None
+        except ValueError:
+            idx = None
+        if not self._passa_busca(item, (self.search_field.value or '').lower()):
+            del self.filtered_results[pos]
+            if idx is not None:
+                del self.results_view.controls[idx]
+            return
+        self.filtered_results[pos] = item
+        if link in self.hidden_items:
+            return
+        novo = self._build_card(item)
+        self._cards[link] = novo
+        if idx is not None:
+            self.results_view.controls[idx] = novo
+        else:
+            self.results_view.controls.append(novo)
+
+    def _aplicar_resultado(self, resultado):
+        """End of run: a summary ({'total': n}) when records were streamed, or a full list (journal recovery)."""
+        if isinstance(resultado, list) and resultado:
+            # recovered runs bring the whole list; streamed records are already saved by _persistir_lote
+            self.results = resultado
+            self._persistir_listings()
+        self._apply_filters()
+        total = resultado.get('total', len(self.results)) if isinstance(resultado, dict) else len(self.results)
+        self.append_log(f"Scraping finalizado com {total} items")
+        self.add_loading_log(f"Scraping finalizado com {total} items")
+        self.export_btn.disabled = not self.results
+        self.export_parquet_btn.disabled = self.export_btn.disabled
+        self.hide_loading_screen()
+
+    def _append_logs(self, linhas: List[str]):
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        novo = "".join(f"[{timestamp}] {l}\n" for l in linhas)
+        self.log_area.value = (self.log_area.value + novo)[-20000:]
+        self.page.update()
+
     def _read_error_thread(self):
         assert self.child and self.child.stderr
         for raw in self.child.stderr:
-            line = raw.rstrip("\n")
+            line = raw.decode('utf-8', errors='replace').rstrip("\r\n")
             self.append_log("ERR: " + line)
 
     def add_result(self, item: Dict[str, Any]):
@@ -5949,9 +9358,26 @@ class ScraperApp:
         self.results_view.controls.append(card)
         self.page.update()
         self.export_btn.disabled = False
+        self.export_parquet_btn.disabled = False
+        self._persistir_listing(item)
 
-        if len(self.results) % 5 == 0:
-            self.save_state()
+    def _persistir_listing(self, item: Dict[str, Any]):
+        try:
+            state_db().salvar_listing(item)
+        except Exception as e:
+            self.append_log(f"Erro ao salvar anúncio: {e}")
+
+    def _persistir_lote(self, itens: List[Dict[str, Any]]):
+        try:
+            state_db().salvar_listings(itens)
+        except Exception as e:
+            self.append_log(f"Erro ao salvar anúncios: {e}")
+
+    def _persistir_listings(self):
+        try:
+            state_db().substituir_listings(self.results)
+        except Exception as e:
+            self.append_log(f"Erro ao salvar anúncios: {e}")
 
     def refresh_results_table(self):
         try:
@@ -5959,11 +9385,14 @@ class ScraperApp:
             self.best_match_link = self._calculate_best_match()
             self.append_log(f"Melhor match calculado: {self.best_match_link}")
             self.results_view.controls.clear()
+            self._cards = {}
             for idx, item in enumerate(self.filtered_results):
                 link = item.get('Link') or item.get('link') or ''
                 if link not in self.hidden_items:
-                    self.append_log(f"Adicionando item #{idx} ao results_view: link={link}")
-                    self.results_view.controls.append(self._build_card(item))
+                    card = self._build_card(item)
+                    self.results_view.controls.append(card)
+                    if link:
+                        self._cards[link] = card
             self.results_view.update()
             self.append_log("Refresh da lista de resultados concluído")
         except Exception as e:
@@ -6016,6 +9445,10 @@ class ScraperApp:
             if link in self.ranking_descriptions:
                 del self.ranking_descriptions[link]
             self.append_log(f"Item removido permanentemente")
+            try:
+                state_db().remover_listing(link)
+            except Exception as ex:
+                self.append_log(f"Erro ao remover anúncio do banco: {ex}")
             self.save_state()
             self.refresh_results_table()
 
@@ -6083,6 +9516,8 @@ class ScraperApp:
         valor = item.get('Valor') or item.get('valor') or ''
         link = item.get('Link') or item.get('link') or ''
         portal = item.get('Portal') or item.get('portal') or ''
+        if item.get('Portais'):
+            portal = ' + '.join(item['Portais'])
         motor = item.get('Motor') or item.get('Potência do Motor') or item.get('Potência') or ''
 
         is_liked = link in self.liked_items
@@ -6104,6 +9539,13 @@ class ScraperApp:
         detalhes_html = []
         if motor:
             detalhes_html.append(ft.Text(f"Potência: {motor}", size=12, weight="bold", color="#2563EB"))
+        repetidas = item.get('Fotos Repetidas')
+        if isinstance(repetidas, str):
+            # imported sheets keep the links joined with ', '
+            repetidas = [l for l in repetidas.split(',') if l.strip()]
+        if repetidas:
+            detalhes_html.append(ft.Text(f"🔁 Mesma foto em {len(repetidas)} outro(s) anúncio(s)",
+                                         size=11, color="#b45309"))
         for label, key in destaque:
             val = item.get(key) or item.get(key.lower())
             if val:
@@ -6176,7 +9618,7 @@ class ScraperApp:
             state = load_app_state()
             if state:
                 self.results = state.get('results', [])
-                self.filtered_results = state.get('filtered_results', [])
+                self.filtered_results = self.results.copy()
                 self.liked_items = set(state.get('liked_items', []))
                 self.hidden_items = set(state.get('hidden_items', []))
                 self.ranking_list = state.get('ranking_list', [])
@@ -6191,14 +9633,14 @@ class ScraperApp:
     def save_state(self):
         try:
             state = {
-                'results': self.results,
-                'filtered_results': self.filtered_results,
                 'liked_items': list(self.liked_items),
+                'liked_items_cache': self.liked_items_cache,
                 'hidden_items': list(self.hidden_items),
                 'ranking_list': self.ranking_list,
                 'ranking_descriptions': self.ranking_descriptions,
                 'preferences': self.preferences,
                 'preference_order': self.preference_order,
+                'scraping_speed': self.scraping_speed,
             }
             save_app_state(state)
         except Exception as e:
@@ -6226,8 +9668,8 @@ class ScraperApp:
         self.page.update()
 
     def on_import(self, e):
-        if pd is None:
-            self.append_log("Pandas não instalado; import desabilitado.")
+        if pd is None and pa is None:
+            self.append_log("Pandas/pyarrow não instalados; import desabilitado.")
             return
         def pick_result(e: ft.FilePickerResultEvent):
             if not e.files:
@@ -6235,15 +9677,22 @@ class ScraperApp:
             f = e.files[0]
             try:
                 path = f.path
-                if path.lower().endswith('.csv'):
-                    df = pd.read_csv(path)
+                if path.lower().endswith(EXPORT_COLUNARES):
+                    registros = importar_colunar(path)
+                elif pd is None:
+                    self.append_log("Pandas não instalado; importe um arquivo .parquet/.arrow.")
+                    return
+                elif path.lower().endswith('.csv'):
+                    registros = pd.read_csv(path).to_dict(orient='records')
                 else:
-                    df = pd.read_excel(path)
-                self.results = df.to_dict(orient='records')
+                    registros = pd.read_excel(path).to_dict(orient='records')
+                self.results = [registro_canonico(r) for r in registros]
                 self.filtered_results = self.results.copy()
+                self._persistir_listings()
                 self.refresh_results_table()
                 self.append_log(f"Importado {len(self.results)} registros de {path}")
                 self.export_btn.disabled = False
+                self.export_parquet_btn.disabled = False
             except Exception as ex:
                 self.append_log(f"Erro ao importar arquivo: {ex}")
         fp = ft.FilePicker(on_result=pick_result)
@@ -6251,19 +9700,33 @@ class ScraperApp:
         fp.pick_files(allow_multiple=False)
 
     def on_export(self, e):
-        if pd is None:
-            self.append_log("Pandas não instalado; export desabilitado.")
+        self._exportar_resultados("anuncios_carros_flet.xlsx")
+
+    def on_export_parquet(self, e):
+        if pa is None:
+            self.append_log("pyarrow não instalado; exportação Parquet desabilitada.")
             return
+        self._exportar_resultados("anuncios_carros_flet.parquet")
+
+    def _exportar_resultados(self, nome_arquivo: str):
         if not self.results:
             self.append_log("Sem resultados para exportar")
             return
-        try:
-            df = pd.DataFrame(self.results)
-            fname = os.path.join(os.getcwd(), "anuncios_carros_flet.xlsx")
-            df.to_excel(fname, index=False)
-            self.append_log(f"Exportado Excel para {fname}")
-        except Exception as ex:
-            self.append_log(f"Erro ao exportar Excel: {ex}")
+        itens = list(self.results)
+
+        def exportar():
+            try:
+                exportador = ExportadorStreaming(os.path.join(os.getcwd(), nome_arquivo)).iniciar()
+                for item in itens:
+                    exportador.adicionar(item)
+                fname = exportador.fechar()
+                if fname:
+                    self.append_log(f"Exportado {exportador.linhas} anúncios para {fname}")
+            except Exception as ex:
+                self.append_log(f"Erro ao exportar: {ex}")
+
+        self.append_log("Exportando em segundo plano...")
+        threading.Thread(target=exportar, daemon=True).start()
 
 
 def main(page: ft.Page):